@@ -0,0 +1,41 @@
+"""Frozen clock and precomputed time cutoffs shared by one analyzer run."""
+from datetime import datetime, timedelta
+from typing import Dict
+
+# Accounts this old that never tweeted count as inactive even without a last tweet
+DORMANT_ACCOUNT_DAYS = 365
+
+
+class AnalysisContext:
+    """
+    Reference time for scoring a batch, captured once.
+    
+    Every check in the batch compares against the same "now", so results do
+    not drift while a batch is scored and a test or replay can pin the clock.
+    Age and inactivity checks become plain datetime comparisons against the
+    cutoffs computed here instead of per-follower timedelta arithmetic.
+    """
+    
+    __slots__ = ("now", "inactive_before", "dormant_before", "_age_cutoffs")
+    
+    def __init__(self, now: datetime, inactivity_threshold: timedelta):
+        self.now = now
+        # Last tweet before this -> inactive
+        self.inactive_before = now - inactivity_threshold
+        # Created before this with no tweets -> inactive
+        self.dormant_before = now - timedelta(days=DORMANT_ACCOUNT_DAYS)
+        self._age_cutoffs: Dict[float, datetime] = {}
+    
+    def age_cutoff(self, days: float) -> datetime:
+        """Creation time of an account exactly `days` old: younger accounts were created after it."""
+        cutoff = self._age_cutoffs.get(days)
+        if cutoff is None:
+            cutoff = self._age_cutoffs[days] = self.now - timedelta(days=days)
+        return cutoff
+    
+    def __getstate__(self):
+        return self.now, self.inactive_before, self.dormant_before
+    
+    def __setstate__(self, state):
+        self.now, self.inactive_before, self.dormant_before = state
+        self._age_cutoffs = {}
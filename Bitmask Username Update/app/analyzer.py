@@ -1,15 +1,34 @@
 """Bot and inactivity detection analyzer."""
-import re
+import hashlib
+import math
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional
+from app.analysis_context import DORMANT_ACCOUNT_DAYS, AnalysisContext
 from app.config import settings
+from app.records import FollowerRecord
+# Flag and avatar helpers live with the rule table; re-exported here for existing importers
+from app.rules import (  # noqa: F401
+    DEFAULT_PROFILE_PATTERNS, FLAG_BITS, FLAG_NAMES, compile_rules, flags_to_mask, mask_to_flags
+)
 
-# Default profile image patterns (Twitter default avatars)
-DEFAULT_PROFILE_PATTERNS = [
-    "default_profile",
-    "default_profile_normal",
-    "egg",
-    "twimg.com/images/themes/theme1/bg.png"
+# Bump when heuristics change so stored fingerprints stop matching and followers are re-scored
+ANALYZER_VERSION = 2
+
+# Follower fields that feed the analyzer or are persisted with its results. last_tweet_at is left
+# out: timeline enrichment fills it after the page is fingerprinted, so a crawl (page value) and a
+# rescore (stored, possibly enriched value) would disagree. A new tweet still changes tweet_count.
+FINGERPRINT_FIELDS = [
+    "username",
+    "display_name",
+    "bio",
+    "profile_image_url",
+    "banner_url",
+    "followers_count",
+    "following_count",
+    "tweet_count",
+    "account_created_at",
+    "is_verified",
+    "is_protected"
 ]
 
 
@@ -20,55 +39,50 @@ class FollowerAnalyzer:
         """Initialize analyzer with configuration."""
         self.inactivity_threshold = timedelta(days=settings.inactivity_threshold_months * 30)
         self.bot_threshold = settings.bot_score_threshold
+        self.rules = compile_rules(settings.rule_weights)
+        self.config_version = f"{ANALYZER_VERSION}:{settings.inactivity_threshold_months}:{self.bot_threshold}"
+        if self.rules.signature:
+            self.config_version += f":{self.rules.signature}"
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Compiled rules hold closures; worker processes recompile them from the weight overrides
+        state = self.__dict__.copy()
+        state["rules"] = self.rules.signature
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self.rules = compile_rules(state["rules"])
     
-    def analyze_follower(self, follower_data: Dict[str, Any]) -> Dict[str, Any]:
+    def context(self, now: Optional[datetime] = None) -> AnalysisContext:
+        """Capture the reference time (default utcnow) and cutoffs for one analyzer run."""
+        return AnalysisContext(now or datetime.utcnow(), self.inactivity_threshold)
+    
+    def analyze_follower(self, follower_data: Dict[str, Any],
+                         context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
         """
         Analyze a single follower and return analysis results.
         
         Args:
             follower_data: Dictionary containing follower information
+            context: Analysis context of the run (defaults to a fresh one)
         
         Returns:
             Dictionary with analysis results including bot_score, is_bot, is_inactive, flags
         """
-        bot_score = 0.0
-        flags = []
-        
-        # Check inactivity
-        is_inactive = self._check_inactivity(follower_data)
-        
-        # Check profile quality
-        profile_score, profile_flags = self._analyze_profile_quality(follower_data)
-        bot_score += profile_score
-        flags.extend(profile_flags)
-        
-        # Check account metrics
-        metrics_score, metrics_flags = self._analyze_account_metrics(follower_data)
-        bot_score += metrics_score
-        flags.extend(metrics_flags)
-        
-        # Check activity patterns
-        activity_score, activity_flags = self._analyze_activity_patterns(follower_data)
-        bot_score += activity_score
-        flags.extend(activity_flags)
-        
-        # Check username patterns
-        username_score, username_flags = self._analyze_username(follower_data.get("username", ""))
-        bot_score += username_score
-        flags.extend(username_flags)
-        
-        # Determine if bot
-        is_bot = bot_score >= self.bot_threshold
+        context = context or self.context()
+        bot_score, flags_mask = self.rules.evaluate(follower_data, context)
         
         return {
             "bot_score": min(bot_score, 100.0),  # Cap at 100
-            "is_bot": is_bot,
-            "is_inactive": is_inactive,
-            "flags": flags,
-            "analysis_date": datetime.utcnow()
+            "is_bot": bot_score >= self.bot_threshold,
+            "is_inactive": self._check_inactivity(follower_data, context),
+            "flags": mask_to_flags(flags_mask),
+            "flags_mask": flags_mask,
+            "analysis_date": context.now
         }
     
-    def _check_inactivity(self, follower_data: Dict[str, Any]) -> bool:
+    def _check_inactivity(self, follower_data: Dict[str, Any], context: AnalysisContext) -> bool:
         """Check if account is inactive."""
         last_tweet_at = follower_data.get("last_tweet_at")
         account_created_at = follower_data.get("account_created_at")
@@ -82,158 +96,113 @@ class FollowerAnalyzer:
         # No last tweet data
         if not last_tweet_at:
             # If account is old and has no tweets, consider inactive
-            if account_created_at:
-                account_age = datetime.utcnow() - account_created_at
-                if account_age > timedelta(days=365) and tweet_count == 0:
-                    return True
-            return False
+            return bool(account_created_at) and tweet_count == 0 and account_created_at < context.dormant_before
         
         # Check if last tweet is beyond threshold
-        time_since_last_tweet = datetime.utcnow() - last_tweet_at
-        if time_since_last_tweet > self.inactivity_threshold:
-            return True
-        
-        return False
+        return last_tweet_at < context.inactive_before
     
-    def _analyze_profile_quality(self, follower_data: Dict[str, Any]) -> Tuple[float, List[str]]:
-        """Analyze profile quality indicators."""
-        score = 0.0
-        flags = []
-        
-        # Default profile picture
-        profile_image = follower_data.get("profile_image_url", "")
-        if profile_image:
-            if any(pattern in profile_image.lower() for pattern in DEFAULT_PROFILE_PATTERNS):
-                score += 15.0
-                flags.append("default_profile_picture")
-        
-        # Empty or generic bio
-        bio = follower_data.get("bio", "")
-        if not bio or len(bio.strip()) == 0:
-            score += 10.0
-            flags.append("empty_bio")
-        elif len(bio) < 10:
-            score += 5.0
-            flags.append("very_short_bio")
-        
-        # No banner
-        if not follower_data.get("banner_url"):
-            score += 5.0
-            flags.append("no_banner")
-        
-        return score, flags
+    def fingerprint(self, follower_data: Dict[str, Any]) -> str:
+        """
+        Compact content hash of a follower's analyzer inputs and the analyzer config.
+        
+        Two runs over an unchanged profile with the same configuration produce
+        the same fingerprint, so the follower does not need to be re-scored.
+        """
+        values = [self.config_version]
+        for field in FINGERPRINT_FIELDS:
+            value = follower_data.get(field)
+            values.append(value.isoformat() if isinstance(value, datetime) else repr(value))
+        return hashlib.blake2b("\x1f".join(values).encode(), digest_size=8).hexdigest()
     
-    def _analyze_account_metrics(self, follower_data: Dict[str, Any]) -> Tuple[float, List[str]]:
-        """Analyze account metrics for bot indicators."""
-        score = 0.0
-        flags = []
+    def rescore_after(self, follower_data: Dict[str, Any], now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Earliest future time at which a time-based result could change for an unchanged profile.
         
-        followers_count = follower_data.get("followers_count", 0)
-        following_count = follower_data.get("following_count", 0)
-        tweet_count = follower_data.get("tweet_count", 0)
+        Covers the new-account window, the inactivity thresholds and the
+        tweets-per-day cut-offs, which drift as the account ages.
+        
+        Returns:
+            The next crossing time, or None if no time-based result can change
+        """
+        now = now or datetime.utcnow()
+        last_tweet_at = follower_data.get("last_tweet_at")
         account_created_at = follower_data.get("account_created_at")
+        tweet_count = follower_data.get("tweet_count", 0)
         
-        # Follower-to-following ratio
-        if following_count > 0:
-            ratio = followers_count / following_count
-            if ratio < 0.1 and following_count > 100:
-                score += 20.0
-                flags.append("low_follower_following_ratio")
-            elif ratio < 0.2 and following_count > 500:
-                score += 10.0
-                flags.append("suspicious_follower_following_ratio")
-        
-        # Following too many with low followers
-        if following_count > 5000 and followers_count < 100:
-            score += 25.0
-            flags.append("mass_following_low_followers")
-        
-        # Account age vs activity
+        candidates = []
+        if last_tweet_at:
+            candidates.append(last_tweet_at + self.inactivity_threshold)
         if account_created_at:
-            account_age = datetime.utcnow() - account_created_at
-            if account_age < timedelta(days=30):
-                # New account with high activity
-                if tweet_count > 500:
-                    score += 15.0
-                    flags.append("new_account_high_activity")
-                # New account following many
-                if following_count > 1000:
-                    score += 10.0
-                    flags.append("new_account_mass_following")
-        
-        # Suspicious follower count (too round numbers)
-        if followers_count > 0 and followers_count % 1000 == 0:
-            score += 5.0
-            flags.append("suspicious_follower_count")
-        
-        return score, flags
+            for age_days in self.rules.thresholds("account_age_days"):
+                candidates.append(account_created_at + timedelta(days=age_days))
+            if not last_tweet_at and tweet_count == 0:
+                candidates.append(account_created_at + timedelta(days=DORMANT_ACCOUNT_DAYS))
+            if tweet_count > 0:
+                for tweets_per_day in self.rules.thresholds("tweets_per_day"):
+                    candidates.append(account_created_at + timedelta(days=math.ceil(tweet_count / tweets_per_day)))
+        
+        future = [c for c in candidates if c > now]
+        return min(future) if future else None
     
-    def _analyze_activity_patterns(self, follower_data: Dict[str, Any]) -> Tuple[float, List[str]]:
-        """Analyze activity patterns."""
-        score = 0.0
-        flags = []
+    def batch_score(self, followers: List[Dict[str, Any]], context: Optional[AnalysisContext] = None,
+                    workers: Optional[int] = None):
+        """
+        Score a batch of followers with the columnar (NumPy) engine.
         
-        tweet_count = follower_data.get("tweet_count", 0)
-        account_created_at = follower_data.get("account_created_at")
+        Args:
+            followers: List of follower dictionaries
+            context: Analysis context for age/inactivity checks (defaults to a fresh one)
+            workers: Score large batches across this many processes (defaults to settings)
         
-        if account_created_at and tweet_count > 0:
-            account_age = datetime.utcnow() - account_created_at
-            if account_age.total_seconds() > 0:
-                days_old = account_age.days or 1
-                tweets_per_day = tweet_count / days_old
-                
-                # Extremely high tweet frequency
-                if tweets_per_day > 50:
-                    score += 20.0
-                    flags.append("extremely_high_tweet_frequency")
-                elif tweets_per_day > 20:
-                    score += 10.0
-                    flags.append("high_tweet_frequency")
-        
-        return score, flags
-    
-    def _analyze_username(self, username: str) -> Tuple[float, List[str]]:
-        """Analyze username for suspicious patterns."""
-        score = 0.0
-        flags = []
-        
-        if not username:
-            return score, flags
-        
-        # Random numbers/letters pattern
-        if re.match(r'^[a-z]+\d{4,}', username.lower()) or re.match(r'^\d+[a-z]+', username.lower()):
-            score += 10.0
-            flags.append("suspicious_username_pattern")
-        
-        # Too many numbers
-        digit_count = sum(c.isdigit() for c in username)
-        if len(username) > 0 and digit_count / len(username) > 0.5:
-            score += 8.0
-            flags.append("username_too_many_numbers")
-        
-        # Very short username
-        if len(username) < 4:
-            score += 5.0
-            flags.append("very_short_username")
-        
-        return score, flags
+        Returns:
+            BatchScores with bot_score, is_bot, is_inactive and flags_mask arrays
+        """
+        context = context or self.context()
+        if (workers or settings.analysis_workers) > 1:
+            from app.parallel import parallel_score
+            return parallel_score(self, followers, context, workers)
+        from app.columnar import load_columns, score_columns
+        return score_columns(load_columns(followers), self, context)
     
-    def batch_analyze(self, followers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def batch_analyze(self, followers: List[Dict[str, Any]], vectorized: bool = True,
+                      workers: Optional[int] = None,
+                      context: Optional[AnalysisContext] = None) -> List[FollowerRecord]:
         """
-        Analyze multiple followers.
+        Analyze multiple followers against one frozen clock.
+        
+        Results are written into each follower's FollowerRecord slots instead
+        of merged into a new dictionary: records passed in are updated in
+        place, and dictionaries are converted to records once.
         
         Args:
-            followers: List of follower dictionaries
+            followers: Follower records (or dictionaries)
+            vectorized: Use the columnar scoring engine instead of per-follower analysis
+            workers: Processes for the columnar engine on large batches (defaults to settings)
+            context: Analysis context shared by the whole batch (defaults to a fresh one)
         
         Returns:
-            List of analysis results
+            The followers as FollowerRecords with their analysis results set
         """
-        results = []
-        for follower in followers:
-            analysis = self.analyze_follower(follower)
-            results.append({
-                **follower,
-                **analysis
-            })
-        return results
-
+        context = context or self.context()
+        records = [FollowerRecord.coerce(follower) for follower in followers]
+        if not vectorized:
+            for record in records:
+                analysis = self.analyze_follower(record, context)
+                record.bot_score = analysis["bot_score"]
+                record.is_bot = analysis["is_bot"]
+                record.is_inactive = analysis["is_inactive"]
+                record.flags_mask = analysis["flags_mask"]
+                record.analysis_date = context.now
+            return records
+        
+        scores = self.batch_score(records, context=context, workers=workers)
+        for record, bot_score, is_bot, is_inactive, flags_mask in zip(
+            records, scores.bot_score.tolist(), scores.is_bot.tolist(),
+            scores.is_inactive.tolist(), scores.flags_mask.tolist()
+        ):
+            record.bot_score = bot_score
+            record.is_bot = is_bot
+            record.is_inactive = is_inactive
+            record.flags_mask = flags_mask
+            record.analysis_date = context.now
+        return records
@@ -0,0 +1,230 @@
+"""Asyncio-native Twitter API client on a shared keep-alive connection pool."""
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlencode
+import httpx
+from oauthlib.oauth1 import Client as OAuth1Client
+from app.config import settings
+from app.rate_limiter import scheduler
+from app.records import FollowerRecord
+from app.twitter_client import FollowerPage, parse_twitter_datetime, user_json_to_record
+
+logger = logging.getLogger(__name__)
+
+# Clients cached per session token; all of them share one connection pool
+MAX_CACHED_CLIENTS = 256
+
+_pool: Optional[httpx.AsyncClient] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_clients: "OrderedDict[str, AsyncTwitterClient]" = OrderedDict()
+
+
+class TwitterAPIError(Exception):
+    """Non-success response from the Twitter API."""
+    
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+
+
+class TwitterRateLimitError(TwitterAPIError):
+    """429 response; the scheduler has already been told to wait for the reset."""
+
+
+def get_http_pool() -> httpx.AsyncClient:
+    """Return the process-wide keep-alive pool for the running event loop."""
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool.is_closed or _pool_loop is not loop:
+        _pool = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive
+            )
+        )
+        _pool_loop = loop
+    return _pool
+
+
+async def close_http_pool():
+    """Close the shared pool (application shutdown)."""
+    global _pool, _pool_loop
+    if _pool is not None and not _pool.is_closed:
+        await _pool.aclose()
+    _pool = None
+    _pool_loop = None
+    _clients.clear()
+
+
+def get_async_client(session: Dict[str, Any]) -> "AsyncTwitterClient":
+    """Return the cached client for a user session, creating it on first use."""
+    key = session["session_id"]
+    client = _clients.get(key)
+    if client is None:
+        client = AsyncTwitterClient(session["access_token"], session["access_token_secret"])
+        _clients[key] = client
+        if len(_clients) > MAX_CACHED_CLIENTS:
+            _clients.popitem(last=False)
+    else:
+        _clients.move_to_end(key)
+    return client
+
+
+def drop_async_client(session_token: str):
+    """Forget the cached client for a session (logout)."""
+    _clients.pop(session_token, None)
+
+
+class AsyncTwitterClient:
+    """Async counterpart of TwitterClient for use inside FastAPI handlers."""
+    
+    def __init__(self, access_token: Optional[str] = None, access_token_secret: Optional[str] = None,
+                 base_url: Optional[str] = None, http: Optional[httpx.AsyncClient] = None):
+        """Initialize client with credentials; the HTTP pool is shared (or passed in), not owned."""
+        self.http = http
+        self.access_token = access_token or settings.twitter_access_token
+        self.access_token_secret = access_token_secret or settings.twitter_access_token_secret
+        self.base_url = (base_url or settings.twitter_api_base_url).rstrip("/")
+        self.oauth = OAuth1Client(
+            settings.twitter_api_key,
+            client_secret=settings.twitter_api_secret,
+            resource_owner_key=self.access_token,
+            resource_owner_secret=self.access_token_secret
+        )
+        self.rate_limit_key = self.access_token or "app"
+        self.rate_limit_status = {}
+    
+    async def _request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Send a signed request within the endpoint's rate budget and return the decoded JSON."""
+        query = urlencode({k: v for k, v in (params or {}).items() if v is not None})
+        url = f"{self.base_url}/{endpoint}.json" + (f"?{query}" if query else "")
+        
+        # Sign after waiting for the budget: a stale oauth_timestamp is rejected with 401
+        await scheduler.acquire_async(self.rate_limit_key, endpoint)
+        url, headers, _ = self.oauth.sign(url, http_method=method)
+        response = await (self.http or get_http_pool()).request(method, url, headers=headers)
+        
+        scheduler.record_response(self.rate_limit_key, endpoint, response.status_code, response.headers)
+        if "x-rate-limit-remaining" in response.headers:
+            self.rate_limit_status[endpoint] = {
+                "limit": response.headers.get("x-rate-limit-limit"),
+                "remaining": response.headers.get("x-rate-limit-remaining"),
+                "reset": response.headers.get("x-rate-limit-reset")
+            }
+        
+        if response.status_code == 429:
+            raise TwitterRateLimitError(response.status_code, response.reason_phrase)
+        if not 200 <= response.status_code < 300:
+            raise TwitterAPIError(response.status_code, response.reason_phrase)
+        return response.json()
+    
+    async def verify_credentials(self) -> Optional[Dict[str, Any]]:
+        """Verify API credentials and return user info."""
+        try:
+            user = await self._request("GET", "account/verify_credentials")
+            return {
+                "id": user["id_str"],
+                "username": user["screen_name"],
+                "name": user.get("name"),
+                "followers_count": user.get("followers_count", 0),
+                "friends_count": user.get("friends_count", 0)
+            }
+        except TwitterAPIError as e:
+            if e.status_code == 401:
+                logger.error("Invalid Twitter credentials")
+            else:
+                logger.error(f"Error verifying credentials: {e}")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"Error verifying credentials: {e}")
+            return None
+    
+    async def iter_follower_pages(self, user_id: Optional[str] = None, count: int = 200,
+                                  cursor: int = -1) -> AsyncIterator[FollowerPage]:
+        """
+        Yield followers one page at a time.
+        
+        Args:
+            user_id: Twitter user ID (None for authenticated user)
+            count: Number of followers per page (max 200)
+            cursor: Cursor to start from (-1 for the first page)
+        
+        Yields:
+            FollowerPage with the page's followers and the next cursor
+        """
+        while cursor != 0:
+            try:
+                data = await self._request("GET", "followers/list", {
+                    "user_id": user_id,
+                    "count": count,
+                    "cursor": cursor,
+                    "skip_status": "false",
+                    "include_user_entities": "true"
+                })
+            except TwitterRateLimitError:
+                logger.warning("Rate limit exceeded. Waiting for the window to reset...")
+                continue
+            users = data.get("users", [])
+            cursor = data.get("next_cursor", 0)
+            if not users:
+                break
+            yield FollowerPage([user_json_to_record(user) for user in users], cursor)
+    
+    async def get_followers(self, user_id: Optional[str] = None, count: int = 200) -> List[FollowerRecord]:
+        """Fetch all followers for the authenticated user."""
+        followers = []
+        async for page in self.iter_follower_pages(user_id, count):
+            followers.extend(page.followers)
+        logger.info(f"Total followers fetched: {len(followers)}")
+        return followers
+    
+    async def get_user_timeline(self, user_id: str, count: int = 200) -> List[Dict[str, Any]]:
+        """Get user's recent tweets."""
+        try:
+            tweets = await self._request("GET", "statuses/user_timeline", {
+                "user_id": user_id,
+                "count": min(count, 200),
+                "tweet_mode": "extended",
+                "trim_user": "true"
+            })
+            return [
+                {
+                    "id": tweet["id_str"],
+                    "created_at": parse_twitter_datetime(tweet.get("created_at")),
+                    "text": tweet.get("full_text", tweet.get("text")),
+                    "retweet_count": tweet.get("retweet_count", 0),
+                    "favorite_count": tweet.get("favorite_count", 0)
+                }
+                for tweet in tweets
+            ]
+        except (TwitterAPIError, httpx.HTTPError) as e:
+            logger.error(f"Error fetching timeline for user {user_id}: {e}")
+            return []
+    
+    async def unfollow_user(self, user_id: str) -> bool:
+        """
+        Unfollow a user.
+        
+        Returns:
+            True if successful, False otherwise (raises TwitterRateLimitError on 429)
+        """
+        return await self._friendship("friendships/destroy", user_id, "unfollow")
+    
+    async def follow_user(self, user_id: str) -> bool:
+        """Follow a user (for undo functionality)."""
+        return await self._friendship("friendships/create", user_id, "follow")
+    
+    async def _friendship(self, endpoint: str, user_id: str, action: str) -> bool:
+        try:
+            await self._request("POST", endpoint, {"user_id": user_id})
+            logger.info(f"Successfully {action}ed user {user_id}")
+            return True
+        except TwitterRateLimitError:
+            logger.warning(f"Rate limit exceeded for {action} action")
+            raise
+        except (TwitterAPIError, httpx.HTTPError) as e:
+            logger.error(f"Error {action}ing user {user_id}: {e}")
+            return False
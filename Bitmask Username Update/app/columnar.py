@@ -0,0 +1,212 @@
+"""Columnar (NumPy) scoring path for batch follower analysis."""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+import numpy as np
+from app.analysis_context import AnalysisContext
+from app.rules import classify_username, has_default_picture
+
+EPOCH = datetime(1970, 1, 1)
+MISSING_TS = np.iinfo(np.int64).min
+
+DAY_US = 86_400 * 1_000_000
+
+
+class FollowerColumns(NamedTuple):
+    """Typed column arrays for a batch of followers."""
+    followers_count: np.ndarray
+    following_count: np.ndarray
+    tweet_count: np.ndarray
+    account_created_at: np.ndarray  # int64 microseconds since epoch, MISSING_TS if absent
+    last_tweet_at: np.ndarray
+    default_profile_picture: np.ndarray
+    bio_blank: np.ndarray
+    bio_length: np.ndarray
+    has_banner: np.ndarray
+    usernames: List[str]
+
+
+class BatchScores(NamedTuple):
+    """Bulk analysis results for a batch of followers."""
+    bot_score: np.ndarray
+    is_bot: np.ndarray
+    is_inactive: np.ndarray
+    flags_mask: np.ndarray
+
+
+def to_timestamp_us(value: Optional[datetime]) -> int:
+    """Convert a (naive UTC or aware) datetime to integer microseconds since epoch."""
+    if not value:
+        return MISSING_TS
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+class PackedFollowers(NamedTuple):
+    """
+    Compact, picklable form of the analyzer inputs for a batch of followers.
+    
+    Numbers and timestamps are NumPy arrays (pickled as raw buffers) and only
+    the strings the rules inspect are kept, so a shard costs a fraction of
+    its follower dictionaries to send to another process. Slicing every
+    field with the same range yields a valid sub-batch.
+    """
+    usernames: List[str]
+    bios: List[Optional[str]]
+    profile_image_urls: List[Optional[str]]
+    has_banner: np.ndarray
+    followers_count: np.ndarray
+    following_count: np.ndarray
+    tweet_count: np.ndarray
+    account_created_at: np.ndarray  # int64 microseconds since epoch, MISSING_TS if absent
+    last_tweet_at: np.ndarray
+    
+    def slice(self, start: int, stop: int) -> "PackedFollowers":
+        """The followers in [start, stop)."""
+        return PackedFollowers(*(field[start:stop] for field in self))
+
+
+def pack_followers(followers: List[Dict[str, Any]]) -> PackedFollowers:
+    """
+    Extract the analyzer inputs of follower dictionaries into packed columns.
+    
+    Args:
+        followers: List of follower dictionaries
+    
+    Returns:
+        PackedFollowers with one entry per follower
+    """
+    n = len(followers)
+    return PackedFollowers(
+        usernames=[f.get("username", "") for f in followers],
+        bios=[f.get("bio", "") for f in followers],
+        profile_image_urls=[f.get("profile_image_url", "") for f in followers],
+        has_banner=np.fromiter((bool(f.get("banner_url")) for f in followers), dtype=bool, count=n),
+        followers_count=np.fromiter((f.get("followers_count", 0) for f in followers), dtype=np.int64, count=n),
+        following_count=np.fromiter((f.get("following_count", 0) for f in followers), dtype=np.int64, count=n),
+        tweet_count=np.fromiter((f.get("tweet_count", 0) for f in followers), dtype=np.int64, count=n),
+        account_created_at=np.fromiter(
+            (to_timestamp_us(f.get("account_created_at")) for f in followers), dtype=np.int64, count=n
+        ),
+        last_tweet_at=np.fromiter(
+            (to_timestamp_us(f.get("last_tweet_at")) for f in followers), dtype=np.int64, count=n
+        ),
+    )
+
+
+def columns_from_packed(packed: PackedFollowers) -> FollowerColumns:
+    """Derive the typed scoring columns from packed followers."""
+    n = len(packed.usernames)
+    bios = packed.bios
+    return FollowerColumns(
+        followers_count=packed.followers_count,
+        following_count=packed.following_count,
+        tweet_count=packed.tweet_count,
+        account_created_at=packed.account_created_at,
+        last_tweet_at=packed.last_tweet_at,
+        default_profile_picture=np.fromiter(
+            (has_default_picture(url) for url in packed.profile_image_urls), dtype=bool, count=n
+        ),
+        bio_blank=np.fromiter((not bio or not bio.strip() for bio in bios), dtype=bool, count=n),
+        bio_length=np.fromiter((len(bio) if bio else 0 for bio in bios), dtype=np.int64, count=n),
+        has_banner=packed.has_banner,
+        usernames=packed.usernames,
+    )
+
+
+def load_columns(followers: List[Dict[str, Any]]) -> FollowerColumns:
+    """
+    Load a list of follower dictionaries into typed column arrays.
+    
+    Args:
+        followers: List of follower dictionaries
+    
+    Returns:
+        FollowerColumns with one entry per follower
+    """
+    return columns_from_packed(pack_followers(followers))
+
+
+def feature_columns(columns: FollowerColumns, now_us: int) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Derive every rule feature as a (values, present) pair of arrays.
+    
+    Mirrors app.rules.FEATURES: `present` is False where the scalar
+    extractor would return None.
+    """
+    n = len(columns.usernames)
+    everywhere = np.ones(n, dtype=bool)
+    followers_count = columns.followers_count
+    following_count = columns.following_count
+    tweet_count = columns.tweet_count
+    has_created = columns.account_created_at != MISSING_TS
+    account_age = np.where(has_created, now_us - columns.account_created_at, 0)
+    
+    age_days = account_age // DAY_US
+    days_old = np.where(age_days == 0, 1, age_days)
+    active = has_created & (tweet_count > 0) & (account_age > 0)
+    
+    # Username features (string checks stay scalar, memoized per handle)
+    traits = [classify_username(u) if u else (False, 0.0, 0) for u in columns.usernames]
+    has_username = np.fromiter((bool(u) for u in columns.usernames), dtype=bool, count=n)
+    username_pattern = np.fromiter((t[0] for t in traits), dtype=bool, count=n)
+    username_digit_ratio = np.fromiter((t[1] for t in traits), dtype=np.float64, count=n)
+    username_length = np.fromiter((t[2] for t in traits), dtype=np.int64, count=n)
+    
+    return {
+        "default_profile_picture": (columns.default_profile_picture, everywhere),
+        "bio_blank": (columns.bio_blank, everywhere),
+        "bio_length": (columns.bio_length, everywhere),
+        "has_banner": (columns.has_banner, everywhere),
+        "followers_count": (followers_count, everywhere),
+        "following_count": (following_count, everywhere),
+        "tweet_count": (tweet_count, everywhere),
+        "follower_ratio": (followers_count / np.maximum(following_count, 1), following_count > 0),
+        "account_created_at": (columns.account_created_at.view("datetime64[us]"), has_created),
+        "round_follower_count": ((followers_count > 0) & (followers_count % 1000 == 0), everywhere),
+        "tweets_per_day": (np.where(active, tweet_count / np.maximum(days_old, 1), 0.0), active),
+        "username_pattern": (username_pattern, has_username),
+        "username_digit_ratio": (username_digit_ratio, has_username),
+        "username_length": (username_length, has_username),
+    }
+
+
+def score_columns(columns: FollowerColumns, analyzer, context: AnalysisContext) -> BatchScores:
+    """
+    Compute every heuristic of FollowerAnalyzer as whole-array masks.
+    
+    Evaluates the analyzer's compiled rule table over feature columns,
+    against the context's single "now" for the whole batch.
+    
+    Args:
+        columns: Typed follower columns from load_columns
+        analyzer: FollowerAnalyzer providing thresholds and the rule engine
+        context: Analysis context with the batch's reference time and cutoffs
+    
+    Returns:
+        BatchScores with scores, bot/inactive booleans and flag bitmasks
+    """
+    n = len(columns.usernames)
+    
+    followers_count = columns.followers_count
+    tweet_count = columns.tweet_count
+    has_created = columns.account_created_at != MISSING_TS
+    has_last_tweet = columns.last_tweet_at != MISSING_TS
+    
+    # Inactivity
+    is_inactive = (
+        ((tweet_count == 0) & (followers_count < 100))
+        | (~has_last_tweet & has_created & (columns.account_created_at < to_timestamp_us(context.dormant_before))
+           & (tweet_count == 0))
+        | (has_last_tweet & (columns.last_tweet_at < to_timestamp_us(context.inactive_before)))
+    )
+    
+    features = feature_columns(columns, to_timestamp_us(context.now))
+    score, flags_mask = analyzer.rules.evaluate_columns(features, n, context)
+    
+    return BatchScores(
+        bot_score=np.minimum(score, 100.0),
+        is_bot=score >= analyzer.bot_threshold,
+        is_inactive=is_inactive,
+        flags_mask=flags_mask,
+    )
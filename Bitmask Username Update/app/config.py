@@ -16,10 +16,15 @@ class Settings:
         self.twitter_api_secret = os.getenv("TWITTER_API_SECRET", "")
         self.twitter_access_token = os.getenv("TWITTER_ACCESS_TOKEN")
         self.twitter_access_token_secret = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
+        self.twitter_api_base_url = os.getenv("TWITTER_API_BASE_URL", "https://api.twitter.com/1.1")
         
         # Application Secret
         self.secret_key = os.getenv("SECRET_KEY", "change-this-secret-key-in-production")
         
+        # Authenticated session cache
+        self.session_cache_size = int(os.getenv("SESSION_CACHE_SIZE", "1024"))
+        self.session_cache_ttl_seconds = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "300"))
+        
         # Database
         self.database_url = os.getenv("DATABASE_URL", "sqlite:///./twitter_unfollow.db")
         
@@ -27,9 +32,45 @@ class Settings:
         self.inactivity_threshold_months = int(os.getenv("INACTIVITY_THRESHOLD_MONTHS", "6"))
         self.bot_score_threshold = int(os.getenv("BOT_SCORE_THRESHOLD", "60"))
         self.daily_unfollow_limit = int(os.getenv("DAILY_UNFOLLOW_LIMIT", "50"))
+        # Per-flag score weight overrides, e.g. "empty_bio=12,no_banner=0"
+        self.rule_weights = os.getenv("RULE_WEIGHTS", "")
+        # Distinct usernames whose pattern classification is memoized
+        self.username_cache_size = int(os.getenv("USERNAME_CACHE_SIZE", "65536"))
+        
+        # Unfollow execution
+        self.unfollow_concurrency = int(os.getenv("UNFOLLOW_CONCURRENCY", "4"))
+        self.unfollow_commit_batch_size = int(os.getenv("UNFOLLOW_COMMIT_BATCH_SIZE", "10"))
+        
+        # Database writes
+        self.upsert_batch_size = int(os.getenv("UPSERT_BATCH_SIZE", "500"))
+        self.export_chunk_size = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+        
+        # Background jobs
+        self.job_workers = int(os.getenv("JOB_WORKERS", "2"))
+        
+        # Parallel scoring: batches of at least 2 x ANALYSIS_MIN_SHARD_SIZE are split across processes.
+        # Crawl pages (at most 200 followers) stay in-process; re-scoring batches fill every worker
+        self.analysis_workers = int(os.getenv("ANALYSIS_WORKERS", "1"))
+        self.analysis_min_shard_size = int(os.getenv("ANALYSIS_MIN_SHARD_SIZE", "2000"))
         
         # Rate Limiting
         self.rate_limit_buffer = int(os.getenv("RATE_LIMIT_BUFFER", "5"))
+        
+        # Async HTTP connection pool
+        self.http_max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+        self.http_max_keepalive = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+        
+        # Follower crawl
+        # Decode followers/list JSON directly into records instead of through tweepy models
+        self.raw_json_followers = os.getenv("RAW_JSON_FOLLOWERS", "true").lower() in ("1", "true", "yes")
+        self.crawl_max_retries = int(os.getenv("CRAWL_MAX_RETRIES", "5"))
+        self.crawl_checkpoint_max_age_hours = int(os.getenv("CRAWL_CHECKPOINT_MAX_AGE_HOURS", "24"))
+        
+        # Timeline enrichment for followers without activity data
+        self.enrich_timelines = os.getenv("ENRICH_TIMELINES", "true").lower() in ("1", "true", "yes")
+        self.enrichment_concurrency = int(os.getenv("ENRICHMENT_CONCURRENCY", "8"))
+        # statuses/user_timeline allows 900 calls per window vs 15 for followers/list, so 60 per page keeps pace
+        self.enrichment_max_per_page = int(os.getenv("ENRICHMENT_MAX_PER_PAGE", "60"))
 
 
 settings = Settings()
@@ -0,0 +1,107 @@
+"""Timeline enrichment: fill in last_tweet_at for followers whose page had no status."""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+import httpx
+from app.async_twitter_client import AsyncTwitterClient
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def needs_timeline(follower: Dict[str, Any]) -> bool:
+    """
+    A follower needs a timeline lookup if it has tweets but no known last tweet.
+    
+    Protected timelines answer 401 unless we follow the account, so they are
+    not looked up at all rather than spending a request on them.
+    """
+    if follower.get("is_protected"):
+        return False
+    return not follower.get("last_tweet_at") and follower.get("tweet_count", 0) > 0
+
+
+async def enrich_last_tweet(
+    followers: List[Dict[str, Any]],
+    client: AsyncTwitterClient,
+    concurrency: Optional[int] = None,
+    limit: Optional[int] = None
+) -> int:
+    """
+    Fetch the newest tweet of followers missing activity data, concurrently.
+    
+    Only one tweet is requested per follower. Requests are bounded by a
+    semaphore and paced by the client's rate-limit scheduler. Protected
+    followers are skipped, and followers whose timeline turns out to be
+    unavailable are left unchanged.
+    
+    Args:
+        followers: Follower dictionaries, updated in place
+        client: Async Twitter client
+        concurrency: Maximum requests in flight (defaults to settings)
+        limit: Maximum lookups for this call (defaults to settings)
+    
+    Returns:
+        Number of followers that received a last_tweet_at
+    """
+    concurrency = concurrency or settings.enrichment_concurrency
+    limit = settings.enrichment_max_per_page if limit is None else limit
+    candidates = [f for f in followers if needs_timeline(f)][:limit]
+    if not candidates:
+        return 0
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def enrich(follower: Dict[str, Any]) -> bool:
+        async with semaphore:
+            tweets = await client.get_user_timeline(follower["twitter_id"], count=1)
+        if tweets and tweets[0]["created_at"]:
+            follower["last_tweet_at"] = tweets[0]["created_at"]
+            return True
+        return False
+    
+    results = await asyncio.gather(*(enrich(f) for f in candidates), return_exceptions=True)
+    enriched = sum(1 for r in results if r is True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Timeline enrichment failed: {result}")
+    logger.info(f"Enriched {enriched}/{len(candidates)} followers with timeline data")
+    return enriched
+
+
+class TimelineEnricher:
+    """
+    Synchronous enrichment stage for the ingestion pipeline.
+    
+    Owns a private event loop and connection pool for the lifetime of one
+    crawl, so it can run inside a worker thread between page fetches.
+    """
+    
+    def __init__(self, access_token: str, access_token_secret: str, base_url: Optional[str] = None):
+        self.access_token = access_token
+        self.access_token_secret = access_token_secret
+        self.base_url = base_url
+        self.loop = asyncio.new_event_loop()
+        self.http: Optional[httpx.AsyncClient] = None
+        self.client: Optional[AsyncTwitterClient] = None
+    
+    def __call__(self, followers: List[Dict[str, Any]]) -> int:
+        """Enrich one page of followers in place."""
+        return self.loop.run_until_complete(self._enrich(followers))
+    
+    async def _enrich(self, followers: List[Dict[str, Any]]) -> int:
+        if self.client is None:
+            self.http = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                limits=httpx.Limits(max_keepalive_connections=settings.enrichment_concurrency)
+            )
+            self.client = AsyncTwitterClient(
+                self.access_token, self.access_token_secret, base_url=self.base_url, http=self.http
+            )
+        return await enrich_last_tweet(followers, self.client)
+    
+    def close(self):
+        """Close the connection pool and event loop."""
+        if self.http is not None:
+            self.loop.run_until_complete(self.http.aclose())
+        self.loop.close()
@@ -0,0 +1,205 @@
+"""Streaming follower exports that read the table in chunks."""
+import csv
+import io
+import json
+from typing import Any, Iterator, List, Optional, Sequence
+from sqlalchemy import select
+from app.config import settings
+from app.models import SessionLocal, Follower
+
+# (header, column) pairs in export order
+EXPORT_COLUMNS = [
+    ("Username", Follower.username),
+    ("Display Name", Follower.display_name),
+    ("Bio", Follower.bio),
+    ("Followers", Follower.followers_count),
+    ("Following", Follower.following_count),
+    ("Tweets", Follower.tweet_count),
+    ("Bot Score", Follower.bot_score),
+    ("Is Bot", Follower.is_bot),
+    ("Is Inactive", Follower.is_inactive),
+    ("Last Tweet", Follower.last_tweet_at),
+    ("Account Created", Follower.account_created_at)
+]
+
+# Columns of the typed exports (NDJSON, Arrow IPC, Parquet), named after the model
+RECORD_COLUMNS = [
+    Follower.twitter_id,
+    Follower.username,
+    Follower.display_name,
+    Follower.bio,
+    Follower.followers_count,
+    Follower.following_count,
+    Follower.tweet_count,
+    Follower.is_verified,
+    Follower.is_protected,
+    Follower.bot_score,
+    Follower.is_bot,
+    Follower.is_inactive,
+    Follower.flags_mask,
+    Follower.last_tweet_at,
+    Follower.account_created_at,
+    Follower.analysis_date
+]
+
+
+def iter_follower_chunks(owner_id: str, chunk_size: Optional[int] = None,
+                         columns: Optional[List[Any]] = None) -> Iterator[Sequence[Any]]:
+    """
+    Yield an account's follower rows (tuples of `columns`, by default EXPORT_COLUMNS) a chunk at a time.
+    
+    Only the exported columns are selected, and each chunk is its own short
+    keyset query (id > last id, in id order) in its own transaction, so memory
+    stays bounded by one chunk and no read lock is held while a chunk is sent
+    to the client (on SQLite an open cursor would block every writer until the
+    download finished). Opens its own sessions because the generator outlives
+    the request handler.
+    """
+    chunk_size = chunk_size or settings.export_chunk_size
+    columns = columns or [column for _, column in EXPORT_COLUMNS]
+    query = select(Follower.id, *columns).where(Follower.owner_id == owner_id).order_by(Follower.id).limit(chunk_size)
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            rows = db.execute(query.where(Follower.id > last_id)).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [row[1:] for row in rows]
+        if len(rows) < chunk_size:
+            return
+
+
+def _csv_row(row: Sequence[Any]) -> List[Any]:
+    (username, display_name, bio, followers, following, tweets,
+     bot_score, is_bot, is_inactive, last_tweet_at, account_created_at) = row
+    return [
+        username,
+        display_name or "",
+        bio or "",
+        followers,
+        following,
+        tweets,
+        bot_score,
+        is_bot,
+        is_inactive,
+        last_tweet_at.isoformat() if last_tweet_at else "",
+        account_created_at.isoformat() if account_created_at else ""
+    ]
+
+
+def stream_csv(owner_id: str, chunk_size: Optional[int] = None) -> Iterator[str]:
+    """Yield the CSV export as one string per chunk of rows, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    yield buffer.getvalue()
+    
+    for chunk in iter_follower_chunks(owner_id, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_row(row) for row in chunk)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(owner_id: str, chunk_size: Optional[int] = None) -> Iterator[str]:
+    """Yield the export as newline-delimited JSON, one string per chunk of rows."""
+    names = [column.key for column in RECORD_COLUMNS]
+    for chunk in iter_follower_chunks(owner_id, chunk_size, RECORD_COLUMNS):
+        yield "".join(
+            json.dumps(dict(zip(names, row)), default=lambda value: value.isoformat()) + "\n"
+            for row in chunk
+        )
+
+
+def pyarrow_available() -> bool:
+    """Whether the optional pyarrow dependency (Arrow/Parquet exports) is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def arrow_schema():
+    """Typed Arrow schema of RECORD_COLUMNS."""
+    import pyarrow as pa
+    
+    types = {
+        "followers_count": pa.int64(),
+        "following_count": pa.int64(),
+        "tweet_count": pa.int64(),
+        "is_verified": pa.bool_(),
+        "is_protected": pa.bool_(),
+        "bot_score": pa.float64(),
+        "is_bot": pa.bool_(),
+        "is_inactive": pa.bool_(),
+        "flags_mask": pa.int64(),
+        "last_tweet_at": pa.timestamp("us", tz="UTC"),
+        "account_created_at": pa.timestamp("us", tz="UTC"),
+        "analysis_date": pa.timestamp("us", tz="UTC")
+    }
+    return pa.schema([(column.key, types.get(column.key, pa.string())) for column in RECORD_COLUMNS])
+
+
+def iter_record_batches(owner_id: str, chunk_size: Optional[int] = None):
+    """Yield one pyarrow.RecordBatch per chunk of rows (each read in its own short query)."""
+    import pyarrow as pa
+    
+    schema = arrow_schema()
+    for chunk in iter_follower_chunks(owner_id, chunk_size, RECORD_COLUMNS):
+        columns = list(zip(*chunk))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain, keeping tell() absolute."""
+    
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_arrow(owner_id: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """Yield the export as an Arrow IPC stream, one record batch per chunk."""
+    import pyarrow as pa
+    
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, arrow_schema()) as writer:
+        for batch in iter_record_batches(owner_id, chunk_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_parquet(owner_id: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """Yield the export as a Parquet file, one row group per chunk (footer last)."""
+    import pyarrow.parquet as pq
+    
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, arrow_schema(), compression="zstd") as writer:
+        for batch in iter_record_batches(owner_id, chunk_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,145 @@
+"""Append-only follower analysis history stored as per-run deltas."""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.analyzer import mask_to_flags
+from app.models import Follower, FollowerHistory
+
+# status_xor bits
+HISTORY_BOT = 1
+HISTORY_INACTIVE = 2
+
+
+def _score_tenths(score: Optional[float]) -> int:
+    return int(round((score or 0.0) * 10))
+
+
+def _state(follower: Dict[str, Any]) -> List[int]:
+    """Numeric state of an analyzed follower, in FollowerHistory column order."""
+    return [
+        _score_tenths(follower.get("bot_score")),
+        follower.get("flags_mask") or 0,
+        (HISTORY_BOT if follower.get("is_bot") else 0) | (HISTORY_INACTIVE if follower.get("is_inactive") else 0),
+        follower.get("followers_count") or 0,
+        follower.get("following_count") or 0,
+        follower.get("tweet_count") or 0
+    ]
+
+
+def history_delta(follower: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """
+    Delta between a freshly analyzed follower and its `stored_state`.
+    
+    Returns:
+        FollowerHistory column values, or None if nothing recorded in the history changed
+    """
+    new = _state(follower)
+    previous = follower.get("stored_state")
+    old = [0] * len(new) if previous is None else _state(previous._asdict())
+    delta = {
+        "bot_score_delta": new[0] - old[0],
+        "flags_xor": new[1] ^ old[1],
+        "status_xor": new[2] ^ old[2],
+        "followers_delta": new[3] - old[3],
+        "following_delta": new[4] - old[4],
+        "tweets_delta": new[5] - old[5]
+    }
+    if previous is not None and not any(delta.values()):
+        return None
+    return delta
+
+
+def record_history(db: Session, owner_id: str, analyzed: Iterable[Dict[str, Any]],
+                   recorded_at: Optional[datetime] = None) -> int:
+    """
+    Append history rows for the followers of a page whose results changed (without committing).
+    
+    Must run after the page is upserted, so new followers have ids. Ids of
+    new followers are looked up with one IN query; followers seen before
+    carry theirs in `stored_state`.
+    
+    Returns:
+        Number of history rows written
+    """
+    recorded_at = recorded_at or datetime.utcnow()
+    deltas = {}
+    for follower in analyzed:
+        delta = history_delta(follower)
+        if delta is not None:
+            deltas[follower["twitter_id"]] = (follower.get("stored_state"), delta)
+    if not deltas:
+        return 0
+    
+    new_ids = [twitter_id for twitter_id, (previous, _) in deltas.items() if previous is None]
+    ids = {}
+    if new_ids:
+        ids = dict(db.query(Follower.twitter_id, Follower.id).filter(
+            Follower.owner_id == owner_id, Follower.twitter_id.in_(new_ids)
+        ))
+    rows = [
+        {
+            "follower_id": previous.id if previous is not None else ids[twitter_id],
+            "recorded_at": recorded_at,
+            **delta
+        }
+        for twitter_id, (previous, delta) in deltas.items()
+    ]
+    db.execute(insert(FollowerHistory), rows)
+    return len(rows)
+
+
+def get_trajectory(db: Session, owner_id: str, twitter_id: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Reconstruct a follower's analysis results at every recorded change, oldest first.
+    
+    The running totals are anchored to the follower's current row, which is
+    written in the same transaction as the newest delta. Followers analyzed
+    before history existed therefore still get correct absolute values.
+    
+    Returns:
+        List of points, or None if the account has no such follower
+    """
+    follower = db.query(Follower).filter(
+        Follower.owner_id == owner_id, Follower.twitter_id == twitter_id
+    ).first()
+    if follower is None:
+        return None
+    
+    rows = db.query(
+        FollowerHistory.recorded_at, FollowerHistory.bot_score_delta, FollowerHistory.flags_xor,
+        FollowerHistory.status_xor, FollowerHistory.followers_delta, FollowerHistory.following_delta,
+        FollowerHistory.tweets_delta
+    ).filter(FollowerHistory.follower_id == follower.id).order_by(FollowerHistory.id).all()
+    
+    # Running state per row, relative to an unknown starting point
+    states = []
+    state = [0] * 6
+    for row in rows:
+        state = [
+            state[0] + row.bot_score_delta,
+            state[1] ^ row.flags_xor,
+            state[2] ^ row.status_xor,
+            state[3] + row.followers_delta,
+            state[4] + row.following_delta,
+            state[5] + row.tweets_delta
+        ]
+        states.append((row.recorded_at, state))
+    
+    current = _state({c.key: getattr(follower, c.key) for c in Follower.__table__.columns})
+    base = [current[0] - state[0], current[1] ^ state[1], current[2] ^ state[2],
+            current[3] - state[3], current[4] - state[4], current[5] - state[5]]
+    
+    return [
+        {
+            "recorded_at": recorded_at.isoformat(),
+            "bot_score": (base[0] + s[0]) / 10,
+            "is_bot": bool((base[2] ^ s[2]) & HISTORY_BOT),
+            "is_inactive": bool((base[2] ^ s[2]) & HISTORY_INACTIVE),
+            "flags": mask_to_flags(base[1] ^ s[1]),
+            "followers_count": base[3] + s[3],
+            "following_count": base[4] + s[4],
+            "tweet_count": base[5] + s[5]
+        }
+        for recorded_at, s in states
+    ]
@@ -0,0 +1,257 @@
+"""Background job runner for long-running follower analysis and re-scoring."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from app.analyzer import FollowerAnalyzer
+from app.config import settings
+from app.enrichment import TimelineEnricher
+from app.models import SessionLocal, Job
+from app.pipeline import analyze_follower_pages, load_checkpoint, rescore_stored_followers
+from app.twitter_client import TwitterClient
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("pending", "running")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.job_workers, thread_name_prefix="job")
+    return _executor
+
+
+def shutdown():
+    """Stop accepting jobs and cancel queued ones (running jobs stop at their next page)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    """Serialize a job for the API."""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "pages_fetched": job.pages_fetched,
+        "followers_scored": job.followers_scored,
+        "rows_written": job.rows_written,
+        "cancel_requested": job.cancel_requested,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+def mark_interrupted_jobs():
+    """Fail jobs left active by a previous process (their worker threads are gone)."""
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.status.in_(ACTIVE_STATUSES)).update(
+            {"status": "failed", "error": "Interrupted by server restart", "finished_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _submit(kind: str, twitter_user_id: str, run: Callable[..., None], *args: Any) -> Dict[str, Any]:
+    """
+    Queue `run(job_id, *args)` as a job of `kind`, unless the account already has an active job.
+    
+    Analysis and rescore jobs both apply stats and history deltas against the
+    stored rows, so an account runs one job at a time whatever its kind.
+    """
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(
+            Job.twitter_user_id == twitter_user_id,
+            Job.status.in_(ACTIVE_STATUSES)
+        ).first()
+        if job:
+            return job_to_dict(job)
+        
+        job = Job(kind=kind, status="pending", twitter_user_id=twitter_user_id)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        
+        get_executor().submit(run, job.id, *args)
+        return job_to_dict(job)
+    finally:
+        db.close()
+
+
+def submit_analysis(session: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Queue a follower analysis for the session's account.
+    
+    If the account already has an active job (analysis or rescore), that job
+    is returned instead of starting a second one.
+    
+    Args:
+        session: Current user session from get_current_session
+    
+    Returns:
+        Serialized job
+    """
+    return _submit(
+        "analyze", session["twitter_user_id"], run_analysis_job,
+        session["access_token"], session["access_token_secret"]
+    )
+
+
+def submit_rescore(session: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Queue a re-score of the session's stored followers (no Twitter calls).
+    
+    If the account already has an active job (analysis or rescore), that job
+    is returned instead of starting a second one.
+    
+    Args:
+        session: Current user session from get_current_session
+    
+    Returns:
+        Serialized job
+    """
+    return _submit("rescore", session["twitter_user_id"], run_rescore_job)
+
+
+def cancel_job(job_id: int, twitter_user_id: str) -> Optional[Dict[str, Any]]:
+    """Request cancellation of a job; the worker stops after its current page."""
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == job_id, Job.twitter_user_id == twitter_user_id).first()
+        if not job:
+            return None
+        if job.status in ACTIVE_STATUSES:
+            job.cancel_requested = True
+            db.commit()
+        return job_to_dict(job)
+    finally:
+        db.close()
+
+
+def get_job(job_id: int, twitter_user_id: str) -> Optional[Dict[str, Any]]:
+    """Return a job owned by the given account."""
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == job_id, Job.twitter_user_id == twitter_user_id).first()
+        return job_to_dict(job) if job else None
+    finally:
+        db.close()
+
+
+def run_analysis_job(job_id: int, access_token: str, access_token_secret: str):
+    """Worker entry point: crawl, score and persist followers, recording progress on the job."""
+    db = SessionLocal()
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        db.close()
+        return
+    enricher = None
+    
+    try:
+        if job.cancel_requested:
+            job.status = "cancelled"
+            return
+        
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        db.commit()
+        
+        twitter_client = TwitterClient(access_token=access_token, access_token_secret=access_token_secret)
+        if not twitter_client.verify_credentials():
+            raise RuntimeError("Invalid Twitter credentials")
+        
+        # Continue an interrupted crawl from its last committed page
+        checkpoint = load_checkpoint(db, job.twitter_user_id)
+        if settings.enrich_timelines:
+            enricher = TimelineEnricher(access_token, access_token_secret)
+        pages = analyze_follower_pages(
+            db,
+            job.twitter_user_id,
+            twitter_client.iter_follower_pages(cursor=int(checkpoint.next_cursor)),
+            FollowerAnalyzer(),
+            checkpoint=checkpoint,
+            enrich=enricher
+        )
+        with closing(pages):
+            for progress in pages:
+                job.pages_fetched = progress.page_number
+                job.followers_scored = progress.followers_scored
+                job.rows_written = progress.rows_written
+                db.commit()
+                
+                db.refresh(job, attribute_names=["cancel_requested"])
+                if job.cancel_requested:
+                    job.status = "cancelled"
+                    break
+            else:
+                job.status = "completed"
+                checkpoint.completed_at = checkpoint.completed_at or datetime.utcnow()
+    
+    except Exception as e:
+        logger.error(f"Analysis job {job_id} failed: {e}")
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+    
+    finally:
+        if enricher is not None:
+            enricher.close()
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        db.close()
+
+
+def run_rescore_job(job_id: int):
+    """Worker entry point: re-score the account's out-of-date stored followers in large batches."""
+    db = SessionLocal()
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        db.close()
+        return
+    
+    try:
+        if job.cancel_requested:
+            job.status = "cancelled"
+            return
+        
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        db.commit()
+        
+        batches = rescore_stored_followers(db, job.twitter_user_id, FollowerAnalyzer())
+        with closing(batches):
+            for progress in batches:
+                job.followers_scored = progress.followers_scored
+                job.rows_written = progress.rows_written
+                db.commit()
+                
+                db.refresh(job, attribute_names=["cancel_requested"])
+                if job.cancel_requested:
+                    job.status = "cancelled"
+                    break
+            else:
+                job.status = "completed"
+    
+    except Exception as e:
+        logger.error(f"Rescore job {job_id} failed: {e}")
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+    
+    finally:
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        db.close()
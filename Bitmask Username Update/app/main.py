@@ -6,6 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 from app.routes import auth, dashboard, api
 from app.models import init_db
+from app import jobs, parallel
+from app.async_twitter_client import close_http_pool
 import logging
 
 # Configure logging
@@ -18,9 +20,13 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
     init_db()
+    jobs.mark_interrupted_jobs()
     logger.info("Database initialized")
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    jobs.shutdown()
+    parallel.shutdown()
+    await close_http_pool()
 
 
 # Initialize FastAPI app
@@ -1,8 +1,10 @@
 """Database models for the application."""
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Float, DateTime, Text, ForeignKey
+from typing import Any, List, Mapping, Optional
+from sqlalchemy import create_engine, func, inspect, Column, Integer, String, Boolean, Float, DateTime, Text, ForeignKey, Index, SmallInteger, UniqueConstraint
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, Session
 from app.config import settings
 
 Base = declarative_base()
@@ -13,8 +15,9 @@ class Follower(Base):
     __tablename__ = "followers"
     
     id = Column(Integer, primary_key=True, index=True)
-    twitter_id = Column(String, unique=True, index=True, nullable=False)
-    username = Column(String, index=True, nullable=False)
+    owner_id = Column(String, nullable=False)  # twitter_user_id of the account this follower belongs to
+    twitter_id = Column(String, nullable=False)
+    username = Column(String, nullable=False)
     display_name = Column(String)
     bio = Column(Text)
     profile_image_url = Column(String)
@@ -29,12 +32,32 @@ class Follower(Base):
     bot_score = Column(Float, default=0.0)
     is_bot = Column(Boolean, default=False)
     is_inactive = Column(Boolean, default=False)
+    flags_mask = Column(Integer, default=0, nullable=False)  # analyzer.FLAG_BITS of the detected flags
     analysis_date = Column(DateTime, default=datetime.utcnow)
+    content_hash = Column(String(16), nullable=True)  # FollowerAnalyzer.fingerprint of the last scored profile
+    rescore_after = Column(DateTime, nullable=True)  # When a time-based flag can next change
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     unfollow_records = relationship("UnfollowRecord", back_populates="follower")
+    
+    # Every hot query is scoped to one account, so every index leads with owner_id.
+    # The rest are keyset pagination indexes for each /api/followers sort (see
+    # app/pagination.py); descending sorts scan them backward.
+    __table_args__ = (
+        UniqueConstraint("owner_id", "twitter_id", name="uq_followers_owner_twitter_id"),
+        Index("ix_followers_owner_bot_score_id", "owner_id", "bot_score", "id"),
+        Index("ix_followers_owner_is_bot_bot_score_id", "owner_id", "is_bot", "bot_score", "id"),
+        Index("ix_followers_owner_is_inactive_bot_score_id", "owner_id", "is_inactive", "bot_score", "id"),
+        Index("ix_followers_owner_username_id", "owner_id", "username", "id"),
+        Index("ix_followers_owner_followers_count_id", "owner_id", "followers_count", "id"),
+        Index("ix_followers_owner_last_tweet_at_id", "owner_id", "last_tweet_at", "id"),
+        # Counts flag-filtered followers (the first page's total) from the index alone. A bitmask test
+        # cannot seek, so this scans every entry of the owner's range. Listing pages walk the sort
+        # index instead and test flags_mask & m = m against the table rows.
+        Index("ix_followers_owner_flags_mask_id", "owner_id", "flags_mask", "id"),
+    )
 
 
 class AnalysisResult(Base):
@@ -50,17 +73,47 @@ class AnalysisResult(Base):
     notes = Column(Text)
 
 
+class FollowerHistory(Base):
+    """
+    Append-only analysis history: one row per run in which a follower's results changed.
+    
+    Each row holds deltas against the previous row (the first row against zero),
+    so a follower's trajectory is the running sum (XOR for the bit columns).
+    """
+    __tablename__ = "follower_history"
+    
+    id = Column(Integer, primary_key=True)
+    follower_id = Column(Integer, ForeignKey("followers.id"), nullable=False)
+    recorded_at = Column(DateTime, nullable=False)
+    bot_score_delta = Column(Integer, default=0, nullable=False)  # Tenths of a point
+    flags_xor = Column(Integer, default=0, nullable=False)  # analyzer.FLAG_BITS that toggled
+    status_xor = Column(SmallInteger, default=0, nullable=False)  # HISTORY_BOT | HISTORY_INACTIVE toggles
+    followers_delta = Column(Integer, default=0, nullable=False)
+    following_delta = Column(Integer, default=0, nullable=False)
+    tweets_delta = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_follower_history_follower_id_id", "follower_id", "id"),
+    )
+
+
 class UnfollowRecord(Base):
     """Model for tracking unfollow actions."""
     __tablename__ = "unfollow_records"
     
     id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(String, nullable=False)  # twitter_user_id of the account that unfollowed
     follower_id = Column(Integer, ForeignKey("followers.id"))
     follower = relationship("Follower", back_populates="unfollow_records")
     unfollowed_at = Column(DateTime, default=datetime.utcnow)
     reason = Column(String)  # 'bot', 'inactive', 'manual'
     can_undo = Column(Boolean, default=True)
     undone_at = Column(DateTime, nullable=True)
+    
+    # Newest-first history pages and the "unfollowed today" count, per account
+    __table_args__ = (
+        Index("ix_unfollow_records_owner_unfollowed_at_id", "owner_id", "unfollowed_at", "id"),
+    )
 
 
 class UserSession(Base):
@@ -77,14 +130,92 @@ class UserSession(Base):
     expires_at = Column(DateTime)
 
 
+class Job(Base):
+    """Model for tracking background jobs (e.g. follower analysis)."""
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # 'analyze', 'rescore'
+    status = Column(String, default="pending", index=True)  # 'pending', 'running', 'completed', 'failed', 'cancelled'
+    twitter_user_id = Column(String, index=True)
+    pages_fetched = Column(Integer, default=0)
+    followers_scored = Column(Integer, default=0)
+    rows_written = Column(Integer, default=0)
+    cancel_requested = Column(Boolean, default=False)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class CrawlCheckpoint(Base):
+    """Model for resuming an interrupted follower crawl."""
+    __tablename__ = "crawl_checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    twitter_user_id = Column(String, unique=True, index=True, nullable=False)
+    next_cursor = Column(String, default="-1")  # Opaque Twitter cursor, stored as text
+    pages_fetched = Column(Integer, default=0)
+    followers_fetched = Column(Integer, default=0)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class FollowerStats(Base):
+    """Materialized dashboard counters per account, kept current by the analyze and unfollow paths."""
+    __tablename__ = "follower_stats"
+    
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(String, unique=True, nullable=False)
+    total_followers = Column(Integer, default=0, nullable=False)
+    bots = Column(Integer, default=0, nullable=False)
+    inactive = Column(Integer, default=0, nullable=False)
+    unfollowed_today = Column(Integer, default=0, nullable=False)
+    unfollowed_on = Column(DateTime, nullable=True)  # UTC day that unfollowed_today counts
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 # Database setup
 engine = create_engine(settings.database_url, connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def init_db():
-    """Initialize the database by creating all tables."""
-    Base.metadata.create_all(bind=engine)
+class SchemaOutdatedError(RuntimeError):
+    """The database was created by an older version and lacks columns this version needs."""
+
+
+def check_schema(bind=None):
+    """
+    Fail if existing tables are missing any model column.
+    
+    create_all only creates missing tables; it never alters existing ones, so
+    a database from before follower data was partitioned by account (owner_id)
+    would otherwise fail on its first query. Rows without an owner cannot be
+    assigned to an account, so there is no in-place migration.
+    
+    Raises:
+        SchemaOutdatedError: Listing the missing columns and the upgrade step
+    """
+    inspector = inspect(bind or engine)
+    existing = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name in existing:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            missing += [f"{table.name}.{c.name}" for c in table.columns if c.name not in columns]
+    if missing:
+        raise SchemaOutdatedError(
+            f"Database schema is out of date (missing columns: {', '.join(missing)}). "
+            "Delete the database (default: twitter_unfollow.db) or point DATABASE_URL at a new one, "
+            "then restart and run the analysis again."
+        )
+
+
+def init_db(bind=None):
+    """Initialize the database by creating all tables, after checking existing ones are current."""
+    check_schema(bind)
+    Base.metadata.create_all(bind=bind or engine)
 
 
 def get_db():
@@ -95,3 +226,72 @@ def get_db():
     finally:
         db.close()
 
+
+
+# Filled by timeline enrichment, which can be skipped or fail: a missing value keeps the stored one
+KEEP_STORED_IF_NULL = ("last_tweet_at",)
+
+
+def upsert_followers(db: Session, owner_id: str, rows: List[Mapping[str, Any]], batch_size: Optional[int] = None) -> int:
+    """
+    Insert or update one account's followers in bulk, keyed by (owner_id, twitter_id) (without committing).
+    
+    Uses INSERT ... ON CONFLICT(owner_id, twitter_id) DO UPDATE on SQLite and
+    PostgreSQL, one statement per chunk of `batch_size` rows. Other dialects
+    fall back to a single IN lookup per chunk followed by ORM inserts/updates.
+    
+    Args:
+        db: Database session
+        owner_id: twitter_user_id of the account the followers belong to
+        rows: FollowerRecords or follower dictionaries (fields that are not Follower columns are ignored)
+        batch_size: Rows per statement (defaults to settings.upsert_batch_size)
+    
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+    batch_size = batch_size or settings.upsert_batch_size
+    table = Follower.__table__
+    columns = [
+        c.name for c in table.columns
+        if c.name not in ("id", "owner_id", "created_at", "updated_at") and c.name in rows[0]
+    ]
+    dialect = db.get_bind().dialect.name
+    
+    written = 0
+    for start in range(0, len(rows), batch_size):
+        # Later rows win if a chunk repeats a twitter_id (ON CONFLICT cannot touch a row twice)
+        chunk = {row["twitter_id"]: row for row in rows[start:start + batch_size]}
+        values = [{"owner_id": owner_id, **{c: row.get(c) for c in columns}} for row in chunk.values()]
+        now = datetime.utcnow()
+        
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            stmt = insert(table)
+            update = {
+                c: func.coalesce(stmt.excluded[c], table.c[c]) if c in KEEP_STORED_IF_NULL else stmt.excluded[c]
+                for c in columns if c != "twitter_id"
+            }
+            update["updated_at"] = stmt.excluded.updated_at
+            stmt = stmt.on_conflict_do_update(index_elements=["owner_id", "twitter_id"], set_=update)
+            # executemany: batched into multi-row VALUES by the driver layer, with a cached statement
+            db.execute(stmt, [{**v, "created_at": now, "updated_at": now} for v in values])
+        else:
+            existing = {
+                f.twitter_id: f
+                for f in db.query(Follower).filter(
+                    Follower.owner_id == owner_id, Follower.twitter_id.in_(list(chunk.keys()))
+                )
+            }
+            for v in values:
+                follower = existing.get(v["twitter_id"])
+                if follower:
+                    for key, value in v.items():
+                        if value is not None or key not in KEEP_STORED_IF_NULL:
+                            setattr(follower, key, value)
+                    follower.updated_at = now
+                else:
+                    db.add(Follower(**v))
+        written += len(values)
+    return written
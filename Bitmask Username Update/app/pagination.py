@@ -0,0 +1,161 @@
+"""Keyset (cursor) pagination for follower listings and unfollow history."""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import and_, tuple_
+from sqlalchemy.orm import Query, Session
+from app.models import Follower, UnfollowRecord
+
+
+class SortKey(NamedTuple):
+    """A sort order that can be paged by keyset: the column, its direction and whether it holds NULLs."""
+    column: Any
+    descending: bool
+    nullable: bool = False
+
+
+# Ties are broken by id in the same direction, so every order is a single
+# composite index scan (forward or backward) over (column, id).
+SORT_KEYS = {
+    "bot_score": SortKey(Follower.bot_score, descending=True),
+    "username": SortKey(Follower.username, descending=False),
+    "followers": SortKey(Follower.followers_count, descending=True),
+    "last_tweet": SortKey(Follower.last_tweet_at, descending=True, nullable=True)
+}
+
+
+class InvalidCursor(ValueError):
+    """Cursor that is malformed or was issued for a different sort order."""
+
+
+def encode_cursor(sort_by: str, value: Any, row_id: int) -> str:
+    """Encode the position after a row as an opaque URL-safe token."""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps([sort_by, value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    """Decode a cursor into the (sort value, id) of the last row seen."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Malformed cursor")
+    if cursor_sort != sort_by or not isinstance(row_id, int):
+        raise InvalidCursor("Cursor does not match sort order")
+    return value, row_id
+
+
+def _after(key: SortKey, value: Any, row_id: int):
+    """Predicate selecting non-NULL rows after (value, row_id), or NULL rows after row_id if value is None."""
+    column = key.column
+    if value is None:
+        return and_(column.is_(None), Follower.id < row_id if key.descending else Follower.id > row_id)
+    if key.descending:
+        return tuple_(column, Follower.id) < tuple_(value, row_id)
+    return tuple_(column, Follower.id) > tuple_(value, row_id)
+
+
+def _order(key: SortKey) -> List[Any]:
+    if key.descending:
+        return [key.column.desc(), Follower.id.desc()]
+    return [key.column.asc(), Follower.id.asc()]
+
+
+def keyset_page(query: Query, sort_by: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[Follower], Optional[str]]:
+    """
+    Fetch one page of followers after `cursor`.
+    
+    NULL sort values come last. For nullable columns the non-NULL range and
+    the NULL tail are read as separate index range scans, since an OR of
+    the two would force a scan from the start of the index.
+    
+    Args:
+        query: Filtered Follower query for one owner (unordered)
+        sort_by: Key of SORT_KEYS
+        limit: Page size
+        cursor: next_cursor from the previous page (None for the first page)
+    
+    Returns:
+        (followers, next_cursor), where next_cursor is None on the last page
+    
+    Raises:
+        InvalidCursor: If the cursor cannot be used for this sort order
+    """
+    key = SORT_KEYS[sort_by]
+    position = decode_cursor(cursor, sort_by) if cursor else None
+    
+    # One extra row tells whether another page exists
+    if not key.nullable:
+        if position is not None:
+            query = query.filter(_after(key, *position))
+        rows = query.order_by(*_order(key)).limit(limit + 1).all()
+    else:
+        rows = []
+        if position is None or position[0] is not None:
+            ranged = query.filter(key.column.isnot(None))
+            if position is not None:
+                ranged = ranged.filter(_after(key, *position))
+            rows = ranged.order_by(*_order(key)).limit(limit + 1).all()
+        if len(rows) <= limit:
+            nulls = query.filter(key.column.is_(None))
+            if position is not None and position[0] is None:
+                nulls = nulls.filter(_after(key, *position))
+            rows += nulls.order_by(*_order(key)[1:]).limit(limit + 1 - len(rows)).all()
+    
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_by, getattr(last, key.column.key), last.id)
+
+
+def unfollow_history_page(db: Session, owner_id: str, limit: int,
+                          cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of an account's unfollow history, newest first, in a single query.
+    
+    The follower's username is selected through a join rather than loaded
+    per record, and pages are keyed on (unfollowed_at, id).
+    
+    Returns:
+        (history entries, next_cursor), where next_cursor is None on the last page
+    
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    query = db.query(
+        UnfollowRecord.id,
+        Follower.username,
+        UnfollowRecord.unfollowed_at,
+        UnfollowRecord.reason,
+        UnfollowRecord.can_undo,
+        UnfollowRecord.undone_at
+    ).join(Follower, UnfollowRecord.follower_id == Follower.id).filter(UnfollowRecord.owner_id == owner_id)
+    if cursor:
+        unfollowed_at, row_id = decode_cursor(cursor, "unfollowed_at")
+        query = query.filter(tuple_(UnfollowRecord.unfollowed_at, UnfollowRecord.id) < tuple_(unfollowed_at, row_id))
+    
+    rows = query.order_by(UnfollowRecord.unfollowed_at.desc(), UnfollowRecord.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor("unfollowed_at", rows[-1].unfollowed_at, rows[-1].id)
+    
+    history = [
+        {
+            "id": row.id,
+            "username": row.username,
+            "unfollowed_at": row.unfollowed_at.isoformat(),
+            "reason": row.reason,
+            "can_undo": row.can_undo,
+            "undone_at": row.undone_at.isoformat() if row.undone_at else None
+        }
+        for row in rows
+    ]
+    return history, next_cursor
@@ -0,0 +1,98 @@
+"""Process-pool scoring: shard large follower batches across CPU cores."""
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import numpy as np
+from app.analysis_context import AnalysisContext
+from app.columnar import BatchScores, PackedFollowers, columns_from_packed, pack_followers, score_columns
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Scoring pools by worker count; production uses only ANALYSIS_WORKERS
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared scoring pool with `workers` processes, creating it on first use.
+    
+    Jobs call this from several threads at once. A caller asking for a
+    different size gets its own pool and never shuts down one that another
+    job is still submitting to.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # Spawned, not forked: the server and job runner are multi-threaded
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return pool
+
+
+def shutdown():
+    """
+    Stop the scoring processes (application shutdown).
+    
+    Queued shards are dropped, but running ones are waited for: returning
+    early leaves the executor's exit hook writing to pipes that are already
+    closed ("Bad file descriptor").
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        _pools.clear()
+
+
+def score_shard(analyzer, packed: PackedFollowers, context: AnalysisContext) -> BatchScores:
+    """Worker entry point: score one packed shard."""
+    return score_columns(columns_from_packed(packed), analyzer, context)
+
+
+def shard_bounds(count: int, workers: int, min_shard_size: int) -> List[range]:
+    """Split `count` followers into at most `workers` contiguous shards of at least `min_shard_size`."""
+    shards = max(1, min(workers, count // max(min_shard_size, 1)))
+    size = math.ceil(count / shards) if count else 0
+    return [range(start, min(start + size, count)) for start in range(0, count, size or 1)]
+
+
+def parallel_score(
+    analyzer,
+    followers: List[Dict[str, Any]],
+    context: AnalysisContext,
+    workers: Optional[int] = None,
+    min_shard_size: Optional[int] = None
+) -> BatchScores:
+    """
+    Score followers across a process pool, preserving input order.
+    
+    The batch is packed once into compact columns and sliced into one shard
+    per worker. Batches too small for two shards are scored in-process,
+    since process round-trips would cost more than they save.
+    
+    Args:
+        analyzer: FollowerAnalyzer (pickled without its compiled rules)
+        followers: List of follower dictionaries
+        context: Analysis context shared by every shard
+        workers: Worker processes (defaults to settings)
+        min_shard_size: Smallest shard worth sending to a worker (defaults to settings)
+    
+    Returns:
+        BatchScores for the whole batch, in input order
+    """
+    workers = workers or settings.analysis_workers
+    min_shard_size = min_shard_size or settings.analysis_min_shard_size
+    packed = pack_followers(followers)
+    shards = shard_bounds(len(followers), workers, min_shard_size)
+    if len(shards) < 2:
+        return score_shard(analyzer, packed, context)
+    
+    pool = get_process_pool(workers)
+    futures = [pool.submit(score_shard, analyzer, packed.slice(s.start, s.stop), context) for s in shards]
+    results = [future.result() for future in futures]
+    return BatchScores(*(np.concatenate(field) for field in zip(*results)))
@@ -0,0 +1,288 @@
+"""Streaming follower ingestion pipeline: fetch, analyze and persist page by page."""
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TypeVar
+from sqlalchemy.orm import Session
+from app import history, stats
+from app.analyzer import FollowerAnalyzer
+from app.config import settings
+from app.models import CrawlCheckpoint, Follower, upsert_followers
+from app.records import PROFILE_FIELDS, FollowerRecord
+from app.twitter_client import FollowerPage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class StoredState(NamedTuple):
+    """A follower's previously stored analysis, used to compute stats and history deltas."""
+    id: int
+    bot_score: float
+    is_bot: bool
+    is_inactive: bool
+    flags_mask: int
+    followers_count: int
+    following_count: int
+    tweet_count: int
+    last_tweet_at: Optional[datetime]
+
+
+class PageResult(NamedTuple):
+    """Progress after one page has been analyzed and committed."""
+    page_number: int
+    followers_in_page: int
+    followers_scored: int
+    rows_written: int
+    next_cursor: int
+    followers_unchanged: int
+
+
+class RescoreResult(NamedTuple):
+    """Progress after one batch of stored followers has been re-scored and committed."""
+    batch_number: int
+    followers_checked: int
+    followers_scored: int
+    rows_written: int
+
+
+def prefetch(iterable: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """
+    Iterate over an iterable in a background thread, keeping up to `depth` items ready.
+    
+    While the consumer works on one item the producer is already fetching the
+    next, and the bounded queue keeps memory to roughly `depth + 1` items.
+    Exceptions raised by the producer are re-raised in the consumer.
+    """
+    items: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:  # forwarded to the consumer
+            put(e)
+    
+    producer = threading.Thread(target=produce, name="follower-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+STORED_STATE_COLUMNS = [getattr(Follower, field) for field in StoredState._fields]
+# Everything needed to rebuild a stored follower's record and StoredState, each column once
+RESCORE_COLUMNS = [Follower.content_hash, Follower.rescore_after] + [
+    getattr(Follower, field) for field in dict.fromkeys(StoredState._fields + PROFILE_FIELDS)
+]
+
+
+def select_changed(
+    db: Session,
+    owner_id: str,
+    followers: List[FollowerRecord],
+    analyzer: FollowerAnalyzer,
+    now: Optional[datetime] = None
+) -> List[FollowerRecord]:
+    """
+    Return the followers that need re-scoring, with their fingerprint attached.
+    
+    A follower is skipped when its stored fingerprint matches the incoming
+    profile and none of its time-based flags is due to change. Stored state
+    for the whole page is read with a single IN query; each returned follower
+    carries its StoredState as `stored_state` (None if new) for the stats
+    counters and the analysis history.
+    """
+    now = now or datetime.utcnow()
+    for follower in followers:
+        follower.content_hash = analyzer.fingerprint(follower)
+    
+    rows = db.query(
+        Follower.twitter_id, Follower.content_hash, Follower.rescore_after, *STORED_STATE_COLUMNS
+    ).filter(Follower.owner_id == owner_id, Follower.twitter_id.in_([f["twitter_id"] for f in followers]))
+    stored = {row[0]: (row[1], row[2], StoredState(*row[3:])) for row in rows}
+    
+    changed = []
+    for follower in followers:
+        previous = stored.get(follower.twitter_id)
+        if previous is None:
+            follower.stored_state = None
+            changed.append(follower)
+        elif previous[0] != follower.content_hash or (previous[1] is not None and previous[1] <= now):
+            follower.stored_state = previous[2]
+            changed.append(follower)
+    return changed
+
+
+def load_checkpoint(db: Session, twitter_user_id: str) -> CrawlCheckpoint:
+    """
+    Return the crawl checkpoint to continue from for an account.
+    
+    An unfinished checkpoint younger than CRAWL_CHECKPOINT_MAX_AGE_HOURS is
+    resumed; otherwise the checkpoint is reset so the crawl starts at page one.
+    """
+    checkpoint = db.query(CrawlCheckpoint).filter(
+        CrawlCheckpoint.twitter_user_id == twitter_user_id
+    ).first()
+    if checkpoint is None:
+        checkpoint = CrawlCheckpoint(twitter_user_id=twitter_user_id)
+        db.add(checkpoint)
+    else:
+        max_age = timedelta(hours=settings.crawl_checkpoint_max_age_hours)
+        stale = checkpoint.updated_at is None or datetime.utcnow() - checkpoint.updated_at > max_age
+        if checkpoint.completed_at is not None or stale:
+            checkpoint.next_cursor = "-1"
+            checkpoint.pages_fetched = 0
+            checkpoint.followers_fetched = 0
+            checkpoint.started_at = datetime.utcnow()
+            checkpoint.completed_at = None
+        else:
+            logger.info(
+                f"Resuming follower crawl for {twitter_user_id} at page "
+                f"{checkpoint.pages_fetched + 1} (cursor {checkpoint.next_cursor})"
+            )
+    db.commit()
+    return checkpoint
+
+
+def analyze_follower_pages(
+    db: Session,
+    owner_id: str,
+    pages: Iterable[FollowerPage],
+    analyzer: FollowerAnalyzer,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+    enrich: Optional[Callable[[List[Dict[str, Any]]], Any]] = None
+) -> Iterator[PageResult]:
+    """
+    Score and persist follower pages as they arrive.
+    
+    Each page is analyzed and committed while the next page is fetched in the
+    background, so results become visible after the first page instead of
+    after the whole crawl. Followers whose profile is unchanged since the last
+    run (see select_changed) are neither enriched, re-scored nor rewritten.
+    
+    Args:
+        db: Database session
+        owner_id: twitter_user_id of the account whose followers these are
+        pages: Iterable of follower pages (e.g. TwitterClient.iter_follower_pages())
+        analyzer: Analyzer used to score each page
+        checkpoint: Crawl checkpoint advanced in the same transaction as each page
+        enrich: Optional stage run on each page before scoring (e.g. TimelineEnricher)
+    
+    Yields:
+        PageResult after each page is committed
+    """
+    scored = 0
+    written = 0
+    unchanged = 0
+    for page_number, page in enumerate(prefetch(pages), start=1):
+        now = datetime.utcnow()
+        followers = [FollowerRecord.coerce(follower) for follower in page.followers]
+        changed = select_changed(db, owner_id, followers, analyzer, now)
+        unchanged += len(page.followers) - len(changed)
+        if enrich is not None and changed:
+            enrich(changed)
+        for follower in changed:
+            # Not enriched this run (capped or lookup failed): score with the last known tweet, as upsert keeps it
+            if not follower.get("last_tweet_at") and follower.stored_state is not None:
+                follower.last_tweet_at = follower.stored_state.last_tweet_at
+        analyzed = analyzer.batch_analyze(changed, context=analyzer.context(now))
+        for follower in analyzed:
+            follower.rescore_after = analyzer.rescore_after(follower, now)
+        written += upsert_followers(db, owner_id, analyzed)
+        stats.record_analyzed(db, owner_id, analyzed)
+        history.record_history(db, owner_id, analyzed, now)
+        if checkpoint is not None:
+            checkpoint.next_cursor = str(page.next_cursor)
+            checkpoint.pages_fetched += 1
+            checkpoint.followers_fetched += len(page.followers)
+            if page.next_cursor == 0:
+                checkpoint.completed_at = datetime.utcnow()
+        db.commit()
+        scored += len(analyzed)
+        yield PageResult(page_number, len(page.followers), scored, written, page.next_cursor, unchanged)
+
+
+def rescore_stored_followers(
+    db: Session,
+    owner_id: str,
+    analyzer: FollowerAnalyzer,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Iterator[RescoreResult]:
+    """
+    Re-score an account's stored followers whose results are out of date, without calling Twitter.
+    
+    A stored follower is out of date when its fingerprint no longer matches
+    (the analyzer configuration changed, e.g. RULE_WEIGHTS) or one of its
+    time-based flags is due. Unlike a crawl, which is held to 200 followers
+    per rate-limited page, this backlog is scored in batches of `batch_size`,
+    large enough to be sharded across the scoring process pool.
+    
+    Args:
+        db: Database session
+        owner_id: twitter_user_id of the account whose followers to re-score
+        analyzer: Analyzer with the current configuration
+        batch_size: Followers per scoring batch (defaults to ANALYSIS_WORKERS x ANALYSIS_MIN_SHARD_SIZE)
+        workers: Scoring processes (defaults to settings)
+    
+    Yields:
+        RescoreResult after each batch is committed
+    """
+    workers = workers or settings.analysis_workers
+    batch_size = batch_size or workers * settings.analysis_min_shard_size
+    checked = scored = written = 0
+    batch_number = 0
+    last_id = 0
+    backlog: List[FollowerRecord] = []
+    exhausted = False
+    while not exhausted:
+        now = datetime.utcnow()
+        rows = db.query(*RESCORE_COLUMNS).filter(
+            Follower.owner_id == owner_id, Follower.id > last_id
+        ).order_by(Follower.id).limit(batch_size).all()
+        exhausted = len(rows) < batch_size
+        checked += len(rows)
+        for row in rows:
+            follower = FollowerRecord(**{field: getattr(row, field) for field in PROFILE_FIELDS})
+            follower.content_hash = analyzer.fingerprint(follower)
+            if follower.content_hash != row.content_hash or (row.rescore_after is not None and row.rescore_after <= now):
+                follower.stored_state = StoredState(*(getattr(row, field) for field in StoredState._fields))
+                backlog.append(follower)
+            last_id = row.id
+        
+        while len(backlog) >= batch_size or (exhausted and backlog):
+            batch, backlog = backlog[:batch_size], backlog[batch_size:]
+            analyzed = analyzer.batch_analyze(batch, workers=workers, context=analyzer.context(now))
+            for follower in analyzed:
+                follower.rescore_after = analyzer.rescore_after(follower, now)
+            written += upsert_followers(db, owner_id, analyzed)
+            stats.record_analyzed(db, owner_id, analyzed)
+            history.record_history(db, owner_id, analyzed, now)
+            db.commit()
+            scored += len(analyzed)
+            batch_number += 1
+            yield RescoreResult(batch_number, checked, scored, written)
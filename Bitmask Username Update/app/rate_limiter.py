@@ -0,0 +1,148 @@
+"""Rate-limit-aware request scheduler for Twitter API calls."""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+# Published v1.1 user-auth limits per 15-minute window, used until response headers arrive.
+DEFAULT_LIMITS = {
+    "followers/list": 15,
+    "statuses/user_timeline": 900,
+    "account/verify_credentials": 75,
+    "application/rate_limit_status": 180
+}
+WINDOW_SECONDS = 900
+
+
+def endpoint_from_url(url: str) -> str:
+    """Map an API URL to its endpoint key, e.g. .../1.1/followers/list.json -> followers/list."""
+    path = urlparse(url).path.strip("/")
+    if path.startswith("1.1/"):
+        path = path[len("1.1/"):]
+    if path.endswith(".json"):
+        path = path[:-len(".json")]
+    return path
+
+
+class TokenBucket:
+    """
+    Request budget for one endpoint and access token.
+    
+    Twitter grants `limit` requests per fixed window ending at `reset_at`.
+    Requests go out immediately while the window has budget left; once it
+    is used up, further requests wait for the reset instead of drawing a
+    429. A bucket with an unknown limit does not wait until the server
+    reports one (or answers 429).
+    """
+    
+    def __init__(self, limit: Optional[int], window: float = WINDOW_SECONDS):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at: Optional[float] = None
+        # Start of the window the next request belongs to; in the future once
+        # requests have been queued behind an exhausted window
+        self.opens_at = 0.0
+    
+    def reserve(self, now: float) -> float:
+        """Claim one request and return the time at which it may be sent."""
+        if self.reset_at is not None and now >= self.reset_at:
+            self._refill(now)
+        
+        if self.remaining is None:
+            return now
+        
+        if self.remaining <= 0:
+            # Budget exhausted: the request goes out when the window resets
+            self._refill(self.reset_at)
+            if self.remaining is None:
+                return self.opens_at
+        
+        slot = max(now, self.opens_at)
+        if self.reset_at is None:
+            self.reset_at = slot + self.window
+        self.remaining -= 1
+        return slot
+    
+    def update(self, limit: Optional[int], remaining: int, reset_at: float):
+        """Synchronize with the x-rate-limit-* headers of a response."""
+        if reset_at <= self.opens_at:
+            # Late response from a window whose successor requests are already booked
+            return
+        if limit is not None:
+            self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+    
+    def exhaust(self, reset_at: float):
+        """Record a 429: nothing more can be sent until reset_at."""
+        self.remaining = 0
+        self.reset_at = reset_at
+    
+    def _refill(self, opens_at: float):
+        self.remaining = self.limit
+        self.reset_at = None
+        self.opens_at = opens_at
+
+
+class RateLimitScheduler:
+    """Per-access-token, per-endpoint token buckets fed by response headers."""
+    
+    def __init__(self, clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def _bucket(self, token_key: str, endpoint: str) -> TokenBucket:
+        key = (token_key, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(DEFAULT_LIMITS.get(endpoint))
+        return bucket
+    
+    def reserve(self, token_key: str, endpoint: str) -> float:
+        """Claim a request slot and return how many seconds to wait before sending it."""
+        with self._lock:
+            now = self.clock()
+            return max(self._bucket(token_key, endpoint).reserve(now) - now, 0.0)
+    
+    def acquire(self, token_key: str, endpoint: str) -> float:
+        """Block until a request to the endpoint fits the budget; returns the time waited."""
+        delay = self.reserve(token_key, endpoint)
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+    
+    async def acquire_async(self, token_key: str, endpoint: str) -> float:
+        """Like acquire, but waits with asyncio.sleep so the event loop keeps running."""
+        delay = self.reserve(token_key, endpoint)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+    
+    def record_response(self, token_key: str, endpoint: str, status_code: int, headers: Mapping[str, str]):
+        """Update the endpoint's bucket from a response's status and rate-limit headers."""
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        limit = headers.get("x-rate-limit-limit")
+        with self._lock:
+            bucket = self._bucket(token_key, endpoint)
+            if remaining is not None and reset is not None:
+                bucket.update(int(limit) if limit is not None else None, int(remaining), float(reset))
+            if status_code == 429:
+                bucket.exhaust(float(reset) if reset is not None else self.clock() + WINDOW_SECONDS)
+    
+    def status(self, token_key: str) -> Dict[str, Any]:
+        """Snapshot of the known budget per endpoint for one access token."""
+        with self._lock:
+            return {
+                endpoint: {"limit": b.limit, "remaining": b.remaining, "reset": b.reset_at}
+                for (key, endpoint), b in self._buckets.items()
+                if key == token_key
+            }
+
+
+# Shared by every TwitterClient so budgets survive across requests
+scheduler = RateLimitScheduler()
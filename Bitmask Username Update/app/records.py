@@ -0,0 +1,94 @@
+"""Compact follower record carried from the API client through analysis to persistence."""
+from typing import Any, Dict, Iterator, List, Mapping, Union
+from app.rules import flags_to_mask, mask_to_flags
+
+# Profile fields decoded from the Twitter API
+PROFILE_FIELDS = (
+    "twitter_id",
+    "username",
+    "display_name",
+    "bio",
+    "profile_image_url",
+    "banner_url",
+    "followers_count",
+    "following_count",
+    "tweet_count",
+    "account_created_at",
+    "is_verified",
+    "is_protected",
+    "last_tweet_at"
+)
+# Analyzer results ("flags" is derived from flags_mask rather than stored)
+ANALYSIS_FIELDS = ("bot_score", "is_bot", "is_inactive", "flags_mask", "analysis_date")
+# Set by the ingestion pipeline
+PIPELINE_FIELDS = ("content_hash", "rescore_after", "stored_state")
+
+RECORD_FIELDS = PROFILE_FIELDS + ANALYSIS_FIELDS + PIPELINE_FIELDS
+
+
+class FollowerRecord:
+    """
+    One follower as a fixed set of slots instead of a dictionary.
+    
+    A page of followers is decoded into records once and the analyzer and
+    pipeline fill in the remaining slots in place, so no per-follower dict
+    copies are made along the way. The mapping methods (`get`, `[]`, `in`,
+    `keys`) behave like the follower dictionaries used before: a slot that
+    was never set reads as missing, so `get(field, default)` still applies
+    its default.
+    """
+    
+    __slots__ = RECORD_FIELDS
+    
+    def __init__(self, **fields: Any):
+        for key, value in fields.items():
+            self[key] = value
+    
+    @classmethod
+    def coerce(cls, follower: Union["FollowerRecord", Mapping[str, Any]]) -> "FollowerRecord":
+        """Return a record as-is, or build one from a follower dictionary."""
+        return follower if isinstance(follower, cls) else cls(**follower)
+    
+    @property
+    def flags(self) -> List[str]:
+        return mask_to_flags(self.flags_mask)
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key: str, value: Any):
+        if key == "flags":
+            key, value = "flags_mask", flags_to_mask(value)
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(f"Unknown follower field: {key}") from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+    
+    def keys(self) -> List[str]:
+        keys = [field for field in RECORD_FIELDS if hasattr(self, field)]
+        if hasattr(self, "flags_mask"):
+            keys.append("flags")
+        return keys
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.keys()}
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (FollowerRecord, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"FollowerRecord({self.to_dict()!r})"
@@ -2,87 +2,130 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-import csv
-import io
-from app.models import get_db, Follower, UnfollowRecord
+from typing import Optional
+from app.models import get_db
+from app import jobs
+from app.exports import pyarrow_available, stream_arrow, stream_csv, stream_ndjson, stream_parquet
+from app.history import get_trajectory
+from app.pagination import InvalidCursor, unfollow_history_page
 from app.routes.auth import get_current_session
 
 router = APIRouter(prefix="/api", tags=["api"])
 
+# fmt -> (stream, media type, file extension)
+COLUMNAR_FORMATS = {
+    "arrow": (stream_arrow, "application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": (stream_parquet, "application/vnd.apache.parquet", "parquet")
+}
+
 
 @router.get("/export/csv")
-async def export_csv(request: Request, db: Session = Depends(get_db)):
-    """Export followers data to CSV."""
+async def export_csv(request: Request):
+    """Export followers data to CSV, streamed in chunks."""
     from app.routes.auth import get_current_session
     session = get_current_session(request)
     if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    followers = db.query(Follower).all()
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow([
-        "Username", "Display Name", "Bio", "Followers", "Following", 
-        "Tweets", "Bot Score", "Is Bot", "Is Inactive", 
-        "Last Tweet", "Account Created"
-    ])
-    
-    # Write data
-    for follower in followers:
-        writer.writerow([
-            follower.username,
-            follower.display_name or "",
-            follower.bio or "",
-            follower.followers_count,
-            follower.following_count,
-            follower.tweet_count,
-            follower.bot_score,
-            follower.is_bot,
-            follower.is_inactive,
-            follower.last_tweet_at.isoformat() if follower.last_tweet_at else "",
-            follower.account_created_at.isoformat() if follower.account_created_at else ""
-        ])
-    
-    output.seek(0)
-    
+    # A sync generator: Starlette iterates it in a worker thread, one chunk per write
     return StreamingResponse(
-        iter([output.getvalue()]),
+        stream_csv(session["twitter_user_id"]),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=followers_export.csv"}
     )
 
 
+@router.get("/export/ndjson")
+async def export_ndjson(request: Request):
+    """Export followers as newline-delimited JSON, streamed in chunks."""
+    session = get_current_session(request)
+    if not session:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    return StreamingResponse(
+        stream_ndjson(session["twitter_user_id"]),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=followers_export.ndjson"}
+    )
+
+
+@router.get("/export/{fmt}")
+async def export_columnar(request: Request, fmt: str):
+    """Export followers as typed record batches (fmt: arrow or parquet)."""
+    session = get_current_session(request)
+    if not session:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if fmt not in COLUMNAR_FORMATS:
+        raise HTTPException(status_code=404, detail=f"Unknown export format: {fmt}")
+    if not pyarrow_available():
+        raise HTTPException(status_code=501, detail="Arrow/Parquet export requires pyarrow")
+    
+    stream, media_type, extension = COLUMNAR_FORMATS[fmt]
+    return StreamingResponse(
+        stream(session["twitter_user_id"]),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=followers_export.{extension}"}
+    )
+
+
 @router.get("/unfollow-history")
 async def get_unfollow_history(
     request: Request,
-    skip: int = 0,
+    cursor: Optional[str] = None,
     limit: int = 50,
     db: Session = Depends(get_db)
 ):
-    """Get unfollow history."""
+    """Get unfollow history, newest first; pass `next_cursor` back as `cursor` for the next page."""
     from app.routes.auth import get_current_session
     session = get_current_session(request)
     if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    records = db.query(UnfollowRecord).order_by(
-        UnfollowRecord.unfollowed_at.desc()
-    ).offset(skip).limit(limit).all()
+    try:
+        history, next_cursor = unfollow_history_page(db, session["twitter_user_id"], max(1, min(limit, 200)), cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return JSONResponse({"history": history, "next_cursor": next_cursor})
+
+
+@router.get("/followers/{twitter_id}/history")
+async def get_follower_history(request: Request, twitter_id: str, db: Session = Depends(get_db)):
+    """Get a follower's bot score, flags and counts at each analysis run where they changed."""
+    session = get_current_session(request)
+    if not session:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    trajectory = get_trajectory(db, session["twitter_user_id"], twitter_id)
+    if trajectory is None:
+        raise HTTPException(status_code=404, detail="Follower not found")
+    
+    return JSONResponse({"twitter_id": twitter_id, "trajectory": trajectory})
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(request: Request, job_id: int):
+    """Get progress of a background job."""
+    session = get_current_session(request)
+    if not session:
+        raise HTTPException(status_code=401, detail="Not authenticated")
     
-    history = []
-    for record in records:
-        history.append({
-            "id": record.id,
-            "username": record.follower.username,
-            "unfollowed_at": record.unfollowed_at.isoformat(),
-            "reason": record.reason,
-            "can_undo": record.can_undo,
-            "undone_at": record.undone_at.isoformat() if record.undone_at else None
-        })
+    job = jobs.get_job(job_id, session["twitter_user_id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
     
-    return JSONResponse({"history": history})
+    return JSONResponse({"job": job})
+
 
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(request: Request, job_id: int):
+    """Request cancellation of a background job."""
+    session = get_current_session(request)
+    if not session:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    job = jobs.cancel_job(job_id, session["twitter_user_id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return JSONResponse({"success": True, "job": job})
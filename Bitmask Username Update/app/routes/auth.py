@@ -5,6 +5,7 @@ from requests_oauthlib import OAuth1Session
 from urllib.parse import parse_qs, urlparse
 import secrets
 from app.config import settings
+from app.session_cache import session_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -122,6 +123,9 @@ async def logout(request: Request):
     session_token = request.cookies.get("session_token")
     if session_token:
         from app.models import SessionLocal, UserSession
+        from app.async_twitter_client import drop_async_client
+        drop_async_client(session_token)
+        session_cache.invalidate(session_token)
         db = SessionLocal()
         try:
             db.query(UserSession).filter(UserSession.session_id == session_token).delete()
@@ -140,6 +144,11 @@ def get_current_session(request: Request):
     if not session_token:
         return None
     
+    # Served from memory until the cache TTL or the session's expiry, whichever is first
+    cached = session_cache.get(session_token)
+    if cached is not None:
+        return cached
+    
     from app.models import SessionLocal, UserSession
     from datetime import datetime
     
@@ -151,13 +160,15 @@ def get_current_session(request: Request):
         ).first()
         
         if user_session:
-            return {
+            session = {
                 "session_id": user_session.session_id,
                 "access_token": user_session.access_token,
                 "access_token_secret": user_session.access_token_secret,
                 "twitter_user_id": user_session.twitter_user_id,
                 "twitter_username": user_session.twitter_username
             }
+            session_cache.put(session_token, session, user_session.expires_at)
+            return session
         return None
     finally:
         db.close()
@@ -1,15 +1,17 @@
 """Dashboard routes."""
 from fastapi import APIRouter, Request, Depends, HTTPException, Form
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
 from typing import Optional
-from app.models import get_db, Follower, UnfollowRecord
-from app.twitter_client import TwitterClient
-from app.analyzer import FollowerAnalyzer
+from app.models import get_db, SessionLocal, Follower
+from app.async_twitter_client import get_async_client
+from app.analyzer import FLAG_BITS, flags_to_mask, mask_to_flags
+from app.exports import pyarrow_available
+from app.pagination import SORT_KEYS, InvalidCursor, keyset_page
+from app.unfollow_executor import execute_unfollows
+from app import jobs, stats
 from app.routes.auth import get_current_session
-from datetime import datetime, timedelta
 import json
 
 router = APIRouter(tags=["dashboard"])
@@ -33,41 +35,39 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(url="/auth/login")
     
     # Get statistics
-    total_followers = db.query(Follower).count()
-    bots = db.query(Follower).filter(Follower.is_bot == True).count()
-    inactive = db.query(Follower).filter(Follower.is_inactive == True).count()
-    
-    # Get recent unfollows today
-    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    unfollowed_today = db.query(UnfollowRecord).filter(
-        UnfollowRecord.unfollowed_at >= today
-    ).count()
-    
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
-        "total_followers": total_followers,
-        "bots": bots,
-        "inactive": inactive,
-        "unfollowed_today": unfollowed_today,
-        "username": session["twitter_username"]
+        **stats.get_stats(db, session["twitter_user_id"]),
+        "username": session["twitter_username"],
+        "columnar_exports": pyarrow_available()
     })
 
 
 @router.get("/api/followers")
 async def get_followers(
     request: Request,
-    skip: int = 0,
+    cursor: Optional[str] = None,
     limit: int = 50,
     filter_type: Optional[str] = None,
     sort_by: Optional[str] = "bot_score",
+    flags: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """API endpoint to get followers with pagination and filtering."""
+    """
+    API endpoint to get followers with keyset pagination and filtering.
+    
+    Pass the returned `next_cursor` to get the following page. `total` is
+    only computed for the first page (no cursor) and is null afterwards.
+    `flags` is a comma-separated list of analyzer flags that must all be set.
+    """
     session = get_current_session(request)
     if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    if sort_by not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort_by: {sort_by}")
+    limit = max(1, min(limit, 200))
     
-    query = db.query(Follower)
+    query = db.query(Follower).filter(Follower.owner_id == session["twitter_user_id"])
     
     # Apply filters
     if filter_type == "bots":
@@ -77,21 +77,31 @@ async def get_followers(
     elif filter_type == "both":
         query = query.filter((Follower.is_bot == True) | (Follower.is_inactive == True))
     
-    # Apply sorting
-    if sort_by == "bot_score":
-        query = query.order_by(desc(Follower.bot_score))
-    elif sort_by == "username":
-        query = query.order_by(Follower.username)
-    elif sort_by == "followers":
-        query = query.order_by(desc(Follower.followers_count))
-    elif sort_by == "last_tweet":
-        query = query.order_by(desc(Follower.last_tweet_at))
+    if flags:
+        names = [name.strip() for name in flags.split(",") if name.strip()]
+        unknown = [name for name in names if name not in FLAG_BITS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown flags: {', '.join(unknown)}")
+        mask = flags_to_mask(names)
+        query = query.filter(Follower.flags_mask.op("&")(mask) == mask)
     
-    # Get total count
-    total = query.count()
+    # Totals come from the materialized counters where they exist; clients keep the first page's total
+    total = None
+    if not cursor:
+        counts = stats.get_stats(db, session["twitter_user_id"])
+        if filter_type == "both" or flags:
+            total = query.count()
+        elif filter_type == "bots":
+            total = counts["bots"]
+        elif filter_type == "inactive":
+            total = counts["inactive"]
+        else:
+            total = counts["total_followers"]
     
-    # Apply pagination
-    followers = query.offset(skip).limit(limit).all()
+    try:
+        followers, next_cursor = keyset_page(query, sort_by, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Convert to dict
     followers_data = []
@@ -109,6 +119,7 @@ async def get_followers(
             "bot_score": follower.bot_score,
             "is_bot": follower.is_bot,
             "is_inactive": follower.is_inactive,
+            "flags": mask_to_flags(follower.flags_mask or 0),
             "last_tweet_at": follower.last_tweet_at.isoformat() if follower.last_tweet_at else None,
             "account_created_at": follower.account_created_at.isoformat() if follower.account_created_at else None
         })
@@ -116,69 +127,46 @@ async def get_followers(
     return JSONResponse({
         "followers": followers_data,
         "total": total,
-        "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     })
 
 
 @router.post("/api/analyze")
-async def analyze_followers(request: Request, db: Session = Depends(get_db)):
-    """Analyze followers from Twitter."""
+async def analyze_followers(request: Request):
+    """Start a background analysis of followers from Twitter."""
     session = get_current_session(request)
     if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     try:
-        # Initialize Twitter client with user's tokens
-        twitter_client = TwitterClient(
-            access_token=session["access_token"],
-            access_token_secret=session["access_token_secret"]
-        )
-        
-        # Verify credentials
-        user_info = twitter_client.verify_credentials()
-        if not user_info:
-            raise HTTPException(status_code=401, detail="Invalid Twitter credentials")
-        
-        # Fetch followers
-        followers_data = twitter_client.get_followers()
-        
-        # Analyze followers
-        analyzer = FollowerAnalyzer()
-        analyzed_followers = analyzer.batch_analyze(followers_data)
-        
-        # Store in database
-        saved_count = 0
-        for follower_data in analyzed_followers:
-            # Check if already exists
-            existing = db.query(Follower).filter(
-                Follower.twitter_id == follower_data["twitter_id"]
-            ).first()
-            
-            if existing:
-                # Update existing
-                for key, value in follower_data.items():
-                    if hasattr(existing, key):
-                        setattr(existing, key, value)
-                existing.updated_at = datetime.utcnow()
-            else:
-                # Create new
-                follower = Follower(**{k: v for k, v in follower_data.items() if hasattr(Follower, k)})
-                db.add(follower)
-            
-            saved_count += 1
-        
-        db.commit()
+        # Crawl, analysis and DB writes run in a worker thread; poll /api/jobs/{id} for progress
+        job = jobs.submit_analysis(session)
         
         return JSONResponse({
             "success": True,
-            "message": f"Analyzed and saved {saved_count} followers",
-            "total": len(analyzed_followers)
-        })
+            "message": "Analysis started",
+            "job": job
+        }, status_code=202)
         
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Error analyzing followers: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error starting analysis: {str(e)}")
+
+
+@router.post("/api/rescore")
+async def rescore_followers(request: Request):
+    """Start a background re-score of stored followers (e.g. after RULE_WEIGHTS changed)."""
+    session = get_current_session(request)
+    if not session:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    # Reads and rewrites the database only; large backlogs are sharded across ANALYSIS_WORKERS processes
+    job = jobs.submit_rescore(session)
+    return JSONResponse({
+        "success": True,
+        "message": "Re-scoring started",
+        "job": job
+    }, status_code=202)
 
 
 @router.post("/api/unfollow")
@@ -188,75 +176,52 @@ async def unfollow_users(
     reason: str = Form("manual"),
     db: Session = Depends(get_db)
 ):
-    """Unfollow selected users."""
+    """
+    Unfollow selected users.
+    
+    Streams one NDJSON line per user as each unfollow finishes, followed by a
+    summary line {"done": true, "unfollowed": n}.
+    """
     session = get_current_session(request)
     if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
+    # Parse user IDs
     try:
-        # Parse user IDs
         user_id_list = json.loads(user_ids) if isinstance(user_ids, str) else user_ids
-        
-        # Check daily limit
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        unfollowed_today = db.query(UnfollowRecord).filter(
-            UnfollowRecord.unfollowed_at >= today
-        ).count()
-        
-        from app.config import settings
-        if unfollowed_today + len(user_id_list) > settings.daily_unfollow_limit:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Daily unfollow limit ({settings.daily_unfollow_limit}) would be exceeded"
-            )
-        
-        # Initialize Twitter client
-        twitter_client = TwitterClient(
-            access_token=session["access_token"],
-            access_token_secret=session["access_token_secret"]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user_ids")
+    
+    # Check daily limit
+    unfollowed_today = stats.get_stats(db, session["twitter_user_id"])["unfollowed_today"]
+    
+    from app.config import settings
+    if unfollowed_today + len(user_id_list) > settings.daily_unfollow_limit:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Daily unfollow limit ({settings.daily_unfollow_limit}) would be exceeded"
         )
-        
-        # Unfollow each user
-        results = []
-        for user_id in user_id_list:
-            # Get follower from database
-            follower = db.query(Follower).filter(Follower.twitter_id == str(user_id)).first()
-            
-            if not follower:
-                continue
-            
-            # Unfollow on Twitter
-            success = twitter_client.unfollow_user(str(user_id))
-            
-            if success:
-                # Record unfollow
-                unfollow_record = UnfollowRecord(
-                    follower_id=follower.id,
-                    reason=reason,
-                    can_undo=True
-                )
-                db.add(unfollow_record)
-                results.append({"user_id": user_id, "success": True})
-            else:
-                results.append({"user_id": user_id, "success": False, "error": "Failed to unfollow"})
-            
-            # Small delay to respect rate limits
-            import time
-            time.sleep(1)
-        
-        db.commit()
-        
-        return JSONResponse({
-            "success": True,
-            "results": results,
-            "unfollowed": sum(1 for r in results if r.get("success"))
-        })
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Error unfollowing users: {str(e)}")
+    
+    # Async client on the shared connection pool, so unfollows don't block the event loop
+    twitter_client = get_async_client(session)
+    
+    async def stream():
+        # The request-scoped session is closed once the response starts, so the stream owns its own
+        stream_db = SessionLocal()
+        unfollowed = 0
+        try:
+            async for result in execute_unfollows(stream_db, session["twitter_user_id"], twitter_client, user_id_list, reason):
+                if result["success"]:
+                    unfollowed += 1
+                yield json.dumps(result) + "\n"
+            yield json.dumps({"done": True, "unfollowed": unfollowed}) + "\n"
+        except Exception as e:
+            stream_db.rollback()
+            yield json.dumps({"done": True, "unfollowed": unfollowed, "error": str(e)}) + "\n"
+        finally:
+            stream_db.close()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @router.get("/api/stats")
@@ -266,19 +231,5 @@ async def get_stats(request: Request, db: Session = Depends(get_db)):
     if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    total_followers = db.query(Follower).count()
-    bots = db.query(Follower).filter(Follower.is_bot == True).count()
-    inactive = db.query(Follower).filter(Follower.is_inactive == True).count()
-    
-    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    unfollowed_today = db.query(UnfollowRecord).filter(
-        UnfollowRecord.unfollowed_at >= today
-    ).count()
-    
-    return JSONResponse({
-        "total_followers": total_followers,
-        "bots": bots,
-        "inactive": inactive,
-        "unfollowed_today": unfollowed_today
-    })
+    return JSONResponse(stats.get_stats(db, session["twitter_user_id"]))
 
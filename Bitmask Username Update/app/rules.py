@@ -0,0 +1,323 @@
+"""Declarative scoring rules for the follower analyzer, compiled into scalar and batch evaluators."""
+import operator
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from app.analysis_context import AnalysisContext
+from app.config import settings
+
+# Default profile image patterns (Twitter default avatars)
+DEFAULT_PROFILE_PATTERNS = [
+    "default_profile",
+    "default_profile_normal",
+    "egg",
+    "twimg.com/images/themes/theme1/bg.png"
+]
+
+# Every flag the analyzer can emit, in the order analyze_follower reports them.
+# Each flag is assigned one bit so a follower's flags fit in a single integer.
+FLAG_NAMES = [
+    "default_profile_picture",
+    "empty_bio",
+    "very_short_bio",
+    "no_banner",
+    "low_follower_following_ratio",
+    "suspicious_follower_following_ratio",
+    "mass_following_low_followers",
+    "new_account_high_activity",
+    "new_account_mass_following",
+    "suspicious_follower_count",
+    "extremely_high_tweet_frequency",
+    "high_tweet_frequency",
+    "suspicious_username_pattern",
+    "username_too_many_numbers",
+    "very_short_username"
+]
+FLAG_BITS = {name: 1 << i for i, name in enumerate(FLAG_NAMES)}
+
+
+def flags_to_mask(flags: List[str]) -> int:
+    """Encode a list of flag names as an integer bitmask."""
+    mask = 0
+    for flag in flags:
+        mask |= FLAG_BITS[flag]
+    return mask
+
+
+def mask_to_flags(mask: int) -> List[str]:
+    """Decode an integer bitmask back into the ordered list of flag names."""
+    return [name for name in FLAG_NAMES if mask & FLAG_BITS[name]]
+
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne
+}
+
+# Age features and the creation timestamp they are evaluated against: "age < N days"
+# compiles to "created after now - N days", with the cutoff taken from the AnalysisContext
+AGE_FEATURES = {"account_age_days": "account_created_at"}
+FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+# Letters then 4+ digits, or digits then letters; IGNORECASE replaces lowering the handle first
+SUSPICIOUS_USERNAME = re.compile(r'[a-z]+\d{4,}|\d+[a-z]+', re.IGNORECASE)
+
+
+class Condition(NamedTuple):
+    """One comparison of a follower feature against a threshold."""
+    field: str
+    op: str
+    threshold: Any
+
+
+class UsernameTraits(NamedTuple):
+    """Everything the username rules read, computed in one pass over the handle."""
+    suspicious_pattern: bool
+    digit_ratio: float
+    length: int
+
+
+class Rule(NamedTuple):
+    """
+    A scoring heuristic: when every condition holds, add `weight` and raise `flag`.
+    
+    `unless` names an earlier rule that suppresses this one when it fired
+    (the "elif" of a tiered check such as empty bio vs very short bio).
+    """
+    flag: str
+    weight: float
+    when: Tuple[Condition, ...]
+    unless: Optional[str] = None
+
+
+RULES = [
+    # Profile quality
+    Rule("default_profile_picture", 15.0, (Condition("default_profile_picture", "==", True),)),
+    Rule("empty_bio", 10.0, (Condition("bio_blank", "==", True),)),
+    Rule("very_short_bio", 5.0, (Condition("bio_length", "<", 10),), unless="empty_bio"),
+    Rule("no_banner", 5.0, (Condition("has_banner", "==", False),)),
+    # Account metrics
+    Rule("low_follower_following_ratio", 20.0,
+         (Condition("follower_ratio", "<", 0.1), Condition("following_count", ">", 100))),
+    Rule("suspicious_follower_following_ratio", 10.0,
+         (Condition("follower_ratio", "<", 0.2), Condition("following_count", ">", 500)),
+         unless="low_follower_following_ratio"),
+    Rule("mass_following_low_followers", 25.0,
+         (Condition("following_count", ">", 5000), Condition("followers_count", "<", 100))),
+    Rule("new_account_high_activity", 15.0,
+         (Condition("account_age_days", "<", 30), Condition("tweet_count", ">", 500))),
+    Rule("new_account_mass_following", 10.0,
+         (Condition("account_age_days", "<", 30), Condition("following_count", ">", 1000))),
+    Rule("suspicious_follower_count", 5.0, (Condition("round_follower_count", "==", True),)),
+    # Activity patterns
+    Rule("extremely_high_tweet_frequency", 20.0, (Condition("tweets_per_day", ">", 50),)),
+    Rule("high_tweet_frequency", 10.0, (Condition("tweets_per_day", ">", 20),),
+         unless="extremely_high_tweet_frequency"),
+    # Username patterns
+    Rule("suspicious_username_pattern", 10.0, (Condition("username_pattern", "==", True),)),
+    Rule("username_too_many_numbers", 8.0, (Condition("username_digit_ratio", ">", 0.5),)),
+    Rule("very_short_username", 5.0, (Condition("username_length", "<", 4),))
+]
+
+
+def has_default_picture(profile_image: Optional[str]) -> bool:
+    """Whether a profile image URL points at one of Twitter's default avatars."""
+    if not profile_image:
+        return False
+    lowered = profile_image.lower()
+    return any(pattern in lowered for pattern in DEFAULT_PROFILE_PATTERNS)
+
+
+def _follower_ratio(follower: Dict[str, Any], context: AnalysisContext) -> Optional[float]:
+    following_count = follower.get("following_count", 0)
+    return follower.get("followers_count", 0) / following_count if following_count > 0 else None
+
+
+def _tweets_per_day(follower: Dict[str, Any], context: AnalysisContext) -> Optional[float]:
+    tweet_count = follower.get("tweet_count", 0)
+    created = follower.get("account_created_at")
+    if not created or tweet_count <= 0 or created >= context.now:
+        return None
+    return tweet_count / ((context.now - created).days or 1)
+
+
+@lru_cache(maxsize=settings.username_cache_size)
+def classify_username(username: str) -> UsernameTraits:
+    """
+    Classify a non-empty handle for the username rules.
+    
+    Memoized per handle: the same followers recur across runs and across
+    the accounts we manage, so most lookups skip the regex entirely.
+    """
+    return UsernameTraits(
+        SUSPICIOUS_USERNAME.match(username) is not None,
+        sum(map(str.isdigit, username)) / len(username),
+        len(username)
+    )
+
+
+def _username_trait(index: int) -> Callable[[Dict[str, Any], AnalysisContext], Any]:
+    def extract(follower: Dict[str, Any], context: AnalysisContext) -> Any:
+        username = follower.get("username")
+        return classify_username(username)[index] if username else None
+    return extract
+
+
+# Scalar feature extractors: follower dict and analysis context -> value, or None when
+# the inputs are missing (rules reading a missing feature are skipped)
+FEATURES: Dict[str, Callable[[Dict[str, Any], AnalysisContext], Any]] = {
+    "default_profile_picture": lambda f, context: has_default_picture(f.get("profile_image_url", "")),
+    "bio_blank": lambda f, context: not f.get("bio") or not f["bio"].strip(),
+    "bio_length": lambda f, context: len(f.get("bio") or ""),
+    "has_banner": lambda f, context: bool(f.get("banner_url")),
+    "followers_count": lambda f, context: f.get("followers_count", 0),
+    "following_count": lambda f, context: f.get("following_count", 0),
+    "tweet_count": lambda f, context: f.get("tweet_count", 0),
+    "follower_ratio": _follower_ratio,
+    "account_created_at": lambda f, context: f.get("account_created_at") or None,
+    "round_follower_count": lambda f, context: f.get("followers_count", 0) > 0 and f["followers_count"] % 1000 == 0,
+    "tweets_per_day": _tweets_per_day,
+    "username_pattern": _username_trait(0),
+    "username_digit_ratio": _username_trait(1),
+    "username_length": _username_trait(2)
+}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """
+    Parse a weight override string such as "empty_bio=12,no_banner=0".
+    
+    Raises:
+        ValueError: If an entry is malformed or names an unknown flag
+    """
+    weights = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        flag, sep, value = entry.partition("=")
+        flag = flag.strip()
+        if not sep or flag not in FLAG_BITS:
+            raise ValueError(f"Invalid rule weight: {entry!r}")
+        weights[flag] = float(value)
+    return weights
+
+
+class RuleEngine:
+    """
+    A rule table compiled for evaluation.
+    
+    Conditions are resolved to operator functions and flag bits once, and
+    only the features the table reads are extracted from each follower.
+    """
+    
+    def __init__(self, rules: List[Rule], weights: Optional[Dict[str, float]] = None):
+        weights = weights or {}
+        self.rules = rules
+        self.weights = {rule.flag: weights.get(rule.flag, rule.weight) for rule in rules}
+        self.signature = ",".join(f"{flag}={weight:g}" for flag, weight in sorted(weights.items()))
+        
+        compiled = []
+        seen = set()
+        for rule in rules:
+            if rule.flag not in FLAG_BITS:
+                raise ValueError(f"Unknown flag: {rule.flag}")
+            if rule.unless is not None and rule.unless not in seen:
+                raise ValueError(f"Rule {rule.flag} must follow the rule it depends on ({rule.unless})")
+            checks = []
+            for c in rule.when:
+                if c.field in AGE_FEATURES and c.op in FLIPPED:
+                    checks.append((AGE_FEATURES[c.field], OPERATORS[FLIPPED[c.op]], c.threshold, True))
+                elif c.field in FEATURES and c.op in OPERATORS:
+                    checks.append((c.field, OPERATORS[c.op], c.threshold, False))
+                else:
+                    raise ValueError(f"Invalid condition in rule {rule.flag}: {c}")
+            compiled.append((
+                FLAG_BITS[rule.flag],
+                self.weights[rule.flag],
+                tuple(checks),
+                FLAG_BITS[rule.unless] if rule.unless else 0
+            ))
+            seen.add(rule.flag)
+        self._compiled = compiled
+        self._bound = (None, None)
+        self.features = list(dict.fromkeys(check[0] for rule in compiled for check in rule[2]))
+        self._extractors = [(name, FEATURES[name]) for name in self.features]
+    
+    def thresholds(self, field: str) -> List[Any]:
+        """Distinct thresholds the table compares a feature against, in rule order."""
+        return list(dict.fromkeys(c.threshold for rule in self.rules for c in rule.when if c.field == field))
+    
+    def bind(self, context: AnalysisContext) -> List[Tuple[int, float, Tuple[Tuple[str, Callable, Any], ...], int]]:
+        """Resolve age thresholds to the context's creation-time cutoffs (cached for the last context)."""
+        bound_context, bound = self._bound
+        if bound_context is not context:
+            bound = [
+                (bit, weight, tuple(
+                    (field, compare, context.age_cutoff(threshold) if is_age else threshold)
+                    for field, compare, threshold, is_age in checks
+                ), unless)
+                for bit, weight, checks, unless in self._compiled
+            ]
+            self._bound = (context, bound)
+        return bound
+    
+    def evaluate(self, follower: Dict[str, Any], context: AnalysisContext) -> Tuple[float, int]:
+        """
+        Score one follower.
+        
+        Returns:
+            (uncapped bot score, flags bitmask)
+        """
+        values = {name: extract(follower, context) for name, extract in self._extractors}
+        score = 0.0
+        mask = 0
+        for bit, weight, checks, unless in self.bind(context):
+            if mask & unless:
+                continue
+            for field, compare, threshold in checks:
+                value = values[field]
+                if value is None or not compare(value, threshold):
+                    break
+            else:
+                score += weight
+                mask |= bit
+        return score, mask
+    
+    def evaluate_columns(self, features: Dict[str, Tuple[np.ndarray, np.ndarray]], n: int,
+                         context: AnalysisContext) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a batch from feature columns.
+        
+        Args:
+            features: Feature name -> (values, present) arrays, for every name in self.features;
+                timestamps as datetime64[us]
+            n: Number of followers in the batch
+            context: Analysis context for the batch
+        
+        Returns:
+            (uncapped bot scores, flags bitmasks)
+        """
+        score = np.zeros(n, dtype=np.float64)
+        flags_mask = np.zeros(n, dtype=np.int64)
+        for bit, weight, checks, unless in self.bind(context):
+            fired = np.ones(n, dtype=bool)
+            for field, compare, threshold in checks:
+                values, present = features[field]
+                if isinstance(threshold, datetime):
+                    threshold = np.datetime64(threshold, "us")
+                fired &= present & compare(values, threshold)
+            if unless:
+                fired &= (flags_mask & unless) == 0
+            score += np.where(fired, weight, 0.0)
+            flags_mask |= np.where(fired, np.int64(bit), np.int64(0))
+        return score, flags_mask
+
+
+@lru_cache(maxsize=8)
+def compile_rules(weights_spec: str = "") -> RuleEngine:
+    """Compile the default rule table with weight overrides (cached per override string)."""
+    return RuleEngine(RULES, parse_weights(weights_spec))
@@ -0,0 +1,71 @@
+"""In-process TTL + LRU cache of authenticated user sessions."""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config import settings
+
+
+class SessionCache:
+    """
+    Caches session rows by session token so authenticated requests skip the database.
+    
+    An entry is served until the earlier of its TTL and the session's own
+    expires_at. Only valid sessions are cached; unknown tokens always fall
+    through to the database.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, session_token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached session, or None on a miss (counted)."""
+        with self._lock:
+            entry = self._entries.get(session_token)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(session_token)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[session_token]
+            self.misses += 1
+            return None
+    
+    def put(self, session_token: str, session: Dict[str, Any], expires_at: datetime):
+        """Cache a session loaded from the database (expires_at is naive UTC, like the model)."""
+        now = self.clock()
+        cached_until = now + min(self.ttl, (expires_at - datetime.utcnow()).total_seconds())
+        if cached_until <= now or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[session_token] = (cached_until, session)
+            self._entries.move_to_end(session_token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, session_token: str):
+        """Forget a session (logout)."""
+        with self._lock:
+            self._entries.pop(session_token, None)
+    
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+session_cache = SessionCache(settings.session_cache_size, settings.session_cache_ttl_seconds)
@@ -0,0 +1,134 @@
+"""Dashboard statistics: one aggregate query plus incrementally maintained counters."""
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+from app.models import Follower, FollowerStats, UnfollowRecord
+
+logger = logging.getLogger(__name__)
+
+
+def _today() -> datetime:
+    return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _counters(db: Session, owner_id: str) -> Optional[FollowerStats]:
+    return db.query(FollowerStats).filter(FollowerStats.owner_id == owner_id).first()
+
+
+def aggregate_stats(db: Session, owner_id: str) -> Dict[str, int]:
+    """Compute all dashboard counts for one account in a single conditional-aggregate query."""
+    unfollowed_today = (
+        select(func.count(UnfollowRecord.id))
+        .where(UnfollowRecord.owner_id == owner_id, UnfollowRecord.unfollowed_at >= _today())
+        .scalar_subquery()
+    )
+    row = db.execute(select(
+        func.count(Follower.id),
+        func.coalesce(func.sum(case((Follower.is_bot == True, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Follower.is_inactive == True, 1), else_=0)), 0),
+        unfollowed_today
+    ).where(Follower.owner_id == owner_id)).one()
+    return {
+        "total_followers": row[0],
+        "bots": row[1],
+        "inactive": row[2],
+        "unfollowed_today": row[3]
+    }
+
+
+def refresh_stats(db: Session, owner_id: str) -> Dict[str, int]:
+    """Recompute an account's counters from the tables and store them (without committing)."""
+    db.flush()
+    counts = aggregate_stats(db, owner_id)
+    stats = _counters(db, owner_id)
+    if stats is None:
+        stats = FollowerStats(owner_id=owner_id)
+        db.add(stats)
+    stats.total_followers = counts["total_followers"]
+    stats.bots = counts["bots"]
+    stats.inactive = counts["inactive"]
+    stats.unfollowed_today = counts["unfollowed_today"]
+    stats.unfollowed_on = _today()
+    db.flush()
+    return counts
+
+
+def get_stats(db: Session, owner_id: str) -> Dict[str, int]:
+    """
+    Return an account's dashboard counters.
+    
+    Reads the materialized counters row (a unique-key lookup); the
+    aggregate query only runs the first time, to create that row.
+    """
+    stats = _counters(db, owner_id)
+    if stats is None:
+        counts = refresh_stats(db, owner_id)
+        db.commit()
+        return counts
+    return {
+        "total_followers": stats.total_followers,
+        "bots": stats.bots,
+        "inactive": stats.inactive,
+        # The counter belongs to the day of the last unfollow; a new day starts at zero
+        "unfollowed_today": stats.unfollowed_today if stats.unfollowed_on == _today() else 0
+    }
+
+
+def _apply(db: Session, owner_id: str, values: Dict[str, Any]):
+    """Apply an in-place counter update, creating the row from the tables if it is missing."""
+    result = db.execute(
+        update(FollowerStats).where(FollowerStats.owner_id == owner_id).values(**values),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
+        refresh_stats(db, owner_id)
+    else:
+        # Drop any stale copy of the row held by this session
+        for obj in list(db.identity_map.values()):
+            if isinstance(obj, FollowerStats) and obj.owner_id == owner_id:
+                db.expire(obj)
+
+
+def record_analyzed(db: Session, owner_id: str, analyzed: Iterable[Dict[str, Any]]):
+    """
+    Update an account's follower counters for a batch of freshly scored followers.
+    
+    Each follower must carry `stored_state` from select_changed: None for a
+    new follower, otherwise its StoredState before this analysis.
+    Must run after the batch is written, in the same transaction.
+    """
+    latest = {f["twitter_id"]: f for f in analyzed}
+    total = bots = inactive = 0
+    for follower in latest.values():
+        previous = follower.get("stored_state")
+        was_bot = was_inactive = False
+        if previous is None:
+            total += 1
+        else:
+            was_bot, was_inactive = previous.is_bot, previous.is_inactive
+        bots += int(bool(follower["is_bot"])) - int(bool(was_bot))
+        inactive += int(bool(follower["is_inactive"])) - int(bool(was_inactive))
+    if total or bots or inactive:
+        _apply(db, owner_id, {
+            "total_followers": FollowerStats.total_followers + total,
+            "bots": FollowerStats.bots + bots,
+            "inactive": FollowerStats.inactive + inactive,
+            "updated_at": datetime.utcnow()
+        })
+
+
+def record_unfollows(db: Session, owner_id: str, count: int, when: Optional[datetime] = None):
+    """Add `count` unfollows to an account's counter for today (same transaction as the UnfollowRecords)."""
+    if count <= 0:
+        return
+    day = (when or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    _apply(db, owner_id, {
+        "unfollowed_today": case(
+            (FollowerStats.unfollowed_on == day, FollowerStats.unfollowed_today + count),
+            else_=count
+        ),
+        "unfollowed_on": day,
+        "updated_at": datetime.utcnow()
+    })
@@ -1,16 +1,90 @@
 """Twitter API client wrapper."""
+import json
 import time
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional, Dict, Any
+from datetime import datetime, timezone
 import tweepy
 from tweepy import API, OAuthHandler, Cursor
-from tweepy.errors import TweepyException, TooManyRequests, Unauthorized
+from tweepy.parsers import Parser
+from tweepy.errors import TweepyException, HTTPException, TooManyRequests, TwitterServerError, Unauthorized
 from app.config import settings
+from app.rate_limiter import scheduler, endpoint_from_url
+from app.records import FollowerRecord
 
 logger = logging.getLogger(__name__)
 
 
+TWITTER_DATETIME_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+MONTHS = {month: i for i, month in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1
+)}
+
+
+def parse_twitter_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a v1.1 timestamp (e.g. 'Wed Oct 10 20:19:24 +0000 2018') into naive UTC."""
+    if not value:
+        return None
+    # The API always answers in UTC; slicing that fixed layout is much cheaper than strptime
+    if len(value) == 30 and value[20:25] == "+0000" and value[4:7] in MONTHS:
+        return datetime(int(value[26:30]), MONTHS[value[4:7]], int(value[8:10]),
+                        int(value[11:13]), int(value[14:16]), int(value[17:19]))
+    return to_naive_utc(datetime.strptime(value, TWITTER_DATETIME_FORMAT))
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize an aware datetime (as tweepy models carry) to the naive UTC the app stores."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def user_json_to_record(user: Dict[str, Any]) -> FollowerRecord:
+    """Convert a raw v1.1 user JSON object to the follower record used by the app."""
+    status = user.get("status")
+    return FollowerRecord(
+        twitter_id=user["id_str"],
+        username=user["screen_name"],
+        display_name=user.get("name"),
+        bio=user.get("description") or "",
+        profile_image_url=user.get("profile_image_url_https"),
+        banner_url=user.get("profile_banner_url"),
+        followers_count=user.get("followers_count", 0),
+        following_count=user.get("friends_count", 0),
+        tweet_count=user.get("statuses_count", 0),
+        account_created_at=parse_twitter_datetime(user.get("created_at")),
+        is_verified=user.get("verified", False),
+        is_protected=user.get("protected", False),
+        last_tweet_at=parse_twitter_datetime(status.get("created_at")) if status else None
+    )
+
+
+class FollowerPageParser(Parser):
+    """
+    tweepy parser that decodes a followers/list payload straight into FollowerRecords.
+    
+    The default ModelParser builds a User model (and a Status model for the
+    latest tweet) for every follower, setting every attribute in the payload;
+    here only the fields the analyzer and the Follower table use are read.
+    """
+    
+    def parse(self, payload, *, return_cursors=False, **kwargs):
+        try:
+            data = json.loads(payload)
+            followers = [user_json_to_record(user) for user in data["users"]]
+        except (ValueError, KeyError, TypeError) as e:
+            raise TweepyException(f"Unable to parse followers/list payload: {e}") from None
+        if return_cursors:
+            return followers, (data.get("previous_cursor", 0), data.get("next_cursor", 0))
+        return followers
+
+
+class FollowerPage(NamedTuple):
+    """One page of followers and the cursor of the page after it (0 when done)."""
+    followers: List[FollowerRecord]
+    next_cursor: int
+
+
 class TwitterClient:
     """Wrapper for Twitter API operations."""
     
@@ -26,15 +100,20 @@ class TwitterClient:
         if self.access_token and self.access_token_secret:
             self.auth.set_access_token(self.access_token, self.access_token_secret)
         
-        # Initialize API
-        self.api = API(self.auth, wait_on_rate_limit=True, retry_count=3, retry_delay=5)
+        # Initialize API; rate limits are paced by the shared scheduler, so tweepy
+        # only retries server errors and never sleeps on 429 itself
+        self.api = API(self.auth, wait_on_rate_limit=False, retry_count=3, retry_delay=5,
+                       retry_errors={500, 502, 503, 504})
+        self.api.session.hooks["response"].append(self._record_rate_limit)
         
-        # Rate limit tracking
+        # Rate limit tracking (filled from x-rate-limit-* response headers)
+        self.rate_limit_key = self.access_token or "app"
         self.rate_limit_status = {}
     
     def verify_credentials(self) -> Optional[Dict[str, Any]]:
         """Verify API credentials and return user info."""
         try:
+            scheduler.acquire(self.rate_limit_key, "account/verify_credentials")
             user = self.api.verify_credentials()
             return {
                 "id": user.id_str,
@@ -50,7 +129,7 @@ class TwitterClient:
             logger.error(f"Error verifying credentials: {e}")
             return None
     
-    def get_followers(self, user_id: Optional[str] = None, count: int = 200) -> List[Dict[str, Any]]:
+    def get_followers(self, user_id: Optional[str] = None, count: int = 200) -> List[FollowerRecord]:
         """
         Fetch all followers for the authenticated user.
         
@@ -59,39 +138,80 @@ class TwitterClient:
             count: Number of followers per page (max 200)
         
         Returns:
-            List of follower dictionaries
+            List of follower records
         """
         followers = []
-        try:
-            for page in Cursor(self.api.get_followers, 
-                             user_id=user_id,
-                             count=count,
-                             skip_status=False,
-                             include_user_entities=True).pages():
-                for user in page:
-                    follower_data = self._user_to_dict(user)
-                    followers.append(follower_data)
-                
-                # Small delay to avoid rate limits
-                time.sleep(1)
-                
-                logger.info(f"Fetched {len(followers)} followers so far...")
-            
-            logger.info(f"Total followers fetched: {len(followers)}")
-            return followers
+        for page in self.iter_follower_pages(user_id, count):
+            followers.extend(page.followers)
+        
+        logger.info(f"Total followers fetched: {len(followers)}")
+        return followers
+    
+    def iter_follower_pages(self, user_id: Optional[str] = None, count: int = 200,
+                            cursor: int = -1, raw_json: Optional[bool] = None) -> Iterator[FollowerPage]:
+        """
+        Yield followers one Cursor page at a time.
+        
+        Only the current page is held in memory, so callers can analyze and
+        persist each page before the next one is requested. Rate limits and
+        transient errors retry the current cursor instead of restarting the crawl.
+        
+        Args:
+            user_id: Twitter user ID (None for authenticated user)
+            count: Number of followers per page (max 200)
+            cursor: Cursor to start from (-1 for the first page, or a saved next_cursor)
+            raw_json: Decode the JSON payload directly into records instead of through
+                tweepy User models (defaults to settings.raw_json_followers)
+        
+        Yields:
+            FollowerPage with the page's followers and the cursor of the following page
+        """
+        raw_json = settings.raw_json_followers if raw_json is None else raw_json
+        options = {"parser": FollowerPageParser()} if raw_json else {}
+        pages = Cursor(self.api.get_followers,
+                       user_id=user_id,
+                       count=count,
+                       skip_status=False,
+                       include_user_entities=True,
+                       cursor=cursor,
+                       **options).pages()
+        fetched = 0
+        failures = 0
+        while True:
+            try:
+                scheduler.acquire(self.rate_limit_key, "followers/list")
+                page = next(pages)
+            except StopIteration:
+                break
+            except TooManyRequests:
+                # The cursor position is kept, so the same page is retried once the window resets
+                logger.warning("Rate limit exceeded. Waiting for the window to reset...")
+                continue
+            except TweepyException as e:
+                # Server errors and dropped connections are retried; client errors are not
+                if isinstance(e, HTTPException) and not isinstance(e, TwitterServerError):
+                    logger.error(f"Error fetching followers: {e}")
+                    raise
+                failures += 1
+                if failures > settings.crawl_max_retries:
+                    logger.error(f"Error fetching followers, giving up at cursor {pages.next_cursor}: {e}")
+                    raise
+                delay = min(5 * 2 ** (failures - 1), 300)
+                logger.warning(f"Error fetching followers ({e}), retrying in {delay}s...")
+                time.sleep(delay)
+                continue
             
-        except TooManyRequests:
-            logger.warning("Rate limit exceeded. Waiting...")
-            time.sleep(900)  # Wait 15 minutes
-            return self.get_followers(user_id, count)
-        except Exception as e:
-            logger.error(f"Error fetching followers: {e}")
-            raise
+            failures = 0
+            followers = page if raw_json else [self._user_to_record(user) for user in page]
+            fetched += len(followers)
+            logger.info(f"Fetched {fetched} followers so far...")
+            yield FollowerPage(followers, pages.next_cursor)
     
     def get_user_timeline(self, user_id: str, count: int = 200) -> List[Dict[str, Any]]:
         """Get user's recent tweets."""
         try:
             tweets = []
+            scheduler.acquire(self.rate_limit_key, "statuses/user_timeline")
             for tweet in Cursor(self.api.user_timeline, 
                               user_id=user_id,
                               count=min(count, 200),
@@ -119,6 +239,7 @@ class TwitterClient:
             True if successful, False otherwise
         """
         try:
+            scheduler.acquire(self.rate_limit_key, "friendships/destroy")
             self.api.destroy_friendship(user_id=user_id)
             logger.info(f"Successfully unfollowed user {user_id}")
             return True
@@ -140,6 +261,7 @@ class TwitterClient:
             True if successful, False otherwise
         """
         try:
+            scheduler.acquire(self.rate_limit_key, "friendships/create")
             self.api.create_friendship(user_id=user_id)
             logger.info(f"Successfully followed user {user_id}")
             return True
@@ -150,26 +272,38 @@ class TwitterClient:
     def get_rate_limit_status(self) -> Dict[str, Any]:
         """Get current rate limit status."""
         try:
+            scheduler.acquire(self.rate_limit_key, "application/rate_limit_status")
             return self.api.get_rate_limit_status()
         except Exception as e:
             logger.error(f"Error getting rate limit status: {e}")
             return {}
     
-    def _user_to_dict(self, user) -> Dict[str, Any]:
-        """Convert tweepy User object to dictionary."""
-        return {
-            "twitter_id": user.id_str,
-            "username": user.screen_name,
-            "display_name": user.name,
-            "bio": user.description or "",
-            "profile_image_url": user.profile_image_url_https if hasattr(user, 'profile_image_url_https') else None,
-            "banner_url": user.profile_banner_url if hasattr(user, 'profile_banner_url') else None,
-            "followers_count": user.followers_count,
-            "following_count": user.friends_count,
-            "tweet_count": user.statuses_count,
-            "account_created_at": user.created_at,
-            "is_verified": user.verified if hasattr(user, 'verified') else False,
-            "is_protected": user.protected if hasattr(user, 'protected') else False,
-            "last_tweet_at": user.status.created_at if hasattr(user, 'status') and user.status else None
-        }
+    def _record_rate_limit(self, response, *args, **kwargs):
+        """requests response hook: feed rate-limit headers to the scheduler."""
+        endpoint = endpoint_from_url(response.url)
+        scheduler.record_response(self.rate_limit_key, endpoint, response.status_code, response.headers)
+        if "x-rate-limit-remaining" in response.headers:
+            self.rate_limit_status[endpoint] = {
+                "limit": response.headers.get("x-rate-limit-limit"),
+                "remaining": response.headers.get("x-rate-limit-remaining"),
+                "reset": response.headers.get("x-rate-limit-reset")
+            }
+    
+    def _user_to_record(self, user) -> FollowerRecord:
+        """Convert tweepy User object to a follower record."""
+        return FollowerRecord(
+            twitter_id=user.id_str,
+            username=user.screen_name,
+            display_name=user.name,
+            bio=user.description or "",
+            profile_image_url=user.profile_image_url_https if hasattr(user, 'profile_image_url_https') else None,
+            banner_url=user.profile_banner_url if hasattr(user, 'profile_banner_url') else None,
+            followers_count=user.followers_count,
+            following_count=user.friends_count,
+            tweet_count=user.statuses_count,
+            account_created_at=to_naive_utc(user.created_at),
+            is_verified=user.verified if hasattr(user, 'verified') else False,
+            is_protected=user.protected if hasattr(user, 'protected') else False,
+            last_tweet_at=to_naive_utc(user.status.created_at) if hasattr(user, 'status') and user.status else None
+        )
 
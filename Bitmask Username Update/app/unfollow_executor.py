@@ -0,0 +1,107 @@
+"""Batched, concurrent unfollow executor with per-item results."""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app import stats
+from app.async_twitter_client import AsyncTwitterClient, TwitterRateLimitError
+from app.config import settings
+from app.models import Follower, UnfollowRecord
+
+logger = logging.getLogger(__name__)
+
+
+async def execute_unfollows(
+    db: Session,
+    owner_id: str,
+    client: AsyncTwitterClient,
+    user_ids: List[Any],
+    reason: str = "manual",
+    concurrency: Optional[int] = None,
+    commit_batch_size: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Unfollow users concurrently and yield each result as it finishes.
+    
+    All IDs are resolved with a single IN query. Unfollows are dispatched up
+    to `concurrency` at a time and paced by the client's rate-limit scheduler.
+    UnfollowRecords are committed every `commit_batch_size` successes, so a
+    crash loses at most one batch. After a 429 no new unfollows are started
+    and the remaining items are reported as rate limited. If the consumer
+    stops early, queued unfollows are skipped and in-flight ones are still
+    recorded.
+    
+    Args:
+        db: Database session
+        owner_id: twitter_user_id of the unfollowing account
+        client: Async Twitter client for the current user
+        user_ids: Twitter IDs to unfollow
+        reason: Reason stored on each UnfollowRecord
+        concurrency: Maximum unfollows in flight (defaults to settings)
+        commit_batch_size: Records per commit (defaults to settings)
+    
+    Yields:
+        {"user_id", "success", "error"?} per requested ID
+    """
+    concurrency = concurrency or settings.unfollow_concurrency
+    commit_batch_size = commit_batch_size or settings.unfollow_commit_batch_size
+    
+    ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+    follower_ids = dict(db.query(Follower.twitter_id, Follower.id).filter(
+        Follower.owner_id == owner_id, Follower.twitter_id.in_(ids)
+    ).all())
+    
+    for user_id in ids:
+        if user_id not in follower_ids:
+            yield {"user_id": user_id, "success": False, "error": "Not found"}
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limited = asyncio.Event()
+    stopped = asyncio.Event()
+    
+    async def unfollow(user_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            if rate_limited.is_set():
+                return {"user_id": user_id, "success": False, "error": "Rate limited"}
+            if stopped.is_set():
+                return {"user_id": user_id, "success": False, "error": "Cancelled"}
+            try:
+                if await client.unfollow_user(user_id):
+                    return {"user_id": user_id, "success": True}
+                return {"user_id": user_id, "success": False, "error": "Failed to unfollow"}
+            except TwitterRateLimitError:
+                rate_limited.set()
+                return {"user_id": user_id, "success": False, "error": "Rate limited"}
+    
+    def record(result: Dict[str, Any]):
+        reported.add(result["user_id"])
+        if result["success"]:
+            pending.append(UnfollowRecord(
+                owner_id=owner_id,
+                follower_id=follower_ids[result["user_id"]],
+                reason=reason,
+                can_undo=True
+            ))
+    
+    tasks = [asyncio.create_task(unfollow(user_id)) for user_id in ids if user_id in follower_ids]
+    pending: List[UnfollowRecord] = []
+    reported = set()
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            record(result)
+            if len(pending) >= commit_batch_size:
+                db.add_all(pending)
+                stats.record_unfollows(db, owner_id, len(pending))
+                db.commit()
+                pending = []
+            yield result
+    finally:
+        stopped.set()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, dict) and result["user_id"] not in reported:
+                record(result)
+        if pending:
+            db.add_all(pending)
+            stats.record_unfollows(db, owner_id, len(pending))
+            db.commit()
@@ -0,0 +1,75 @@
+"""Benchmark parallel follower scoring.
+
+Usage:
+    python -m benchmarks.bench_analyze [--size 200000] [--workers 1,2,4,8,16] [--repeat 3]
+
+Scores the same synthetic batch with the columnar engine in-process and
+across a process pool of each size, reporting followers/sec and the
+speedup over the first pool size. Pools are warmed up before timing, so the
+figures exclude process start-up.
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+from app.analyzer import FollowerAnalyzer
+from app import parallel
+
+
+def synthetic_followers(count: int):
+    """Generate unanalyzed follower dictionaries covering every rule."""
+    now = datetime.utcnow()
+    for i in range(count):
+        yield {
+            "twitter_id": str(10_000_000 + i),
+            "username": f"user{i}" if i % 3 else f"{i}x",
+            "display_name": f"User {i}",
+            "bio": "Synthetic follower for benchmarking" if i % 4 else "",
+            "profile_image_url": "https://pbs.twimg.com/profile_images/custom.jpg" if i % 5 else "default_profile",
+            "banner_url": None if i % 2 else "https://pbs.twimg.com/profile_banners/1/1500",
+            "followers_count": i % 5000,
+            "following_count": (i * 7) % 6000,
+            "tweet_count": (i * 13) % 20000,
+            "account_created_at": now - timedelta(days=i % 3000),
+            "last_tweet_at": now - timedelta(days=i % 400) if i % 6 else None,
+            "is_verified": False,
+            "is_protected": False
+        }
+
+
+def best_rate(score, followers, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        score(followers)
+        best = min(best, time.perf_counter() - start)
+    return len(followers) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--workers", default="1,2,4,8,16")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    analyzer = FollowerAnalyzer()
+    followers = list(synthetic_followers(args.size))
+    context = analyzer.context()
+    print(f"{args.size:,} followers, {os.cpu_count()} CPUs")
+    
+    baseline = None
+    try:
+        for workers in (int(w) for w in args.workers.split(",")):
+            score = lambda batch: parallel.parallel_score(analyzer, batch, context, workers=workers, min_shard_size=1)
+            if workers > 1:
+                score(followers[:workers])  # start the pool's processes
+            rate = best_rate(score, followers, args.repeat)
+            baseline = baseline or rate
+            print(f"{workers:>3} workers  {rate:>12,.0f} followers/s  {rate / baseline:>5.2f}x")
+    finally:
+        parallel.shutdown()
+
+
+if __name__ == "__main__":
+    main()
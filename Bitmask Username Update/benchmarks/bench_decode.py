@@ -0,0 +1,69 @@
+"""Benchmark follower page decoding: tweepy models vs raw JSON.
+
+Usage:
+    python -m benchmarks.bench_decode [--repeat 50] [--fixtures benchmarks/fixtures/followers_list_*.json]
+
+Decodes followers/list response payloads in the v1.1 format (the fixture
+pages, 100 full user objects each) the way TwitterClient.iter_follower_pages
+does in both modes: tweepy's ModelParser into User/Status models followed by
+_user_to_record, and FollowerPageParser straight into FollowerRecords.
+Reports followers/sec for each and checks that both produce the same records.
+"""
+import argparse
+import glob
+import os
+import time
+from app.twitter_client import FollowerPageParser, TwitterClient
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "followers_list_*.json")
+
+
+def decode_models(client, payload):
+    users, cursors = client.api.parser.parse(
+        payload, api=client.api, payload_list=True, payload_type="user", return_cursors=True
+    )
+    return [client._user_to_record(user) for user in users], cursors
+
+
+def decode_raw(parser, payload):
+    return parser.parse(payload, return_cursors=True)
+
+
+def rate(decode, payloads, repeat):
+    followers = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            followers += len(decode(payload)[0])
+    return followers / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--fixtures", default=FIXTURES)
+    args = parser.parse_args()
+    
+    payloads = []
+    for path in sorted(glob.glob(args.fixtures)):
+        with open(path) as f:
+            payloads.append(f.read())
+    if not payloads:
+        parser.error(f"no fixture pages match {args.fixtures}")
+    
+    client = TwitterClient(access_token="token", access_token_secret="secret")
+    page_parser = FollowerPageParser()
+    models = lambda payload: decode_models(client, payload)
+    raw = lambda payload: decode_raw(page_parser, payload)
+    for payload in payloads:
+        assert models(payload)[0] == raw(payload)[0], "decoders disagree"
+    
+    models_rate = rate(models, payloads, args.repeat)
+    raw_rate = rate(raw, payloads, args.repeat)
+    print(f"{len(payloads)} fixture pages x {args.repeat}")
+    print(f"tweepy models + _user_to_record  {models_rate:>10,.0f} followers/s")
+    print(f"raw JSON -> FollowerRecord       {raw_rate:>10,.0f} followers/s  {raw_rate / models_rate:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
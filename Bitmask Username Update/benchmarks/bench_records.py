@@ -0,0 +1,116 @@
+"""Benchmark peak memory of follower dictionaries vs FollowerRecords.
+
+Usage:
+    python -m benchmarks.bench_records [--sizes 10000,100000]
+
+Decodes raw v1.1 user objects and scores them with the columnar engine,
+holding every follower at once as a full crawl via get_followers does.
+The legacy path builds a dict per user and a second merged dict of
+profile and analysis fields, as batch_analyze used to; the record path
+decodes into FollowerRecords and fills in their analysis slots in place.
+Peak memory is measured with tracemalloc, excluding the raw JSON input
+(timings are taken under tracemalloc and only comparable to each other).
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from app.analyzer import FollowerAnalyzer, mask_to_flags
+from app.twitter_client import parse_twitter_datetime, user_json_to_record
+
+
+def raw_users(count: int):
+    """Raw v1.1 user objects as decoded from followers/list."""
+    return [
+        {
+            "id_str": str(10_000_000 + i),
+            "screen_name": f"user{i}",
+            "name": f"User {i}",
+            "description": "Synthetic follower for benchmarking" if i % 4 else "",
+            "profile_image_url_https": "https://pbs.twimg.com/profile_images/custom.jpg",
+            "profile_banner_url": None if i % 2 else "https://pbs.twimg.com/profile_banners/1/1500",
+            "followers_count": i % 5000,
+            "friends_count": (i * 7) % 6000,
+            "statuses_count": (i * 13) % 20000,
+            "created_at": "Wed Oct 10 20:19:24 +0000 2018",
+            "verified": False,
+            "protected": False,
+            "status": {"created_at": "Mon Jan 01 12:00:00 +0000 2024"} if i % 6 else None
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_user_json_to_dict(user):
+    """Follower dictionary as the client used to build it."""
+    status = user.get("status")
+    return {
+        "twitter_id": user["id_str"],
+        "username": user["screen_name"],
+        "display_name": user.get("name"),
+        "bio": user.get("description") or "",
+        "profile_image_url": user.get("profile_image_url_https"),
+        "banner_url": user.get("profile_banner_url"),
+        "followers_count": user.get("followers_count", 0),
+        "following_count": user.get("friends_count", 0),
+        "tweet_count": user.get("statuses_count", 0),
+        "account_created_at": parse_twitter_datetime(user.get("created_at")),
+        "is_verified": user.get("verified", False),
+        "is_protected": user.get("protected", False),
+        "last_tweet_at": parse_twitter_datetime(status.get("created_at")) if status else None
+    }
+
+
+def legacy(analyzer, users):
+    followers = [legacy_user_json_to_dict(user) for user in users]
+    context = analyzer.context()
+    scores = analyzer.batch_score(followers, context=context, workers=1)
+    return [
+        {
+            **follower,
+            "bot_score": float(scores.bot_score[i]),
+            "is_bot": bool(scores.is_bot[i]),
+            "is_inactive": bool(scores.is_inactive[i]),
+            "flags": mask_to_flags(int(scores.flags_mask[i])),
+            "flags_mask": int(scores.flags_mask[i]),
+            "analysis_date": context.now
+        }
+        for i, follower in enumerate(followers)
+    ]
+
+
+def records(analyzer, users):
+    return analyzer.batch_analyze([user_json_to_record(user) for user in users], workers=1)
+
+
+def measure(path, analyzer, users):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = path(analyzer, users)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+
+    analyzer = FollowerAnalyzer()
+    for size in (int(s) for s in args.sizes.split(",")):
+        users = raw_users(size)
+        legacy_peak, legacy_time = measure(legacy, analyzer, users)
+        record_peak, record_time = measure(records, analyzer, users)
+        print(
+            f"{size:>9,} followers  dicts {legacy_peak / 2**20:>8.1f} MiB ({legacy_time:.2f}s)"
+            f"  records {record_peak / 2**20:>8.1f} MiB ({record_time:.2f}s)"
+            f"  {record_peak / legacy_peak:>5.0%} of dict peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark bulk follower upserts.
+
+Usage:
+    python -m benchmarks.bench_upsert [--sizes 10000,100000,1000000] [--database-url URL]
+
+Each size is inserted into an empty table and then upserted a second time
+(every row conflicts), reporting rows/sec for both passes. The legacy
+per-row SELECT path is timed for sizes up to --legacy-max for comparison.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Follower, upsert_followers
+
+OWNER_ID = "1"
+
+
+def synthetic_followers(count: int, offset: int = 0):
+    """Generate analyzed follower rows."""
+    now = datetime.utcnow()
+    for i in range(offset, offset + count):
+        yield {
+            "twitter_id": str(10_000_000 + i),
+            "username": f"user{i}",
+            "display_name": f"User {i}",
+            "bio": "Synthetic follower for benchmarking",
+            "profile_image_url": "https://pbs.twimg.com/profile_images/custom.jpg",
+            "banner_url": None,
+            "followers_count": i % 5000,
+            "following_count": (i * 7) % 3000,
+            "tweet_count": (i * 13) % 20000,
+            "account_created_at": now - timedelta(days=i % 3000),
+            "last_tweet_at": now - timedelta(days=i % 400),
+            "is_verified": False,
+            "is_protected": False,
+            "bot_score": float(i % 100),
+            "is_bot": i % 100 >= 60,
+            "is_inactive": i % 400 > 180,
+            "analysis_date": now
+        }
+
+
+def legacy_save(db, rows):
+    """Per-row SELECT then insert/update, as the analyze route used to do."""
+    for follower_data in rows:
+        existing = db.query(Follower).filter(Follower.twitter_id == follower_data["twitter_id"]).first()
+        if existing:
+            for key, value in follower_data.items():
+                setattr(existing, key, value)
+            existing.updated_at = datetime.utcnow()
+        else:
+            db.add(Follower(owner_id=OWNER_ID, **follower_data))
+
+
+def timed(session_factory, save, size, page_size):
+    db = session_factory()
+    start = time.perf_counter()
+    for offset in range(0, size, page_size):
+        save(db, list(synthetic_followers(min(page_size, size - offset), offset)))
+        db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return size / elapsed
+
+
+def run(database_url, size, page_size, batch_size, legacy):
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    bulk = lambda db, rows: upsert_followers(db, OWNER_ID, rows, batch_size=batch_size)
+    insert_rate = timed(session_factory, bulk, size, page_size)
+    update_rate = timed(session_factory, bulk, size, page_size)
+    line = f"{size:>9,} rows  bulk insert {insert_rate:>10,.0f} rows/s  bulk update {update_rate:>10,.0f} rows/s"
+
+    if legacy:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        legacy_insert = timed(session_factory, legacy_save, size, page_size)
+        legacy_update = timed(session_factory, legacy_save, size, page_size)
+        line += f"  legacy insert {legacy_insert:>8,.0f} rows/s  legacy update {legacy_update:>8,.0f} rows/s"
+    print(line)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--page-size", type=int, default=200, help="rows per commit (one follower page)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--legacy-max", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        for size in (int(s) for s in args.sizes.split(",")):
+            run(database_url, size, args.page_size, args.batch_size, size <= args.legacy_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Microbenchmark username classification.
+
+Usage:
+    python -m benchmarks.bench_username [--count 3000000] [--distinct 500000]
+
+Times the per-call cost of the original two-regex username check, the
+single-pass classifier without its memo, and the memoized classifier, over
+`--count` synthetic handles drawn from `--distinct` unique ones (handles
+recur across runs and managed accounts, which is what the memo exploits).
+"""
+import argparse
+import random
+import re
+import string
+import time
+from app.rules import classify_username
+
+
+def legacy_analyze_username(username):
+    """The username check as FollowerAnalyzer._analyze_username used to run it."""
+    score = 0.0
+    flags = []
+    if not username:
+        return score, flags
+    if re.match(r'^[a-z]+\d{4,}', username.lower()) or re.match(r'^\d+[a-z]+', username.lower()):
+        score += 10.0
+        flags.append("suspicious_username_pattern")
+    digit_count = sum(c.isdigit() for c in username)
+    if len(username) > 0 and digit_count / len(username) > 0.5:
+        score += 8.0
+        flags.append("username_too_many_numbers")
+    if len(username) < 4:
+        score += 5.0
+        flags.append("very_short_username")
+    return score, flags
+
+
+def synthetic_handles(count, distinct, seed=1):
+    """A stream of `count` handles sampled from `distinct` unique ones."""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + "_"
+    pool = []
+    for i in range(distinct):
+        kind = i % 4
+        if kind == 0:
+            handle = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) + str(rng.randint(1000, 99999999))
+        elif kind == 1:
+            handle = str(rng.randint(1, 9999)) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        else:
+            handle = "".join(rng.choices(alphabet, k=rng.randint(2, 15)))
+        pool.append(handle)
+    return [pool[rng.randrange(distinct)] for _ in range(count)]
+
+
+def per_call_ns(classify, handles):
+    start = time.perf_counter()
+    for handle in handles:
+        classify(handle)
+    return (time.perf_counter() - start) / len(handles) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=3_000_000)
+    parser.add_argument("--distinct", type=int, default=500_000)
+    args = parser.parse_args()
+
+    handles = synthetic_handles(args.count, args.distinct)
+    print(f"{args.count:,} handles, {args.distinct:,} distinct, memo size {classify_username.cache_info().maxsize:,}")
+
+    legacy = per_call_ns(legacy_analyze_username, handles)
+    print(f"legacy two-regex check   {legacy:>7.0f} ns/call")
+    uncached = per_call_ns(classify_username.__wrapped__, handles)
+    print(f"single-pass, no memo     {uncached:>7.0f} ns/call  {legacy / uncached:>5.2f}x")
+    classify_username.cache_clear()
+    cached = per_call_ns(classify_username, handles)
+    info = classify_username.cache_info()
+    hit_rate = info.hits / max(info.hits + info.misses, 1)
+    print(f"single-pass, memoized    {cached:>7.0f} ns/call  {legacy / cached:>5.2f}x  ({hit_rate:.0%} hits)")
+
+
+if __name__ == "__main__":
+    main()
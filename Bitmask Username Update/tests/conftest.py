@@ -0,0 +1,54 @@
+"""Shared test fixtures."""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base
+from app.twitter_client import FollowerPage
+
+NOW = datetime.utcnow()
+
+
+def make_follower(i, **overrides):
+    """An active, ordinary-looking follower dictionary."""
+    follower = {
+        "twitter_id": str(i),
+        "username": f"user{i}",
+        "bio": "Writes about things",
+        "followers_count": 100,
+        "following_count": 80,
+        "tweet_count": 250,
+        "account_created_at": NOW - timedelta(days=500),
+        "last_tweet_at": NOW - timedelta(days=2)
+    }
+    follower.update(overrides)
+    return follower
+
+
+def make_page(start, size, next_cursor=0):
+    """A page of followers start..start+size-1 with distinct follower counts."""
+    return FollowerPage([make_follower(i, followers_count=100 + i) for i in range(start, start + size)], next_cursor)
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory bound to a fresh in-memory SQLite database."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(session_factory):
+    """Session on the in-memory test database."""
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
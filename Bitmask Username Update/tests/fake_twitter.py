@@ -0,0 +1,125 @@
+"""Local fake of the Twitter v1.1 HTTP API for client tests."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_user(i, **overrides):
+    """Raw v1.1 user object."""
+    user = {
+        "id_str": str(i),
+        "screen_name": f"user{i}",
+        "name": f"User {i}",
+        "description": "Fake follower",
+        "profile_image_url_https": "https://pbs.twimg.com/profile_images/custom.jpg",
+        "followers_count": 100 + i,
+        "friends_count": 50,
+        "statuses_count": 10,
+        "created_at": "Wed Oct 10 20:19:24 +0000 2018",
+        "verified": False,
+        "protected": False,
+        "status": {"created_at": "Mon Jan 01 12:00:00 +0000 2024"}
+    }
+    user.update(overrides)
+    return user
+
+
+class FakeTwitter:
+    """
+    Serves followers/list, statuses/user_timeline, friendships and
+    verify_credentials from in-memory data, recording every request.
+    """
+    
+    def __init__(self, followers=None, page_size=2, timelines=None):
+        self.followers = followers if followers is not None else [make_user(i) for i in range(5)]
+        self.page_size = page_size
+        self.timelines = timelines or {}
+        self.requests = []
+        self.connections = set()
+        self.unfollowed = []
+        self.fail_user_ids = set()
+        self.rate_limited = 0
+        self.delay = 0.0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/1.1"
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def _handler(self):
+        fake = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                self._dispatch("GET")
+            
+            def do_POST(self):
+                self._dispatch("POST")
+            
+            def _dispatch(self, method):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with fake._lock:
+                    fake.requests.append((method, url.path, params, self.headers.get("Authorization", "")))
+                    fake.connections.add(self.client_address)
+                if fake.delay:
+                    time.sleep(fake.delay)
+                if "OAuth " not in self.headers.get("Authorization", ""):
+                    return self._send(401, {"errors": [{"code": 89, "message": "Invalid or expired token."}]})
+                with fake._lock:
+                    if fake.rate_limited:
+                        fake.rate_limited -= 1
+                        return self._send(429, {"errors": [{"code": 88, "message": "Rate limit exceeded"}]},
+                                          {"x-rate-limit-remaining": "0",
+                                           "x-rate-limit-reset": str(int(time.time()))})
+                
+                endpoint = url.path[len("/1.1/"):-len(".json")]
+                if endpoint == "account/verify_credentials":
+                    return self._send(200, make_user(42, screen_name="me"))
+                if endpoint == "followers/list":
+                    cursor = int(params.get("cursor", -1))
+                    start = 0 if cursor == -1 else cursor
+                    end = start + fake.page_size
+                    next_cursor = end if end < len(fake.followers) else 0
+                    return self._send(200, {"users": fake.followers[start:end], "next_cursor": next_cursor,
+                                            "previous_cursor": 0})
+                if endpoint == "statuses/user_timeline":
+                    return self._send(200, fake.timelines.get(params.get("user_id"), []))
+                if endpoint in ("friendships/destroy", "friendships/create"):
+                    if params.get("user_id") in fake.fail_user_ids:
+                        return self._send(404, {"errors": [{"code": 34, "message": "Not found"}]})
+                    with fake._lock:
+                        fake.unfollowed.append(params.get("user_id"))
+                    return self._send(200, make_user(int(params["user_id"])))
+                return self._send(404, {"errors": [{"code": 34, "message": "Not found"}]})
+            
+            def _send(self, status, payload, headers=None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("x-rate-limit-limit", "900")
+                for key, value in (headers or {"x-rate-limit-remaining": "899",
+                                               "x-rate-limit-reset": str(int(time.time()) + 9)}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+        
+        return Handler
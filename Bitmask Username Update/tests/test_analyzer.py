@@ -4,10 +4,17 @@ from datetime import datetime, timedelta
 from app.analyzer import FollowerAnalyzer
 
 
-def test_inactive_account_detection():
-    """Test detection of inactive accounts."""
+@pytest.fixture(params=["scalar", "columnar"])
+def analyze(request):
+    """Score one follower through the per-follower engine or as a single-element columnar batch."""
     analyzer = FollowerAnalyzer()
-    
+    if request.param == "scalar":
+        return analyzer.analyze_follower
+    return lambda follower: analyzer.batch_analyze([follower], vectorized=True, workers=1)[0]
+
+
+def test_inactive_account_detection(analyze):
+    """Test detection of inactive accounts."""
     # Account with no tweets
     follower = {
         "twitter_id": "123",
@@ -17,14 +24,12 @@ def test_inactive_account_detection():
         "account_created_at": datetime.utcnow() - timedelta(days=365)
     }
     
-    result = analyzer.analyze_follower(follower)
+    result = analyze(follower)
     assert result["is_inactive"] == True
 
 
-def test_bot_detection_default_profile():
+def test_bot_detection_default_profile(analyze):
     """Test bot detection for default profile picture."""
-    analyzer = FollowerAnalyzer()
-    
     follower = {
         "twitter_id": "123",
         "username": "testuser",
@@ -36,15 +41,13 @@ def test_bot_detection_default_profile():
         "account_created_at": datetime.utcnow() - timedelta(days=30)
     }
     
-    result = analyzer.analyze_follower(follower)
+    result = analyze(follower)
     assert result["bot_score"] > 60
     assert result["is_bot"] == True
 
 
-def test_bot_detection_low_ratio():
+def test_bot_detection_low_ratio(analyze):
     """Test bot detection for low follower/following ratio."""
-    analyzer = FollowerAnalyzer()
-    
     follower = {
         "twitter_id": "123",
         "username": "testuser",
@@ -54,14 +57,12 @@ def test_bot_detection_low_ratio():
         "account_created_at": datetime.utcnow() - timedelta(days=100)
     }
     
-    result = analyzer.analyze_follower(follower)
+    result = analyze(follower)
     assert result["bot_score"] >= 20  # Should have high score for low ratio
 
 
-def test_legitimate_account():
+def test_legitimate_account(analyze):
     """Test that legitimate accounts are not flagged."""
-    analyzer = FollowerAnalyzer()
-    
     follower = {
         "twitter_id": "123",
         "username": "legituser",
@@ -74,8 +75,87 @@ def test_legitimate_account():
         "account_created_at": datetime.utcnow() - timedelta(days=365)
     }
     
-    result = analyzer.analyze_follower(follower)
+    result = analyze(follower)
     assert result["bot_score"] < 60
     assert result["is_bot"] == False
     assert result["is_inactive"] == False
 
+
+
+def _sample_followers():
+    """Followers covering every heuristic branch."""
+    now = datetime.utcnow()
+    return [
+        {"twitter_id": "1", "username": "testuser", "tweet_count": 0, "followers_count": 50,
+         "account_created_at": now - timedelta(days=365)},
+        {"twitter_id": "2", "username": "testuser",
+         "profile_image_url": "https://abs.twimg.com/sticky/default_profile_images/default_profile_normal.png",
+         "bio": "", "followers_count": 10, "following_count": 5000, "tweet_count": 100,
+         "account_created_at": now - timedelta(days=30)},
+        {"twitter_id": "3", "username": "legituser", "bio": "Real person with real bio",
+         "profile_image_url": "https://pbs.twimg.com/profile_images/custom.jpg",
+         "banner_url": "https://pbs.twimg.com/profile_banners/1/1500",
+         "followers_count": 1000, "following_count": 500, "tweet_count": 500,
+         "last_tweet_at": now - timedelta(days=1), "account_created_at": now - timedelta(days=365)},
+        {"twitter_id": "4", "username": "abc12345", "bio": "hi", "followers_count": 40,
+         "following_count": 6000, "tweet_count": 40000, "account_created_at": now - timedelta(days=10)},
+        {"twitter_id": "5", "username": "9x", "bio": "   ", "followers_count": 150,
+         "following_count": 900, "tweet_count": 30, "account_created_at": now - timedelta(hours=5),
+         "last_tweet_at": now - timedelta(days=400)},
+        {"twitter_id": "6", "username": "", "bio": None, "profile_image_url": None,
+         "followers_count": 2000, "following_count": 0, "tweet_count": 0},
+        {"twitter_id": "7", "username": "123456", "followers_count": 30, "following_count": 200,
+         "tweet_count": 9000, "account_created_at": now - timedelta(days=400)},
+    ]
+
+
+def test_batch_analyze_vectorized_matches_per_follower():
+    """Test that the columnar engine reproduces the per-follower results exactly."""
+    analyzer = FollowerAnalyzer()
+    followers = _sample_followers()
+    
+    expected = analyzer.batch_analyze(followers, vectorized=False)
+    actual = analyzer.batch_analyze(followers, vectorized=True)
+    
+    for exp, act in zip(expected, actual):
+        for key in ("bot_score", "is_bot", "is_inactive", "flags"):
+            assert act[key] == exp[key], (exp["twitter_id"], key)
+
+
+def test_batch_score_flag_masks():
+    """Test that batch flag bitmasks decode to the analyzer's flag lists."""
+    from app.analyzer import flags_to_mask, mask_to_flags
+    analyzer = FollowerAnalyzer()
+    followers = _sample_followers()
+    
+    scores = analyzer.batch_score(followers)
+    
+    for follower, mask in zip(followers, scores.flags_mask):
+        flags = analyzer.analyze_follower(follower)["flags"]
+        assert int(mask) == flags_to_mask(flags)
+        assert mask_to_flags(int(mask)) == flags
+
+
+def test_analysis_context_pins_the_clock():
+    """Test that a fixed context makes results reproducible, with the same cutoffs in both engines."""
+    analyzer = FollowerAnalyzer()
+    now = datetime(2024, 1, 1)
+    context = analyzer.context(now)
+    followers = [
+        # Exactly 30 days old: no longer a new account
+        {"twitter_id": "1", "username": "someone", "tweet_count": 600, "followers_count": 500,
+         "account_created_at": now - timedelta(days=30), "last_tweet_at": now - timedelta(days=1)},
+        # One microsecond younger: still new
+        {"twitter_id": "2", "username": "someone", "tweet_count": 600, "followers_count": 500,
+         "account_created_at": now - timedelta(days=30) + timedelta(microseconds=1),
+         "last_tweet_at": now - analyzer.inactivity_threshold - timedelta(microseconds=1)},
+    ]
+    
+    scalar = analyzer.batch_analyze(followers, vectorized=False, context=context)
+    batch = analyzer.batch_analyze(followers, context=context)
+    
+    assert [r["analysis_date"] for r in scalar + batch] == [now] * 4
+    for results in (scalar, batch):
+        assert "new_account_high_activity" not in results[0]["flags"]
+        assert "new_account_high_activity" in results[1]["flags"]
+        assert [r["is_inactive"] for r in results] == [False, True]
@@ -0,0 +1,90 @@
+"""Tests for the async Twitter client against a local fake API server."""
+import re
+import time
+from datetime import datetime
+import pytest
+from app import async_twitter_client
+from app.async_twitter_client import AsyncTwitterClient, get_async_client
+from app.rate_limiter import RateLimitScheduler
+from tests.fake_twitter import FakeTwitter
+
+
+@pytest.fixture
+def fake_twitter(monkeypatch):
+    monkeypatch.setattr(async_twitter_client, "scheduler", RateLimitScheduler())
+    with FakeTwitter() as fake:
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_get_followers_pages_over_one_pooled_connection(fake_twitter):
+    """Test that all pages are fetched and keep-alive connections are reused."""
+    client = AsyncTwitterClient("token", "secret", base_url=fake_twitter.base_url)
+    
+    followers = await client.get_followers()
+    await async_twitter_client.close_http_pool()
+    
+    assert [f["twitter_id"] for f in followers] == ["0", "1", "2", "3", "4"]
+    assert followers[0]["account_created_at"] == datetime(2018, 10, 10, 20, 19, 24)
+    assert followers[0]["last_tweet_at"] == datetime(2024, 1, 1, 12, 0, 0)
+    assert [p["cursor"] for _, path, p, _ in fake_twitter.requests] == ["-1", "2", "4"]
+    assert all(auth.startswith("OAuth ") for *_, auth in fake_twitter.requests)
+    assert len(fake_twitter.connections) == 1
+    assert client.rate_limit_status["followers/list"]["remaining"] == "899"
+
+
+@pytest.mark.asyncio
+async def test_verify_timeline_and_friendships(fake_twitter):
+    """Test the remaining client methods."""
+    fake_twitter.timelines["7"] = [{"id_str": "1", "created_at": "Mon Jan 01 12:00:00 +0000 2024",
+                                    "full_text": "hello", "retweet_count": 0, "favorite_count": 2}]
+    fake_twitter.fail_user_ids.add("9")
+    client = AsyncTwitterClient("token", "secret", base_url=fake_twitter.base_url)
+    
+    assert (await client.verify_credentials())["username"] == "me"
+    assert (await client.get_user_timeline("7"))[0]["text"] == "hello"
+    assert await client.unfollow_user("7") is True
+    assert await client.unfollow_user("9") is False
+    assert await client.follow_user("7") is True
+    assert fake_twitter.unfollowed == ["7", "7"]
+    await async_twitter_client.close_http_pool()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_page_is_retried(fake_twitter):
+    """Test that a 429 waits for the reset and retries the same cursor."""
+    fake_twitter.rate_limited = 1
+    client = AsyncTwitterClient("token", "secret", base_url=fake_twitter.base_url)
+    
+    followers = await client.get_followers()
+    await async_twitter_client.close_http_pool()
+    
+    assert len(followers) == 5
+    assert [p["cursor"] for _, path, p, _ in fake_twitter.requests] == ["-1", "-1", "2", "4"]
+
+
+@pytest.mark.asyncio
+async def test_request_is_signed_after_waiting_for_the_budget(fake_twitter, monkeypatch):
+    """Test that a request held back by an exhausted window carries a fresh OAuth timestamp."""
+    scheduler = RateLimitScheduler()
+    start = time.time()
+    scheduler.record_response("token", "account/verify_credentials", 200,
+                              {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(start + 1.5)})
+    monkeypatch.setattr(async_twitter_client, "scheduler", scheduler)
+    client = AsyncTwitterClient("token", "secret", base_url=fake_twitter.base_url)
+    
+    assert (await client.verify_credentials())["username"] == "me"
+    await async_twitter_client.close_http_pool()
+    
+    *_, auth = fake_twitter.requests[0]
+    timestamp = int(re.search(r'oauth_timestamp="(\d+)"', auth).group(1))
+    assert timestamp >= int(start + 1.5)
+
+
+def test_clients_are_cached_per_session():
+    """Test that one client is reused for the same session token."""
+    session = {"session_id": "abc", "access_token": "t", "access_token_secret": "s"}
+    
+    assert get_async_client(session) is get_async_client(session)
+    async_twitter_client.drop_async_client("abc")
+    assert "abc" not in async_twitter_client._clients
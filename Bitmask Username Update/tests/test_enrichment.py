@@ -0,0 +1,77 @@
+"""Tests for timeline enrichment."""
+import time
+from datetime import datetime
+import pytest
+from app import async_twitter_client
+from app.enrichment import TimelineEnricher, needs_timeline
+from app.rate_limiter import RateLimitScheduler
+from tests.fake_twitter import FakeTwitter
+
+
+@pytest.fixture
+def fake_twitter(monkeypatch):
+    scheduler = RateLimitScheduler()
+    # A fresh window with plenty of budget, so none of the lookups wait for a reset
+    scheduler.record_response("token", "statuses/user_timeline", 200,
+                              {"x-rate-limit-remaining": "900", "x-rate-limit-reset": str(time.time() + 9)})
+    monkeypatch.setattr(async_twitter_client, "scheduler", scheduler)
+    with FakeTwitter() as fake:
+        yield fake
+
+
+def _tweet(created_at):
+    return [{"id_str": "1", "created_at": created_at, "text": "hi"}]
+
+
+def test_needs_timeline():
+    """Test that only followers with tweets but no last tweet are looked up."""
+    assert needs_timeline({"tweet_count": 5})
+    assert not needs_timeline({"tweet_count": 0})
+    assert not needs_timeline({"tweet_count": 5, "last_tweet_at": datetime(2024, 1, 1)})
+    assert not needs_timeline({"tweet_count": 5, "is_protected": True})
+
+
+def test_enricher_fills_missing_last_tweet_concurrently(fake_twitter):
+    """Test that missing activity data is fetched concurrently and fed back."""
+    fake_twitter.delay = 0.2
+    for user_id in ("1", "2", "3", "4"):
+        fake_twitter.timelines[user_id] = _tweet("Mon Jan 01 12:00:00 +0000 2024")
+    known = datetime(2023, 5, 5)
+    followers = [{"twitter_id": str(i), "tweet_count": 10} for i in range(1, 5)]
+    followers.append({"twitter_id": "5", "tweet_count": 0})
+    followers.append({"twitter_id": "6", "tweet_count": 10, "last_tweet_at": known})
+    followers.append({"twitter_id": "7", "tweet_count": 10})  # protected / empty timeline
+    
+    enricher = TimelineEnricher("token", "secret", base_url=fake_twitter.base_url)
+    try:
+        start = time.perf_counter()
+        enriched = enricher(followers)
+        elapsed = time.perf_counter() - start
+    finally:
+        enricher.close()
+    
+    assert enriched == 4
+    assert all(f["last_tweet_at"] == datetime(2024, 1, 1, 12) for f in followers[:4])
+    assert followers[5]["last_tweet_at"] == known
+    assert "last_tweet_at" not in followers[6] or followers[6]["last_tweet_at"] is None
+    assert sorted(p["user_id"] for _, _, p, _ in fake_twitter.requests) == ["1", "2", "3", "4", "7"]
+    assert all(p["count"] == "1" for _, _, p, _ in fake_twitter.requests)
+    assert elapsed < 5 * fake_twitter.delay
+
+
+def test_enricher_skips_protected_followers(fake_twitter):
+    """Test that protected followers cost no timeline request."""
+    fake_twitter.timelines["1"] = _tweet("Mon Jan 01 12:00:00 +0000 2024")
+    followers = [
+        {"twitter_id": "1", "tweet_count": 10},
+        {"twitter_id": "2", "tweet_count": 10, "is_protected": True}
+    ]
+    
+    enricher = TimelineEnricher("token", "secret", base_url=fake_twitter.base_url)
+    try:
+        assert enricher(followers) == 1
+    finally:
+        enricher.close()
+    
+    assert [p["user_id"] for _, _, p, _ in fake_twitter.requests] == ["1"]
+    assert followers[1].get("last_tweet_at") is None
@@ -0,0 +1,98 @@
+"""Tests for streaming follower exports."""
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import exports
+from app.models import Base, Follower
+
+
+@pytest.fixture
+def followers(session_factory, db_session, monkeypatch):
+    monkeypatch.setattr(exports, "SessionLocal", session_factory)
+    db_session.add_all([
+        Follower(owner_id="42", twitter_id=str(i), username=f"user{i}", display_name=None if i % 2 else f"User, {i}",
+                 bio="line\nbreak" if i == 3 else "", followers_count=i, following_count=2, tweet_count=3,
+                 bot_score=12.5, is_bot=i == 4, is_inactive=False,
+                 last_tweet_at=datetime(2024, 1, i) if i < 5 else None)
+        for i in range(1, 8)
+    ])
+    db_session.commit()
+
+
+@pytest.fixture
+def file_database(tmp_path, monkeypatch):
+    """Followers in an on-disk SQLite database, where readers and writers take real file locks."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'followers.db'}", connect_args={"timeout": 0})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(exports, "SessionLocal", factory)
+    with factory() as db:
+        db.add_all([Follower(owner_id="42", twitter_id=str(i), username=f"user{i}") for i in range(10)])
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson", "arrow", "parquet"])
+def test_export_does_not_block_writers(file_database, fmt):
+    """Test that other commits succeed while a download is between chunks."""
+    if fmt in ("arrow", "parquet"):
+        pytest.importorskip("pyarrow")
+    chunks = getattr(exports, f"stream_{fmt}")("42", chunk_size=3)
+    next(chunks)
+    next(chunks)
+    
+    with file_database() as db:
+        db.add(Follower(owner_id="42", twitter_id="99", username="late"))
+        db.commit()
+    
+    assert list(chunks)
+
+
+def test_csv_is_streamed_in_chunks(followers):
+    """Test one yielded string per chunk, with the header first."""
+    chunks = list(exports.stream_csv("42", chunk_size=3))
+    
+    assert len(chunks) == 1 + 3
+    assert chunks[0].startswith("Username,Display Name,Bio")
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert len(rows) == 8
+    assert rows[2] == ["user2", "User, 2", "", "2", "2", "3", "12.5", "False", "False", "2024-01-02T00:00:00", ""]
+    assert rows[3][2] == "line\nbreak"
+    assert rows[7][9] == ""
+
+
+def test_ndjson_rows(followers):
+    """Test NDJSON output with ISO timestamps and nulls."""
+    lines = "".join(exports.stream_ndjson("42", chunk_size=4)).splitlines()
+    
+    assert len(lines) == 7
+    first = json.loads(lines[0])
+    assert first["twitter_id"] == "1" and first["display_name"] is None
+    assert first["last_tweet_at"] == "2024-01-01T00:00:00"
+    assert first["is_bot"] is False
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_columnar_exports_are_typed(followers, fmt):
+    """Test that Arrow IPC and Parquet exports round-trip with typed columns."""
+    pa = pytest.importorskip("pyarrow")
+    stream = exports.stream_arrow if fmt == "arrow" else exports.stream_parquet
+    chunks = list(stream("42", chunk_size=3))
+    data = pa.py_buffer(b"".join(chunks))
+    
+    if fmt == "arrow":
+        table = pa.ipc.open_stream(data).read_all()
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(pa.BufferReader(data))
+        assert pq.ParquetFile(pa.BufferReader(data)).num_row_groups == 3
+    
+    assert table.num_rows == 7
+    assert table.schema == exports.arrow_schema()
+    assert table.column("is_bot").to_pylist().count(True) == 1
+    assert table.column("last_tweet_at")[1].as_py().replace(tzinfo=None) == datetime(2024, 1, 2)
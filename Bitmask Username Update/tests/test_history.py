@@ -0,0 +1,54 @@
+"""Tests for the append-only analysis history."""
+from app.analyzer import FollowerAnalyzer
+from app.history import get_trajectory
+from app.models import Follower, FollowerHistory
+from app.pipeline import analyze_follower_pages
+from app.twitter_client import FollowerPage
+from tests.conftest import make_follower
+
+
+def _run(db, *followers):
+    list(analyze_follower_pages(db, "42", iter([FollowerPage(list(followers), 0)]), FollowerAnalyzer()))
+
+
+def test_history_grows_with_changes_only(db_session):
+    """Test that only runs that change a follower's results append a row."""
+    _run(db_session, make_follower(1), make_follower(2))
+    assert db_session.query(FollowerHistory).count() == 2
+    
+    # Unchanged profiles, and a bio edit that leaves scores and counts alone, add nothing
+    _run(db_session, make_follower(1), make_follower(2, bio="Writes about other things"))
+    assert db_session.query(FollowerHistory).count() == 2
+    
+    _run(db_session, make_follower(1, following_count=6000, followers_count=3), make_follower(2))
+    assert db_session.query(FollowerHistory).count() == 3
+
+
+def test_trajectory_reconstructs_each_change(db_session):
+    """Test that summing the deltas reproduces the follower's results at every run."""
+    _run(db_session, make_follower(1))
+    _run(db_session, make_follower(1, following_count=6000, followers_count=3, bio=""))
+    _run(db_session, make_follower(1, tweet_count=260))
+    
+    trajectory = get_trajectory(db_session, "42", "1")
+    
+    assert [p["followers_count"] for p in trajectory] == [100, 3, 100]
+    assert [p["tweet_count"] for p in trajectory] == [250, 250, 260]
+    assert "mass_following_low_followers" in trajectory[1]["flags"]
+    assert trajectory[1]["bot_score"] > trajectory[0]["bot_score"] == trajectory[2]["bot_score"]
+    current = db_session.query(Follower).filter(Follower.twitter_id == "1").one()
+    assert trajectory[-1]["bot_score"] == current.bot_score
+    assert get_trajectory(db_session, "7", "1") is None
+
+
+def test_trajectory_is_anchored_to_current_row(db_session):
+    """Test followers stored before history existed get absolute values."""
+    _run(db_session, make_follower(1))
+    db_session.query(FollowerHistory).delete()
+    db_session.commit()
+    
+    _run(db_session, make_follower(1, tweet_count=300))
+    trajectory = get_trajectory(db_session, "42", "1")
+    
+    assert len(trajectory) == 1
+    assert trajectory[0]["tweet_count"] == 300 and trajectory[0]["followers_count"] == 100
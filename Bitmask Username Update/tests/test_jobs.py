@@ -0,0 +1,118 @@
+"""Tests for background analysis jobs."""
+import pytest
+from app import jobs
+from app.models import Follower, Job
+from tests.conftest import make_page
+
+
+class FakeTwitterClient:
+    """Serves fixed follower pages instead of calling Twitter."""
+    pages = []
+    
+    def __init__(self, access_token=None, access_token_secret=None):
+        pass
+    
+    def verify_credentials(self):
+        return {"id": "42", "username": "me"}
+    
+    def iter_follower_pages(self, user_id=None, count=200, cursor=-1):
+        for page in self.pages:
+            yield page
+
+
+@pytest.fixture(autouse=True)
+def no_enrichment(monkeypatch):
+    monkeypatch.setattr(jobs.settings, "enrich_timelines", False)
+
+
+def _make_job(db, **kwargs):
+    job = Job(kind="analyze", status="pending", twitter_user_id="42", **kwargs)
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_run_analysis_job_records_progress(session_factory, db_session, monkeypatch):
+    """Test that a completed job reports pages, scored followers and written rows."""
+    monkeypatch.setattr(jobs, "SessionLocal", session_factory)
+    monkeypatch.setattr(jobs, "TwitterClient", FakeTwitterClient)
+    monkeypatch.setattr(FakeTwitterClient, "pages", [make_page(0, 3, next_cursor=7), make_page(3, 4)])
+    job_id = _make_job(db_session)
+    
+    jobs.run_analysis_job(job_id, "token", "secret")
+    
+    job = jobs.get_job(job_id, "42")
+    assert job["status"] == "completed"
+    assert job["pages_fetched"] == 2
+    assert job["followers_scored"] == 7
+    assert job["rows_written"] == 7
+    assert db_session.query(Follower).count() == 7
+    assert jobs.get_job(job_id, "someone-else") is None
+
+
+def test_cancelled_job_stops_after_current_page(session_factory, db_session, monkeypatch):
+    """Test that cancellation is honoured between pages."""
+    monkeypatch.setattr(jobs, "SessionLocal", session_factory)
+    monkeypatch.setattr(jobs, "TwitterClient", FakeTwitterClient)
+    job_id = _make_job(db_session)
+    
+    monkeypatch.setattr(FakeTwitterClient, "pages", [make_page(0, 2, next_cursor=1), make_page(2, 2, next_cursor=2), make_page(4, 2)])
+    
+    # Cancel from the worker thread once the first page is committed; the page
+    # producer thread shares the test's single in-memory connection, so it must not write
+    analyze_follower_pages = jobs.analyze_follower_pages
+    
+    def cancel_after_first_page(*args, **kwargs):
+        for progress in analyze_follower_pages(*args, **kwargs):
+            if progress.page_number == 1:
+                jobs.cancel_job(job_id, "42")
+            yield progress
+    
+    monkeypatch.setattr(jobs, "analyze_follower_pages", cancel_after_first_page)
+    
+    jobs.run_analysis_job(job_id, "token", "secret")
+    
+    job = jobs.get_job(job_id, "42")
+    assert job["status"] == "cancelled"
+    assert job["pages_fetched"] < 3
+
+
+def test_run_rescore_job_rescores_stored_followers(session_factory, db_session, monkeypatch):
+    """Test that a rescore job rewrites stored followers after the analyzer settings change."""
+    monkeypatch.setattr(jobs, "SessionLocal", session_factory)
+    monkeypatch.setattr(jobs, "TwitterClient", FakeTwitterClient)
+    monkeypatch.setattr(FakeTwitterClient, "pages", [make_page(0, 3)])
+    jobs.run_analysis_job(_make_job(db_session), "token", "secret")
+    
+    monkeypatch.setattr(jobs.settings, "rule_weights", "no_banner=9")
+    job = Job(kind="rescore", status="pending", twitter_user_id="42")
+    db_session.add(job)
+    db_session.commit()
+    
+    jobs.run_rescore_job(job.id)
+    
+    job = jobs.get_job(job.id, "42")
+    assert job["status"] == "completed"
+    assert job["kind"] == "rescore"
+    assert job["followers_scored"] == 3
+    assert job["rows_written"] == 3
+
+
+def test_one_active_job_per_account(session_factory, monkeypatch):
+    """Test that a rescore is not started while the account's analysis is still active."""
+    monkeypatch.setattr(jobs, "SessionLocal", session_factory)
+    submitted = []
+    
+    class Executor:
+        def submit(self, fn, *args):
+            submitted.append(fn)
+    
+    monkeypatch.setattr(jobs, "get_executor", Executor)
+    session = {"twitter_user_id": "42", "access_token": "token", "access_token_secret": "secret"}
+    
+    analysis = jobs.submit_analysis(session)
+    rescore = jobs.submit_rescore(session)
+    
+    assert rescore["id"] == analysis["id"] and rescore["kind"] == "analyze"
+    assert submitted == [jobs.run_analysis_job]
+    assert jobs.submit_rescore({**session, "twitter_user_id": "7"})["kind"] == "rescore"
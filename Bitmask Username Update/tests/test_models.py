@@ -0,0 +1,84 @@
+"""Tests for database helpers."""
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, text
+from app.models import Follower, SchemaOutdatedError, init_db, upsert_followers
+
+
+def _row(twitter_id, **overrides):
+    row = {
+        "twitter_id": twitter_id,
+        "username": f"user{twitter_id}",
+        "followers_count": 10,
+        "following_count": 20,
+        "tweet_count": 30,
+        "bot_score": 0.0,
+        "is_bot": False,
+        "is_inactive": False,
+        "flags": ["no_banner"]
+    }
+    row.update(overrides)
+    return row
+
+
+def test_upsert_followers_inserts_and_updates(db_session):
+    """Test that upsert inserts new rows and updates existing ones in place."""
+    written = upsert_followers(db_session, "42", [_row(str(i)) for i in range(5)], batch_size=2)
+    db_session.commit()
+    assert written == 5
+    assert db_session.query(Follower).count() == 5
+    
+    upsert_followers(db_session, "42", [_row("3", followers_count=999, is_bot=True), _row("9")], batch_size=2)
+    db_session.commit()
+    
+    assert db_session.query(Follower).count() == 6
+    updated = db_session.query(Follower).filter(Follower.twitter_id == "3").one()
+    assert updated.followers_count == 999
+    assert updated.is_bot is True
+
+
+def test_upsert_followers_duplicate_ids_in_chunk(db_session):
+    """Test that a repeated twitter_id within one chunk keeps the last row."""
+    upsert_followers(db_session, "42", [_row("1", tweet_count=1), _row("1", tweet_count=2)])
+    db_session.commit()
+    
+    assert db_session.query(Follower).one().tweet_count == 2
+
+
+def test_upsert_followers_keeps_stored_last_tweet(db_session):
+    """Test that a missing last_tweet_at does not overwrite the stored one."""
+    known = datetime(2024, 1, 1, 12)
+    upsert_followers(db_session, "42", [_row("1", last_tweet_at=known)])
+    upsert_followers(db_session, "42", [_row("1", last_tweet_at=None, tweet_count=31)])
+    db_session.commit()
+    
+    stored = db_session.query(Follower).one()
+    assert stored.tweet_count == 31
+    assert stored.last_tweet_at == known
+
+
+def test_upsert_followers_partitions_by_owner(db_session):
+    """Test that the same follower of two accounts is stored once per account."""
+    upsert_followers(db_session, "42", [_row("1", tweet_count=1)])
+    upsert_followers(db_session, "7", [_row("1", tweet_count=2)])
+    upsert_followers(db_session, "7", [_row("1", tweet_count=3)])
+    db_session.commit()
+    
+    counts = dict(db_session.query(Follower.owner_id, Follower.tweet_count))
+    assert counts == {"42": 1, "7": 3}
+
+
+def test_init_db_rejects_outdated_schema():
+    """Test that a database created before owner partitioning fails with an upgrade message."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE unfollow_records (id INTEGER PRIMARY KEY, follower_id INTEGER, unfollowed_at DATETIME)"
+        ))
+    
+    with pytest.raises(SchemaOutdatedError, match="unfollow_records.owner_id"):
+        init_db(engine)
+    
+    current = create_engine("sqlite://")
+    init_db(current)
+    init_db(current)
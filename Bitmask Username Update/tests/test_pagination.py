@@ -0,0 +1,101 @@
+"""Tests for keyset pagination of followers."""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app.models import Follower, UnfollowRecord
+from app.pagination import SORT_KEYS, InvalidCursor, decode_cursor, encode_cursor, keyset_page, unfollow_history_page
+
+
+@pytest.fixture
+def followers(db_session):
+    now = datetime(2024, 1, 1)
+    db_session.add_all([
+        Follower(
+            owner_id="42",
+            twitter_id=str(i),
+            username=f"user{i % 7}",  # duplicate usernames exercise the id tie-break
+            bot_score=float(i % 5) * 12.5,
+            is_bot=i % 3 == 0,
+            followers_count=i % 4,
+            last_tweet_at=None if i % 6 == 0 else now - timedelta(days=i % 9)
+        )
+        for i in range(1, 48)
+    ])
+    db_session.commit()
+    return db_session
+
+
+def _all_pages(query, sort_by, limit):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(query, sort_by, limit, cursor)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort_by", list(SORT_KEYS))
+def test_pages_cover_every_row_once_in_order(followers, sort_by):
+    """Test that walking the cursors yields the full, correctly ordered result."""
+    key = SORT_KEYS[sort_by]
+    query = followers.query(Follower)
+    pages = _all_pages(query, sort_by, limit=10)
+    rows = [f for page in pages for f in page]
+    
+    assert [len(p) for p in pages] == [10, 10, 10, 10, 7]
+    assert len({f.id for f in rows}) == 47
+    
+    def order(f):
+        value = getattr(f, key.column.key)
+        if value is None:
+            return (1, 0, -f.id if key.descending else f.id)
+        if isinstance(value, datetime):
+            value = value.timestamp()
+        return (0, -value if key.descending else value, -f.id if key.descending else f.id)
+    
+    assert [f.id for f in rows] == [f.id for f in sorted(rows, key=order)]
+
+
+def test_filtered_pages(followers):
+    """Test keyset paging combined with a filter."""
+    query = followers.query(Follower).filter(Follower.is_bot == True)
+    rows = [f for page in _all_pages(query, "bot_score", limit=4) for f in page]
+    assert len(rows) == 15
+    assert all(f.is_bot for f in rows)
+
+
+def test_cursor_round_trip_and_validation():
+    """Test cursor encoding and rejection of foreign or malformed cursors."""
+    when = datetime(2024, 1, 2, 3, 4, 5)
+    assert decode_cursor(encode_cursor("last_tweet", when, 9), "last_tweet") == (when, 9)
+    assert decode_cursor(encode_cursor("bot_score", 37.5, 3), "bot_score") == (37.5, 3)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("bot_score", 37.5, 3), "username")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "bot_score")
+
+
+def test_unfollow_history_pages_in_one_query_each(followers):
+    """Test newest-first history pages with joined usernames and no per-row loads."""
+    same_time = datetime(2024, 2, 1)
+    followers.add_all([
+        UnfollowRecord(owner_id="42", follower_id=i, reason="bot", unfollowed_at=same_time if i > 8 else datetime(2024, 1, i))
+        for i in range(1, 13)
+    ])
+    followers.commit()
+    
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(followers.get_bind(), "before_cursor_execute", listener)
+    try:
+        first, cursor = unfollow_history_page(followers, "42", limit=5)
+        second, cursor = unfollow_history_page(followers, "42", limit=5, cursor=cursor)
+        third, cursor = unfollow_history_page(followers, "42", limit=5, cursor=cursor)
+    finally:
+        event.remove(followers.get_bind(), "before_cursor_execute", listener)
+    
+    assert len(statements) == 3
+    assert cursor is None
+    ids = [h["id"] for h in first + second + third]
+    assert ids == [12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+    assert first[0]["username"] == "user5" and first[0]["reason"] == "bot"
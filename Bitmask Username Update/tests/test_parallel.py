@@ -0,0 +1,79 @@
+"""Tests for process-pool scoring."""
+import pickle
+import numpy as np
+import pytest
+from app import parallel
+from app.analyzer import FollowerAnalyzer
+from app.rules import compile_rules
+from tests.test_analyzer import _sample_followers
+
+
+@pytest.fixture
+def pool_cleanup():
+    yield
+    parallel.shutdown()
+
+
+def test_shard_bounds():
+    """Test that shards cover the batch in order and respect the minimum size."""
+    assert parallel.shard_bounds(10, 4, 1) == [range(0, 3), range(3, 6), range(6, 9), range(9, 10)]
+    assert parallel.shard_bounds(10, 4, 4) == [range(0, 5), range(5, 10)]
+    assert parallel.shard_bounds(10, 4, 100) == [range(0, 10)]
+    assert parallel.shard_bounds(0, 4, 1) == []
+
+
+def test_analyzer_pickles_with_weight_overrides():
+    """Test that an analyzer sent to a worker keeps its rule weights."""
+    analyzer = FollowerAnalyzer()
+    analyzer.rules = compile_rules("empty_bio=42")
+    
+    restored = pickle.loads(pickle.dumps(analyzer))
+    
+    assert restored.rules.weights["empty_bio"] == 42.0
+    assert restored.config_version == analyzer.config_version
+
+
+def test_parallel_score_matches_in_process(pool_cleanup):
+    """Test that sharded scoring returns the in-process results in input order."""
+    analyzer = FollowerAnalyzer()
+    followers = _sample_followers() * 3
+    context = analyzer.context()
+    
+    expected = analyzer.batch_score(followers, context=context, workers=1)
+    actual = parallel.parallel_score(analyzer, followers, context, workers=2, min_shard_size=4)
+    
+    for field in expected._fields:
+        np.testing.assert_array_equal(getattr(actual, field), getattr(expected, field))
+
+
+def test_pools_of_other_sizes_are_left_running(pool_cleanup):
+    """Test that asking for a different pool size does not shut down a pool in use."""
+    first = parallel.get_process_pool(2)
+    
+    assert parallel.get_process_pool(3) is not first
+    assert parallel.get_process_pool(2) is first
+    assert first.submit(abs, -1).result() == 1
+
+
+def test_rescore_batches_are_sharded_across_the_pool(db_session, monkeypatch, pool_cleanup):
+    """Test that re-scoring the stored backlog goes through the process pool and matches in-process scores."""
+    from app.models import Follower
+    from app.pipeline import analyze_follower_pages, rescore_stored_followers
+    from app.twitter_client import FollowerPage, user_json_to_record
+    from tests.fake_twitter import make_user
+    followers = [
+        user_json_to_record(make_user(i, description="" if i % 2 else "Fake follower", friends_count=i * 900))
+        for i in range(7)
+    ]
+    list(analyze_follower_pages(db_session, "42", iter([FollowerPage(followers, 0)]), FollowerAnalyzer()))
+    monkeypatch.setattr("app.analyzer.settings.rule_weights", "no_banner=9")
+    monkeypatch.setattr(parallel.settings, "analysis_min_shard_size", 2)
+    analyzer = FollowerAnalyzer()
+    
+    results = list(rescore_stored_followers(db_session, "42", analyzer, workers=2))
+    
+    assert 2 in parallel._pools
+    assert [r.followers_scored for r in results] == [4, 7]
+    expected = {f["twitter_id"]: analyzer.analyze_follower(f)["bot_score"] for f in followers}
+    db_session.expire_all()
+    assert dict(db_session.query(Follower.twitter_id, Follower.bot_score)) == pytest.approx(expected)
@@ -0,0 +1,198 @@
+"""Tests for the streaming ingestion pipeline."""
+import pytest
+from datetime import datetime, timedelta
+from app.analyzer import FollowerAnalyzer, flags_to_mask, mask_to_flags
+from app.models import Follower
+from app.models import CrawlCheckpoint
+from app.pipeline import prefetch, analyze_follower_pages, load_checkpoint, rescore_stored_followers
+from app.twitter_client import FollowerPage, user_json_to_record
+from tests.conftest import NOW, make_page
+from tests.fake_twitter import make_user
+
+
+def test_prefetch_preserves_order_and_errors():
+    """Test that prefetch yields items in order and re-raises producer errors."""
+    assert list(prefetch(iter(range(10)))) == list(range(10))
+    
+    def failing():
+        yield 1
+        raise RuntimeError("boom")
+    
+    with pytest.raises(RuntimeError):
+        list(prefetch(failing()))
+
+
+def test_analyze_follower_pages_commits_each_page(db_session):
+    """Test that each page is visible in the database as soon as it is yielded."""
+    pages = [make_page(0, 3, next_cursor=111), make_page(3, 2)]
+    results = analyze_follower_pages(db_session, "42", iter(pages), FollowerAnalyzer())
+    
+    first = next(results)
+    assert first.page_number == 1
+    assert db_session.query(Follower).count() == 3
+    
+    last = list(results)[-1]
+    assert last.followers_scored == 5
+    assert last.rows_written == 5
+    assert db_session.query(Follower).count() == 5
+
+
+def test_analyze_follower_pages_updates_existing(db_session):
+    """Test that re-analyzing a follower updates the existing row."""
+    list(analyze_follower_pages(db_session, "42", iter([make_page(0, 2)]), FollowerAnalyzer()))
+    changed = make_page(0, 2)
+    changed.followers[0]["followers_count"] = 4321
+    list(analyze_follower_pages(db_session, "42", iter([changed]), FollowerAnalyzer()))
+    
+    assert db_session.query(Follower).count() == 2
+    assert db_session.query(Follower).filter(Follower.twitter_id == "0").one().followers_count == 4321
+
+
+def test_checkpoint_resumes_interrupted_crawl(db_session):
+    """Test that an interrupted crawl resumes from the last committed cursor."""
+    checkpoint = load_checkpoint(db_session, "42")
+    assert checkpoint.next_cursor == "-1"
+    
+    def interrupted():
+        yield make_page(0, 2, next_cursor=111)
+        raise RuntimeError("connection reset")
+    
+    with pytest.raises(RuntimeError):
+        list(analyze_follower_pages(db_session, "42", interrupted(), FollowerAnalyzer(), checkpoint=checkpoint))
+    db_session.rollback()
+    
+    resumed = load_checkpoint(db_session, "42")
+    assert resumed.next_cursor == "111"
+    assert resumed.pages_fetched == 1
+    assert resumed.followers_fetched == 2
+    
+    list(analyze_follower_pages(db_session, "42", iter([make_page(2, 2)]), FollowerAnalyzer(), checkpoint=resumed))
+    assert resumed.completed_at is not None
+    assert resumed.pages_fetched == 2
+    
+    # A finished crawl starts over from the first page next time
+    assert load_checkpoint(db_session, "42").next_cursor == "-1"
+    assert db_session.query(CrawlCheckpoint).count() == 1
+
+
+def test_unchanged_followers_are_skipped(db_session):
+    """Test that a repeat run only rewrites followers whose profile changed."""
+    analyzer = FollowerAnalyzer()
+    list(analyze_follower_pages(db_session, "42", iter([make_page(0, 4)]), analyzer))
+    
+    repeat = list(analyze_follower_pages(db_session, "42", iter([make_page(0, 4)]), analyzer))[-1]
+    assert repeat.rows_written == 0
+    assert repeat.followers_unchanged == 4
+    
+    changed = make_page(0, 4)
+    changed.followers[2]["bio"] = "New bio"
+    result = list(analyze_follower_pages(db_session, "42", iter([changed]), analyzer))[-1]
+    assert result.rows_written == 1
+    assert db_session.query(Follower).filter(Follower.twitter_id == "2").one().bio == "New bio"
+
+
+def test_followers_due_for_time_based_rescore(db_session):
+    """Test that a follower is re-scored once a time-based flag can change."""
+    analyzer = FollowerAnalyzer()
+    list(analyze_follower_pages(db_session, "42", iter([make_page(0, 2)]), analyzer))
+    follower = db_session.query(Follower).filter(Follower.twitter_id == "1").one()
+    
+    # last_tweet_at is 2 days ago, so inactivity can flip once the threshold passes
+    assert follower.rescore_after == follower.last_tweet_at + analyzer.inactivity_threshold
+    follower.rescore_after = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    
+    result = list(analyze_follower_pages(db_session, "42", iter([make_page(0, 2)]), analyzer))[-1]
+    assert result.rows_written == 1
+
+
+def test_unenriched_follower_keeps_stored_last_tweet(db_session):
+    """Test that a changed follower whose timeline was not fetched keeps its stored last tweet."""
+    analyzer = FollowerAnalyzer()
+    list(analyze_follower_pages(db_session, "42", iter([make_page(0, 2)]), analyzer))
+    known = db_session.query(Follower.last_tweet_at).filter(Follower.twitter_id == "1").scalar()
+    
+    changed = make_page(0, 2)
+    changed.followers[1].update(bio="New bio", last_tweet_at=None)
+    result = list(analyze_follower_pages(db_session, "42", iter([changed]), analyzer, enrich=lambda followers: 0))[-1]
+    
+    assert result.rows_written == 1
+    db_session.expire_all()
+    follower = db_session.query(Follower).filter(Follower.twitter_id == "1").one()
+    assert follower.bio == "New bio"
+    assert follower.last_tweet_at == known
+    assert follower.is_inactive is False
+
+
+def test_rescore_after_tweet_frequency_crossing():
+    """Test that tweets-per-day cut-offs schedule a re-score."""
+    analyzer = FollowerAnalyzer()
+    now = datetime(2024, 1, 1)
+    created = now - timedelta(days=10)
+    
+    # 1000 tweets: >50/day until day 20, >20/day until day 50; the new-account window ends first
+    follower = {"tweet_count": 1000, "account_created_at": created, "last_tweet_at": now}
+    assert analyzer.rescore_after(follower, now) == created + timedelta(days=20)
+    
+    follower["account_created_at"] = created = now - timedelta(days=25)
+    assert analyzer.rescore_after(follower, now) == created + timedelta(days=30)
+
+
+def test_flags_mask_is_persisted_and_queryable(db_session):
+    """Test that analyzer flags are stored as a bitmask and filterable with bitwise predicates."""
+    page = make_page(0, 3)
+    page.followers[1].update(profile_image_url="https://abs.twimg.com/sticky/default_profile_images/default_profile.png",
+                             followers_count=3, following_count=6000)
+    page.followers[2].update(followers_count=3, following_count=6000)
+    list(analyze_follower_pages(db_session, "42", iter([page]), FollowerAnalyzer()))
+    
+    mask = flags_to_mask(["default_profile_picture", "mass_following_low_followers"])
+    matches = db_session.query(Follower.twitter_id).filter(Follower.flags_mask.op("&")(mask) == mask).all()
+    
+    assert matches == [("1",)]
+    stored = db_session.query(Follower).filter(Follower.twitter_id == "2").one()
+    assert "mass_following_low_followers" in mask_to_flags(stored.flags_mask)
+
+
+def test_rescore_stored_followers_after_config_change(db_session, monkeypatch):
+    """Test that stored followers are re-scored from the database in batches once the analyzer changes."""
+    page = FollowerPage([user_json_to_record(make_user(i, description="")) for i in range(5)], 0)
+    list(analyze_follower_pages(db_session, "42", iter([page]), FollowerAnalyzer()))
+    before = dict(db_session.query(Follower.twitter_id, Follower.bot_score))
+    
+    # Nothing is out of date under the same configuration
+    assert list(rescore_stored_followers(db_session, "42", FollowerAnalyzer(), batch_size=2)) == []
+    
+    monkeypatch.setattr("app.analyzer.settings.rule_weights", "empty_bio=30")
+    analyzer = FollowerAnalyzer()
+    results = list(rescore_stored_followers(db_session, "42", analyzer, batch_size=2, workers=1))
+    
+    assert [r.followers_scored for r in results] == [2, 4, 5]
+    assert results[-1].rows_written == 5
+    db_session.expire_all()
+    after = dict(db_session.query(Follower.twitter_id, Follower.bot_score))
+    assert all(after[i] == before[i] + 20 for i in before)
+    assert list(rescore_stored_followers(db_session, "42", analyzer, batch_size=2)) == []
+
+
+def test_rescore_leaves_enriched_followers_alone(db_session):
+    """Test that enriched activity data neither triggers a rescore nor a second timeline lookup."""
+    enriched = []
+    
+    def enrich(followers):
+        for follower in followers:
+            enriched.append(follower.twitter_id)
+            follower.last_tweet_at = NOW - timedelta(days=3)
+    
+    def page():
+        # Fully decoded API users, without the latest status
+        return FollowerPage([user_json_to_record(make_user(i, status=None)) for i in range(3)], 0)
+    
+    analyzer = FollowerAnalyzer()
+    list(analyze_follower_pages(db_session, "42", iter([page()]), analyzer, enrich=enrich))
+    assert len(enriched) == 3
+    
+    assert list(rescore_stored_followers(db_session, "42", analyzer, batch_size=2)) == []
+    result = list(analyze_follower_pages(db_session, "42", iter([page()]), analyzer, enrich=enrich))[-1]
+    assert result.followers_unchanged == 3
+    assert len(enriched) == 3
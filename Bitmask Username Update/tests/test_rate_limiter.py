@@ -0,0 +1,76 @@
+"""Tests for the rate-limit scheduler."""
+from app.rate_limiter import RateLimitScheduler, endpoint_from_url
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _scheduler():
+    clock = FakeClock()
+    return clock, RateLimitScheduler(clock=clock, sleep=clock.sleep)
+
+
+def test_endpoint_from_url():
+    """Test mapping request URLs to endpoint keys."""
+    assert endpoint_from_url("https://api.twitter.com/1.1/followers/list.json?cursor=-1") == "followers/list"
+
+
+def test_requests_burst_until_the_budget_is_spent():
+    """Test that requests are not delayed while the window has budget left."""
+    clock, scheduler = _scheduler()
+    
+    waits = [scheduler.acquire("token", "followers/list") for _ in range(15)]
+    assert waits == [0.0] * 15
+    
+    # 15 requests per 900s window: the 16th waits for the reset, then a fresh window opens
+    assert scheduler.acquire("token", "followers/list") == 900
+    assert scheduler.acquire("token", "followers/list") == 0.0
+
+
+def test_requests_queue_behind_an_exhausted_window():
+    """Test that concurrent callers waiting for a reset share the next window's budget."""
+    clock, scheduler = _scheduler()
+    scheduler.record_response("token", "followers/list", 200,
+                              {"x-rate-limit-limit": "2", "x-rate-limit-remaining": "0",
+                               "x-rate-limit-reset": str(int(clock.now + 60))})
+    
+    waits = [scheduler.reserve("token", "followers/list") for _ in range(3)]
+    assert waits == [60, 60, 960]
+    
+    # A late response from the exhausted window does not hand its budget back
+    scheduler.record_response("token", "followers/list", 200,
+                              {"x-rate-limit-limit": "2", "x-rate-limit-remaining": "1",
+                               "x-rate-limit-reset": str(int(clock.now + 60))})
+    assert scheduler.reserve("token", "followers/list") == 960
+
+
+def test_headers_and_429_drive_the_budget():
+    """Test that response headers and 429s override the default limits."""
+    clock, scheduler = _scheduler()
+    reset = clock.now + 300
+    
+    scheduler.record_response("token", "followers/list", 200,
+                              {"x-rate-limit-limit": "15", "x-rate-limit-remaining": "0",
+                               "x-rate-limit-reset": str(int(reset))})
+    assert scheduler.acquire("token", "followers/list") == 300
+    
+    # Other tokens keep their own budget
+    assert scheduler.acquire("other", "followers/list") == 0.0
+    
+    scheduler.record_response("token", "friendships/destroy", 429, {})
+    assert scheduler.reserve("token", "friendships/destroy") == 900
+
+
+def test_unknown_endpoints_are_not_delayed():
+    """Test that endpoints without a known limit are not slowed down."""
+    clock, scheduler = _scheduler()
+    
+    assert [scheduler.acquire("token", "friendships/destroy") for _ in range(5)] == [0.0] * 5
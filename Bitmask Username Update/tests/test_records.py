@@ -0,0 +1,39 @@
+"""Tests for the FollowerRecord type."""
+import pytest
+from app.analyzer import FollowerAnalyzer
+from app.records import FollowerRecord
+from app.twitter_client import user_json_to_record
+from tests.fake_twitter import make_user
+
+
+def test_record_reads_like_a_follower_dict():
+    """Test that unset slots read as missing, like absent dictionary keys."""
+    record = FollowerRecord(twitter_id="1", followers_count=3)
+    
+    assert record["twitter_id"] == "1"
+    assert record.get("tweet_count", 0) == 0
+    assert "bio" not in record
+    assert {**record} == {"twitter_id": "1", "followers_count": 3}
+    with pytest.raises(KeyError):
+        record["bio"]
+    with pytest.raises(KeyError):
+        record["location"] = "nowhere"
+
+
+def test_flags_are_derived_from_the_mask():
+    """Test that flags round-trip through flags_mask instead of being stored."""
+    record = FollowerRecord(twitter_id="1", flags=["empty_bio", "no_banner"])
+    
+    assert record.flags == ["empty_bio", "no_banner"]
+    assert record["flags"] == record.flags
+    assert record.to_dict() == {"twitter_id": "1", "flags_mask": record.flags_mask, "flags": record.flags}
+
+
+def test_batch_analyze_fills_records_in_place():
+    """Test that analysis results are written into the decoded records without copies."""
+    records = [user_json_to_record(make_user(i, description="")) for i in range(3)]
+    
+    analyzed = FollowerAnalyzer().batch_analyze(records)
+    
+    assert all(a is r for a, r in zip(analyzed, records))
+    assert all("empty_bio" in r.flags and isinstance(r.bot_score, float) for r in records)
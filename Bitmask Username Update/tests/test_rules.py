@@ -0,0 +1,77 @@
+"""Tests for the declarative rule table."""
+from datetime import datetime, timedelta
+import pytest
+from app.analyzer import FollowerAnalyzer
+from app.rules import RULES, Condition, Rule, RuleEngine, compile_rules, parse_weights
+
+
+def test_parse_weights():
+    """Test weight override parsing and validation."""
+    assert parse_weights("") == {}
+    assert parse_weights("empty_bio=12, no_banner=0") == {"empty_bio": 12.0, "no_banner": 0.0}
+    with pytest.raises(ValueError):
+        parse_weights("not_a_flag=3")
+    with pytest.raises(ValueError):
+        parse_weights("empty_bio")
+
+
+def test_weight_overrides_apply_to_scalar_and_batch():
+    """Test that configured weights change both evaluators and the analyzer fingerprint."""
+    analyzer = FollowerAnalyzer()
+    follower = {"twitter_id": "1", "username": "someone", "bio": "", "banner_url": "x",
+                "followers_count": 10, "following_count": 10, "tweet_count": 10}
+    default_fingerprint = analyzer.fingerprint(follower)
+    assert analyzer.analyze_follower(follower)["bot_score"] == 10.0
+    
+    analyzer.rules = compile_rules("empty_bio=42")
+    analyzer.config_version += f":{analyzer.rules.signature}"
+    assert analyzer.analyze_follower(follower)["bot_score"] == 42.0
+    assert float(analyzer.batch_score([follower]).bot_score[0]) == 42.0
+    assert analyzer.fingerprint(follower) != default_fingerprint
+
+
+def test_rules_with_missing_inputs_are_skipped():
+    """Test that age, frequency and username rules do not fire without their inputs."""
+    engine = compile_rules()
+    follower = {"username": "", "bio": "A perfectly normal bio", "banner_url": "x",
+                "followers_count": 50, "following_count": 0, "tweet_count": 100000}
+    
+    assert engine.evaluate(follower, FollowerAnalyzer().context()) == (0.0, 0)
+
+
+def test_unless_suppresses_lower_tier():
+    """Test that a tiered rule only fires when the rule above it did not."""
+    engine = compile_rules()
+    now = datetime(2024, 1, 1)
+    context = FollowerAnalyzer().context(now)
+    created = now - timedelta(days=100)
+    
+    profile = {"account_created_at": created, "banner_url": "x", "bio": "long enough bio"}
+    
+    _, extreme = engine.evaluate({**profile, "tweet_count": 6000}, context)
+    _, high = engine.evaluate({**profile, "tweet_count": 3000}, context)
+    assert extreme and not extreme & high
+    assert high
+
+
+def test_engine_rejects_invalid_tables():
+    """Test that rule tables are validated when compiled."""
+    with pytest.raises(ValueError):
+        RuleEngine([Rule("empty_bio", 1.0, (Condition("no_such_feature", "==", True),))])
+    with pytest.raises(ValueError):
+        RuleEngine([Rule("very_short_bio", 1.0, (Condition("bio_length", "<", 10),), unless="empty_bio")])
+    assert RuleEngine(RULES).thresholds("tweets_per_day") == [50, 20]
+
+
+def test_classify_username():
+    """Test the single-pass username classifier and its memo."""
+    from app.rules import classify_username
+    
+    assert classify_username("Abc12345") == (True, 5 / 8, 8)
+    assert classify_username("9xyz") == (True, 0.25, 4)
+    assert classify_username("abc123") == (False, 0.5, 6)
+    assert classify_username("123456") == (False, 1.0, 6)
+    
+    hits = classify_username.cache_info().hits
+    classify_username("Abc12345")
+    assert classify_username.cache_info().hits == hits + 1
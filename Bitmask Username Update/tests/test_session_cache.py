@@ -0,0 +1,85 @@
+"""Tests for the in-process session cache."""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from app import models
+from app.models import UserSession
+from app.routes import auth
+from app.session_cache import SessionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    """Test that entries are served until the TTL and counted as hits/misses."""
+    clock = FakeClock()
+    cache = SessionCache(maxsize=10, ttl=60, clock=clock)
+    cache.put("a", {"session_id": "a"}, datetime.utcnow() + timedelta(days=1))
+    
+    assert cache.get("a") == {"session_id": "a"}
+    clock.now += 61
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_entries_never_outlive_session_expiry():
+    """Test that a session expiring before the TTL is dropped at its expiry."""
+    clock = FakeClock()
+    cache = SessionCache(maxsize=10, ttl=600, clock=clock)
+    cache.put("soon", {}, datetime.utcnow() + timedelta(seconds=30))
+    cache.put("expired", {}, datetime.utcnow() - timedelta(seconds=1))
+    
+    assert cache.get("soon") == {}
+    clock.now += 31
+    assert cache.get("soon") is None
+    assert cache.get("expired") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test LRU eviction once maxsize is reached."""
+    cache = SessionCache(maxsize=2, ttl=60)
+    expires = datetime.utcnow() + timedelta(days=1)
+    cache.put("a", {}, expires)
+    cache.put("b", {}, expires)
+    cache.get("a")
+    cache.put("c", {}, expires)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {} and cache.get("c") == {}
+
+
+@pytest.fixture
+def cached_auth(session_factory, db_session, monkeypatch):
+    monkeypatch.setattr(models, "SessionLocal", session_factory)
+    monkeypatch.setattr(auth, "session_cache", SessionCache(maxsize=10, ttl=60))
+    db_session.add(UserSession(session_id="tok", access_token="at", access_token_secret="as",
+                               twitter_user_id="42", twitter_username="me",
+                               expires_at=datetime.utcnow() + timedelta(days=1)))
+    db_session.commit()
+    return db_session
+
+
+def _request(token):
+    return SimpleNamespace(cookies={"session_token": token})
+
+
+def test_get_current_session_uses_cache_until_logout(cached_auth):
+    """Test that repeat lookups skip the database and logout invalidates the entry."""
+    assert auth.get_current_session(_request("tok"))["twitter_user_id"] == "42"
+    cached_auth.query(UserSession).delete()
+    cached_auth.commit()
+    
+    # Served from the cache although the row is gone
+    assert auth.get_current_session(_request("tok"))["twitter_username"] == "me"
+    assert auth.session_cache.stats()["hits"] == 1
+    
+    auth.session_cache.invalidate("tok")
+    assert auth.get_current_session(_request("tok")) is None
+    assert auth.get_current_session(_request("unknown")) is None
+    assert auth.session_cache.stats() == {"hits": 1, "misses": 3, "size": 0}
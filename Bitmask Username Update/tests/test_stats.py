@@ -0,0 +1,98 @@
+"""Tests for the dashboard stats counters."""
+from datetime import timedelta
+from app import stats
+from app.analyzer import FollowerAnalyzer
+from app.models import Follower, FollowerStats, UnfollowRecord
+from app.pipeline import analyze_follower_pages
+from app.twitter_client import FollowerPage
+from tests.conftest import NOW, make_follower
+
+
+def test_aggregate_stats_single_query(db_session):
+    """Test the conditional-aggregate counts, including an empty table."""
+    assert stats.aggregate_stats(db_session, "42") == {
+        "total_followers": 0, "bots": 0, "inactive": 0, "unfollowed_today": 0
+    }
+    db_session.add_all([
+        Follower(owner_id="42", twitter_id="1", username="a", is_bot=True, is_inactive=True),
+        Follower(owner_id="42", twitter_id="2", username="b", is_bot=True),
+        Follower(owner_id="42", twitter_id="3", username="c")
+    ])
+    db_session.flush()
+    db_session.add_all([
+        UnfollowRecord(owner_id="42", follower_id=1),
+        UnfollowRecord(owner_id="42", follower_id=2, unfollowed_at=NOW - timedelta(days=2))
+    ])
+    db_session.commit()
+    
+    assert stats.aggregate_stats(db_session, "42") == {
+        "total_followers": 3, "bots": 2, "inactive": 1, "unfollowed_today": 1
+    }
+
+
+def test_counters_follow_analysis_incrementally(db_session):
+    """Test that re-analysis updates the counters by delta and matches a full recount."""
+    analyzer = FollowerAnalyzer()
+    stats.get_stats(db_session, "42")  # materialize the row on an empty table
+    
+    first = [FollowerPage([make_follower(1), make_follower(2), make_follower(3, last_tweet_at=NOW - timedelta(days=400))], 0)]
+    list(analyze_follower_pages(db_session, "42", first, analyzer))
+    assert stats.get_stats(db_session, "42") == stats.aggregate_stats(db_session, "42")
+    assert stats.get_stats(db_session, "42")["total_followers"] == 3
+    
+    # Follower 1 goes quiet, follower 3 becomes active again, follower 4 is new
+    second = [FollowerPage([
+        make_follower(1, last_tweet_at=NOW - timedelta(days=400)),
+        make_follower(3),
+        make_follower(4, followers_count=0, following_count=5000, tweet_count=0, bio="",
+                  last_tweet_at=None, account_created_at=NOW - timedelta(days=3))
+    ], 0)]
+    list(analyze_follower_pages(db_session, "42", second, analyzer))
+    
+    counts = stats.get_stats(db_session, "42")
+    assert counts == stats.aggregate_stats(db_session, "42")
+    assert counts["total_followers"] == 4 and counts["inactive"] >= 1
+
+
+def test_unfollow_counter_resets_each_day(db_session):
+    """Test that unfollows accumulate for the current day only."""
+    stats.get_stats(db_session, "42")
+    stats.record_unfollows(db_session, "42", 2, when=NOW - timedelta(days=1))
+    db_session.commit()
+    assert stats.get_stats(db_session, "42")["unfollowed_today"] == 0
+    
+    stats.record_unfollows(db_session, "42", 3)
+    stats.record_unfollows(db_session, "42", 1)
+    db_session.commit()
+    assert stats.get_stats(db_session, "42")["unfollowed_today"] == 4
+
+
+def test_missing_row_is_rebuilt_from_tables(db_session):
+    """Test that the first counter update creates the row from a recount."""
+    db_session.add(Follower(owner_id="42", twitter_id="1", username="a", is_bot=True))
+    db_session.flush()
+    db_session.add(UnfollowRecord(owner_id="42", follower_id=1))
+    stats.record_unfollows(db_session, "42", 1)
+    db_session.commit()
+    
+    assert db_session.query(FollowerStats).count() == 1
+    assert stats.get_stats(db_session, "42") == {
+        "total_followers": 1, "bots": 1, "inactive": 0, "unfollowed_today": 1
+    }
+
+
+def test_counts_are_scoped_to_one_account(db_session):
+    """Test that another account's followers and unfollows are not counted."""
+    db_session.add_all([
+        Follower(owner_id="42", twitter_id="1", username="a", is_bot=True),
+        Follower(owner_id="7", twitter_id="1", username="a", is_bot=True),
+        Follower(owner_id="7", twitter_id="2", username="b")
+    ])
+    db_session.flush()
+    db_session.add(UnfollowRecord(owner_id="7", follower_id=3))
+    db_session.commit()
+    
+    assert stats.get_stats(db_session, "42") == {
+        "total_followers": 1, "bots": 1, "inactive": 0, "unfollowed_today": 0
+    }
+    assert stats.get_stats(db_session, "7")["unfollowed_today"] == 1
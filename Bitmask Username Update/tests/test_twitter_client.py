@@ -0,0 +1,109 @@
+"""Tests for the Twitter client wrapper."""
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+from tweepy.errors import TweepyException
+from app import twitter_client as twitter_client_module
+from app.rate_limiter import RateLimitScheduler
+from app.twitter_client import TwitterClient
+
+
+def _user(i):
+    return SimpleNamespace(
+        id_str=str(i), screen_name=f"user{i}", name=f"User {i}", description="bio",
+        profile_image_url_https=None, followers_count=1, friends_count=1, statuses_count=1,
+        created_at=datetime(2020, 1, 1), verified=False, protected=False, status=None
+    )
+
+
+def _user_json(user):
+    """The raw v1.1 JSON object a tweepy User was parsed from."""
+    return {
+        "id_str": user.id_str, "screen_name": user.screen_name, "name": user.name,
+        "description": user.description, "profile_image_url_https": user.profile_image_url_https,
+        "followers_count": user.followers_count, "friends_count": user.friends_count,
+        "statuses_count": user.statuses_count, "created_at": user.created_at.strftime("%a %b %d %H:%M:%S %z %Y") if user.created_at.tzinfo
+        else user.created_at.strftime("%a %b %d %H:%M:%S +0000 %Y"),
+        "verified": user.verified, "protected": user.protected, "status": user.status
+    }
+
+
+class FakeFollowersEndpoint:
+    """Mimics API.get_followers: pages keyed by cursor, optionally failing first."""
+    pagination_mode = "cursor"
+    
+    def __init__(self, pages, failures=None):
+        self.pages = pages
+        self.failures = dict(failures or {})
+        self.calls = []
+    
+    def __call__(self, cursor=-1, **kwargs):
+        self.calls.append(cursor)
+        if self.failures.get(cursor):
+            self.failures[cursor] -= 1
+            raise TweepyException("Failed to send request: connection reset")
+        users, next_cursor = self.pages[cursor]
+        if "parser" in kwargs:
+            payload = json.dumps({"users": [_user_json(u) for u in users], "next_cursor": next_cursor})
+            return kwargs["parser"].parse(payload, return_cursors=True)
+        return users, (0, next_cursor)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(twitter_client_module.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(twitter_client_module, "scheduler", RateLimitScheduler(sleep=lambda seconds: None))
+    return TwitterClient(access_token="token", access_token_secret="secret")
+
+
+def test_iter_follower_pages_retries_same_cursor(client):
+    """Test that a transient error retries the failing page instead of restarting."""
+    endpoint = FakeFollowersEndpoint(
+        {-1: ([_user(1), _user(2)], 50), 50: ([_user(3)], 0)},
+        failures={50: 2}
+    )
+    client.api.get_followers = endpoint
+    
+    pages = list(client.iter_follower_pages())
+    
+    assert [p.next_cursor for p in pages] == [50, 0]
+    assert [f["twitter_id"] for p in pages for f in p.followers] == ["1", "2", "3"]
+    assert endpoint.calls == [-1, 50, 50, 50]
+
+
+def test_iter_follower_pages_starts_from_cursor(client):
+    """Test that a saved cursor resumes the crawl mid-way."""
+    endpoint = FakeFollowersEndpoint({-1: ([_user(1)], 50), 50: ([_user(3)], 0)})
+    client.api.get_followers = endpoint
+    
+    pages = list(client.iter_follower_pages(cursor=50))
+    
+    assert endpoint.calls == [50]
+    assert pages[0].followers[0]["twitter_id"] == "3"
+
+
+def test_raw_json_pages_match_tweepy_models(client):
+    """Test that raw JSON decoding yields the same records as the tweepy model path."""
+    users = [_user(1), _user(2)]
+    # tweepy models carry aware datetimes; records hold naive UTC either way
+    users[0].created_at = datetime(2020, 1, 1, 1, tzinfo=timezone(timedelta(hours=1)))
+    users[1].status = SimpleNamespace(created_at=datetime(2024, 1, 1, 12, tzinfo=timezone.utc))
+    client.api.get_followers = FakeFollowersEndpoint({-1: (users, 0)})
+    tweepy_page = next(client.iter_follower_pages(raw_json=False))
+    
+    users[1].status = {"created_at": "Mon Jan 01 12:00:00 +0000 2024"}
+    raw_page = next(client.iter_follower_pages(raw_json=True))
+    
+    assert raw_page.followers == tweepy_page.followers
+    assert raw_page.followers[0].account_created_at == datetime(2020, 1, 1)
+    assert raw_page.followers[1].last_tweet_at == datetime(2024, 1, 1, 12)
+
+
+def test_parse_twitter_datetime_fast_path_matches_strptime():
+    """Test that the sliced UTC parser agrees with strptime, including non-UTC offsets."""
+    from app.twitter_client import parse_twitter_datetime
+    
+    assert parse_twitter_datetime("Wed Oct 10 20:19:24 +0000 2018") == datetime(2018, 10, 10, 20, 19, 24)
+    assert parse_twitter_datetime("Mon Jan 01 05:00:00 +0500 2024") == datetime(2024, 1, 1)
+    assert parse_twitter_datetime("") is None
@@ -0,0 +1,73 @@
+"""Tests for the concurrent unfollow executor."""
+import pytest
+from app import async_twitter_client
+from app.async_twitter_client import AsyncTwitterClient
+from app.models import Follower, UnfollowRecord
+from app.rate_limiter import RateLimitScheduler
+from app.unfollow_executor import execute_unfollows
+from tests.fake_twitter import FakeTwitter
+
+
+@pytest.fixture
+def fake_twitter(monkeypatch):
+    monkeypatch.setattr(async_twitter_client, "scheduler", RateLimitScheduler())
+    with FakeTwitter() as fake:
+        yield fake
+
+
+@pytest.fixture
+def followers(db_session):
+    db_session.add_all([Follower(owner_id="42", twitter_id=str(i), username=f"user{i}") for i in range(1, 6)])
+    db_session.commit()
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_unfollows_report_each_item_and_record_successes(fake_twitter, followers):
+    """Test per-item results, unknown IDs and UnfollowRecords for successes only."""
+    fake_twitter.fail_user_ids.add("3")
+    client = AsyncTwitterClient("token", "secret", base_url=fake_twitter.base_url)
+    
+    results = [r async for r in execute_unfollows(followers, "42", client, ["1", "2", "3", "4", 99, "1"],
+                                                  reason="bot", concurrency=3, commit_batch_size=2)]
+    await async_twitter_client.close_http_pool()
+    
+    by_id = {r["user_id"]: r for r in results}
+    assert len(results) == 5
+    assert by_id["99"] == {"user_id": "99", "success": False, "error": "Not found"}
+    assert by_id["3"]["error"] == "Failed to unfollow"
+    assert {uid for uid, r in by_id.items() if r["success"]} == {"1", "2", "4"}
+    assert sorted(fake_twitter.unfollowed) == ["1", "2", "4"]
+    
+    records = followers.query(UnfollowRecord).all()
+    assert len(records) == 3
+    assert {r.reason for r in records} == {"bot"}
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_stops_dispatch(fake_twitter, followers):
+    """Test that after a 429 the remaining unfollows are not sent."""
+    fake_twitter.rate_limited = 1
+    client = AsyncTwitterClient("token", "secret", base_url=fake_twitter.base_url)
+    
+    results = [r async for r in execute_unfollows(followers, "42", client, ["1", "2", "3"], concurrency=1)]
+    await async_twitter_client.close_http_pool()
+    
+    assert [r["error"] for r in results] == ["Rate limited"] * 3
+    assert fake_twitter.unfollowed == []
+    assert followers.query(UnfollowRecord).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_early_close_records_in_flight_unfollows(fake_twitter, followers):
+    """Test that stopping the stream still records unfollows that were sent."""
+    client = AsyncTwitterClient("token", "secret", base_url=fake_twitter.base_url)
+    
+    stream = execute_unfollows(followers, "42", client, ["1", "2", "3", "4", "5"], concurrency=2, commit_batch_size=10)
+    first = await stream.__anext__()
+    await stream.aclose()
+    await async_twitter_client.close_http_pool()
+    
+    assert first["success"]
+    assert 2 <= len(fake_twitter.unfollowed) < 5
+    assert followers.query(UnfollowRecord).count() == len(fake_twitter.unfollowed)